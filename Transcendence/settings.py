@@ -238,6 +238,33 @@ CHANNEL_LAYERS = {
     },
 }
 
+# 게임 엔진 설정 (game/engine.py)
+GAME_ENGINE = {
+    'TICK_RATE': 60,            # 초당 시뮬레이션 틱 수
+    'FIXED_TIMESTEP': True,     # False면 예전처럼 실제 경과 시간으로 진행
+    'MAX_CATCH_UP_TICKS': 5,    # 한 번에 따라잡을 수 있는 최대 틱 수
+    'PHYSICS_BACKEND': 'python',  # 'numpy'면 모든 게임을 벡터 연산으로 한 번에 계산
+    'SWEPT_COLLISION': True,    # 연속 충돌 검사 (substep 1번, 터널링 없음)
+    'EVENT_DRIVEN': False,      # 충돌 시각을 예측해 이벤트/브로드캐스트 시점에만 계산
+    'SNAPSHOT_RATE': 30,        # 초당 상태 스냅샷 전송 수 (TICK_RATE 이하)
+    'KEYFRAME_INTERVAL': 30,    # 스냅샷 몇 개마다 전체 필드를 담은 keyframe을 보낼지
+    'MAX_LAG_COMPENSATION': 0.2,  # 지연 보상으로 되돌려 볼 최대 시간(초), 0이면 끔
+    'CLOCK_SYNC_SAMPLES': 8,    # 시계/RTT 추정에 쓰는 최근 probe 샘플 수 (RTT 최소 샘플 채택)
+    'CLOCK_SYNC_BURST': 5,      # 접속 직후 연달아 보낼 probe 수
+    'CLOCK_SYNC_INTERVAL': 5,   # 이후 probe 주기(초)
+    'HEARTBEAT_INTERVAL': 2,    # 게임 소켓 ping 주기(초)
+    'HEARTBEAT_MISS_THRESHOLD': 3,  # pong을 연속 몇 번 놓치면 끊긴 연결로 보고 일시정지할지
+    'SPECTATOR_RATE': 10,       # 초당 관전자 프레임 수 (SNAPSHOT_RATE 이하)
+    'SPECTATOR_MATCH_TYPES': ('3', '4'),  # 관전을 허용할 매치 타입 (토너먼트 결승)
+}
+
+ROOM_STORE = {
+    'BACKEND': 'json',          # 'json': 방 하나를 JSON 한 덩어리로, 'hash': 필드 단위 hash + 플레이어 list
+    'LIST_PAGE_SIZE': 50,       # /api/game/list 기본 페이지 크기 (?limit=, 다음 페이지는 X-Next-Cursor)
+    'LIST_MAX_PAGE_SIZE': 100,
+    'CACHE_TTL': 2.0,           # 프로세스 방 캐시 유효 시간(초) - pub/sub 무효화를 놓쳤을 때의 상한, 0이면 캐시 끔
+}
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -285,7 +312,11 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
-
+# 로비 목록 페이지 cursor와 ETag를 브라우저 스크립트가 읽을 수 있도록
+CORS_EXPOSE_HEADERS = [
+	'X-Next-Cursor',
+	'ETag',
+]
 
 CORS_ALLOW_METHODS = [
 	'DELETE',
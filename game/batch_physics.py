@@ -0,0 +1,239 @@
+import time
+
+import numpy as np
+
+
+class BatchPhysics:
+	"""GamePhysics substep을 모든 게임에 대해 한 번에 계산하는 numpy 백엔드
+
+	공/패들 상태를 게임별 Match에서 struct-of-arrays로 모은 뒤(gather)
+	고정 타임스텝 틱을 벡터 연산으로 진행하고 결과를 다시 Match에 쓴다(scatter).
+	충돌/득점 규칙은 game.kernel.zone_substep / sweep과 같다.
+	"""
+	def __init__(self, physics):
+		self.physics = physics
+		self.TUNNEL_WIDTH = physics.TUNNEL_WIDTH
+		self.TUNNEL_HEIGHT = physics.TUNNEL_HEIGHT
+		self.TUNNEL_LENGTH = physics.TUNNEL_LENGTH
+		self.INITIAL_BALL_SCALE = physics.INITIAL_BALL_SCALE
+		self.MAX_BALL_SCALE = physics.MAX_BALL_SCALE
+		self.BASE_HIT_THRESHOLD = physics.BASE_HIT_THRESHOLD
+		self.BALL_SPEED_FACTOR = physics.BALL_SPEED_FACTOR
+		self.MAX_SPEED = physics.MAX_SPEED
+		self.COLLISION_ANGLE_FACTOR = physics.COLLISION_ANGLE_FACTOR
+		self.COLLISION_SPEED_INCREASE = physics.COLLISION_SPEED_INCREASE
+		# 히트존 z 범위 [END, START], 반사 후 z, 반사 후 z 방향
+		self.HIT_ZONES = (
+			(physics.PLAYER1_HIT_ZONE_END, physics.PLAYER1_HIT_ZONE_START, physics.PLAYER1_HIT_ZONE_END - 0.1, -1.0),
+			(physics.PLAYER2_HIT_ZONE_END, physics.PLAYER2_HIT_ZONE_START, physics.PLAYER2_HIT_ZONE_START + 0.1, 1.0),
+		)
+		self.SWEPT_COLLISION = physics.SWEPT_COLLISION
+		self.MAX_SWEPT_EVENTS = physics.MAX_SWEPT_EVENTS
+		self.PLAYER1_HIT_PLANE = physics.PLAYER1_HIT_PLANE
+		self.PLAYER2_HIT_PLANE = physics.PLAYER2_HIT_PLANE
+		self.PLAYER1_GOAL_Z = physics.PLAYER1_GOAL_Z
+		self.PLAYER2_GOAL_Z = physics.PLAYER2_GOAL_Z
+
+	def calculate_ball_scale(self, z):
+		half_length = self.TUNNEL_LENGTH / 2
+		progress = np.abs(z + half_length) / half_length
+		return self.INITIAL_BALL_SCALE + (self.MAX_BALL_SCALE - self.INITIAL_BALL_SCALE) * progress
+
+	def gather(self, game_states):
+		n = len(game_states)
+		position = np.empty((n, 3))
+		velocity = np.empty((n, 3))
+		scale = np.empty(n)
+		paddle = np.zeros((n, 2, 2))
+		has_paddle = np.zeros((n, 2), dtype=bool)
+
+		for i, game_state in enumerate(game_states):
+			ball = game_state.ball
+			position[i] = (ball.x, ball.y, ball.z)
+			velocity[i] = (ball.vx, ball.vy, ball.vz)
+			scale[i] = ball.scale
+			for j, player in enumerate(('player1', 'player2')):
+				player_paddle = game_state.players.get(player)
+				if player_paddle is not None:
+					paddle[i, j] = (player_paddle.x, player_paddle.y)
+					has_paddle[i, j] = True
+
+		return position, velocity, scale, paddle, has_paddle
+
+	def scatter(self, game_states, position, velocity, scale, scored):
+		current_time = int(time.time() * 1000)
+		positions = position.tolist()
+		velocities = velocity.tolist()
+		scales = scale.tolist()
+		for i, game_state in enumerate(game_states):
+			ball = game_state.ball
+			ball.x, ball.y, ball.z = positions[i]
+			ball.vx, ball.vy, ball.vz = velocities[i]
+			ball.scale = scales[i]
+			if not scored[i]:
+				game_state.timestamp = current_time
+
+	def step(self, game_states, step_time, steps):
+		"""게임마다 steps[i]번의 고정 틱을 진행
+
+		반환값: (게임별 득점 플레이어 또는 None, 게임별 실제로 진행한 틱 수)
+		"""
+		if not game_states:
+			return [], []
+
+		position, velocity, scale, paddle, has_paddle = self.gather(game_states)
+		steps = np.asarray(steps)
+		scored = np.zeros(len(game_states), dtype=np.int8)  # 0: 없음, 1: player1, 2: player2
+		steps_done = np.zeros(len(game_states), dtype=np.int64)
+
+		substeps = self.physics.fixed_substeps(step_time)
+		substep_delta = step_time / substeps
+		substep = self._swept_substep if self.SWEPT_COLLISION else self._substep
+
+		for tick in range(int(steps.max(initial=0))):
+			active = (steps > tick) & (scored == 0)
+			if not active.any():
+				break
+			steps_done += active
+			for _ in range(substeps):
+				substep(position, velocity, scale, paddle, has_paddle, scored, active, substep_delta)
+				active &= scored == 0
+
+		self.scatter(game_states, position, velocity, scale, scored)
+		scoring_players = [None, 'player1', 'player2']
+		return [scoring_players[s] for s in scored.tolist()], steps_done.tolist()
+
+	def _substep(self, position, velocity, scale, paddle, has_paddle, scored, active, delta_time):
+		idx = np.flatnonzero(active)
+		if idx.size == 0:
+			return
+
+		vel = velocity[idx]
+		nxt = position[idx] + vel * (delta_time * self.BALL_SPEED_FACTOR)
+		next_scale = self.calculate_ball_scale(nxt[:, 2])
+		scale[idx] = next_scale
+
+		# 1. 득점 체크 - 득점한 게임은 위치만 갱신하고 멈춘다
+		score1 = nxt[:, 2] <= -self.TUNNEL_LENGTH - 1
+		score2 = (nxt[:, 2] >= 1) & ~score1
+		scored[idx[score1]] = 1
+		scored[idx[score2]] = 2
+		playing = ~(score1 | score2)
+
+		# 2. x, y축 벽 충돌 처리
+		for axis, limit in ((0, self.TUNNEL_WIDTH), (1, self.TUNNEL_HEIGHT)):
+			wall = playing & (np.abs(nxt[:, axis]) > limit)
+			vel[wall, axis] *= -1
+			nxt[wall, axis] = np.copysign(limit - 0.01, nxt[wall, axis])
+
+		# 3. 패들 충돌 (player1 히트존에 있으면 player2는 검사하지 않음)
+		in_zone_before = np.zeros(idx.size, dtype=bool)
+		for player, (zone_end, zone_start, bounce_z, direction) in enumerate(self.HIT_ZONES):
+			in_zone = playing & ~in_zone_before & (nxt[:, 2] >= zone_end) & (nxt[:, 2] <= zone_start)
+			in_zone_before |= in_zone
+			candidates = in_zone & has_paddle[idx, player]
+			if not candidates.any():
+				continue
+
+			threshold = self.BASE_HIT_THRESHOLD * (next_scale / self.INITIAL_BALL_SCALE)
+			offset = nxt[:, :2] - paddle[idx, player]
+			distance = np.hypot(offset[:, 0], offset[:, 1])
+			hit = candidates & (distance <= threshold)
+			if not hit.any():
+				continue
+
+			vel[hit] = self._reflect(vel[hit], offset[hit], threshold[hit], direction)
+			nxt[hit, 2] = bounce_z
+
+		velocity[idx] = vel
+		position[idx] = nxt
+
+	def _reflect(self, vel, offset, threshold, direction):
+		"""패들 반사 - kernel.reflect의 벡터 버전"""
+		current_speed = np.linalg.norm(vel, axis=1)
+		new_speed = np.minimum(current_speed * self.COLLISION_SPEED_INCREASE, self.MAX_SPEED)
+		hit_angle = offset / threshold[:, None]
+
+		new_vel = np.empty((new_speed.size, 3))
+		new_vel[:, :2] = hit_angle * (new_speed * self.COLLISION_ANGLE_FACTOR)[:, None]
+		new_vel[:, 2] = direction * new_speed
+
+		# normalize_velocity와 동일 - 목표 속도를 넘을 때만 줄인다
+		speed = np.linalg.norm(new_vel, axis=1)
+		too_fast = speed > new_speed
+		new_vel[too_fast] *= (new_speed[too_fast] / speed[too_fast])[:, None]
+		return new_vel
+
+	def _swept_substep(self, position, velocity, scale, paddle, has_paddle, scored, active, delta_time):
+		"""kernel.sweep의 벡터 버전
+
+		게임마다 다음 충돌(벽 x/y, 패들 평면, 골 평면) 시각을 구해 가장 빠른 것부터
+		처리하고, substep 시간이 남은 게임만 다시 반복한다.
+		"""
+		idx = np.flatnonzero(active)
+		if idx.size == 0:
+			return
+
+		pos = position[idx]
+		vel = velocity[idx]
+		rows = np.arange(idx.size)
+		remaining = np.full(idx.size, delta_time * self.BALL_SPEED_FACTOR)
+		live = np.ones(idx.size, dtype=bool)
+
+		for _ in range(self.MAX_SWEPT_EVENTS):
+			if not live.any():
+				break
+
+			# 0: x벽, 1: y벽, 2: 패들 평면, 3: 골 평면
+			times = np.full((idx.size, 4), np.inf)
+			vz = vel[:, 2]
+			forward = vz > 0  # player1(0쪽) 방향
+			plane = np.where(forward, self.PLAYER1_HIT_PLANE, self.PLAYER2_HIT_PLANE)
+			goal = np.where(forward, self.PLAYER2_GOAL_Z, self.PLAYER1_GOAL_Z)
+			with np.errstate(divide='ignore', invalid='ignore'):
+				for axis, limit in ((0, self.TUNNEL_WIDTH), (1, self.TUNNEL_HEIGHT)):
+					v = vel[:, axis]
+					t = np.maximum((np.copysign(limit, v) - pos[:, axis]) / v, 0.0)
+					times[:, axis] = np.where(v != 0, t, np.inf)
+				plane_ahead = np.where(forward, pos[:, 2] < plane, pos[:, 2] > plane) & (vz != 0)
+				times[:, 2] = np.where(plane_ahead, (plane - pos[:, 2]) / vz, np.inf)
+				times[:, 3] = np.where(vz != 0, np.maximum((goal - pos[:, 2]) / vz, 0.0), np.inf)
+
+			event = np.argmin(times, axis=1)
+			t_hit = times[rows, event]
+			has_event = live & (t_hit < remaining)
+			step = np.where(has_event, t_hit, remaining)
+			step[~live] = 0.0
+
+			# 충돌 지점(또는 substep 끝)까지 이동
+			pos += vel * step[:, None]
+			remaining -= step
+
+			for axis, limit in ((0, self.TUNNEL_WIDTH), (1, self.TUNNEL_HEIGHT)):
+				wall = has_event & (event == axis)
+				vel[wall, axis] *= -1
+				pos[wall, axis] = np.copysign(limit, pos[wall, axis])
+
+			at_plane = has_event & (event == 2)
+			if at_plane.any():
+				pos[at_plane, 2] = plane[at_plane]
+				player = np.where(forward, 0, 1)
+				candidates = at_plane & has_paddle[idx, player]
+				threshold = self.BASE_HIT_THRESHOLD * (self.calculate_ball_scale(plane) / self.INITIAL_BALL_SCALE)
+				offset = pos[:, :2] - paddle[idx, player]
+				distance = np.hypot(offset[:, 0], offset[:, 1])
+				hit = candidates & (distance <= threshold)
+				if hit.any():
+					direction = np.where(forward[hit], -1.0, 1.0)
+					vel[hit] = self._reflect(vel[hit], offset[hit], threshold[hit], direction)
+
+			at_goal = has_event & (event == 3)
+			if at_goal.any():
+				pos[at_goal, 2] = goal[at_goal]
+				scored[idx[at_goal]] = np.where(forward[at_goal], 2, 1)
+
+			live &= has_event & ~at_goal
+
+		scale[idx] = self.calculate_ball_scale(pos[:, 2])
+		velocity[idx] = vel
+		position[idx] = pos
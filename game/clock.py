@@ -0,0 +1,149 @@
+import statistics
+import weakref
+from collections import deque
+
+_estimators = weakref.WeakSet()
+
+
+class ClockSync:
+	"""연결 하나의 시계 차이(offset)와 왕복 지연(RTT) 추정기
+
+	서버가 time_probe(server_time)를 보내면 클라이언트는 받은 즉시 자기 시각(client_time)을
+	붙여 time_probe_ack로 돌려준다. 응답을 받은 시각으로 RTT를 재고, NTP처럼
+	최근 window개 샘플 중 RTT가 가장 작은 샘플의 offset을 쓴다 (큐 지연이 가장 적게 섞인 값).
+	시각은 모두 ms.
+	"""
+	def __init__(self, window=8, label=None):
+		self.samples = deque(maxlen=window)  # (rtt, offset)
+		self.label = label
+		self.next_probe_id = 0
+		self.pending = {}  # probe id -> 보낸 server_time
+		_estimators.add(self)
+
+	def probe(self, now):
+		"""보낼 time_probe 메시지"""
+		self.next_probe_id += 1
+		self.pending[self.next_probe_id] = now
+		if len(self.pending) > self.samples.maxlen:
+			# 응답이 오지 않은 오래된 probe는 버린다
+			del self.pending[min(self.pending)]
+		return {'type': 'time_probe', 'id': self.next_probe_id, 'server_time': now}
+
+	def add_ack(self, probe_id, client_time, now):
+		"""time_probe_ack 반영 - 모르는 probe면 False"""
+		sent = self.pending.pop(probe_id, None)
+		if sent is None:
+			return False
+		rtt = max(now - sent, 0)
+		# 클라이언트 시각은 (보낸 시각 + 편도 지연) 시점에 찍혔다고 본다
+		offset = client_time - (sent + rtt / 2)
+		self.samples.append((rtt, offset))
+		return True
+
+	@property
+	def ready(self):
+		return bool(self.samples)
+
+	@property
+	def rtt(self):
+		"""최근 샘플의 중앙값 - 튀는 값 하나에 흔들리지 않도록"""
+		return statistics.median(rtt for rtt, _ in self.samples) if self.samples else None
+
+	@property
+	def min_rtt(self):
+		return min(rtt for rtt, _ in self.samples) if self.samples else None
+
+	@property
+	def jitter(self):
+		if not self.samples:
+			return None
+		rtts = [rtt for rtt, _ in self.samples]
+		return max(rtts) - min(rtts)
+
+	@property
+	def offset(self):
+		"""클라이언트 시계 - 서버 시계 (ms)"""
+		if not self.samples:
+			return None
+		return min(self.samples)[1]
+
+	def interpolation_delay(self, snapshot_interval):
+		"""클라이언트 보간 지연 - 스냅샷 두 개 + 지터만큼 버퍼링"""
+		return 2 * snapshot_interval + (self.jitter or 0)
+
+	def to_dict(self):
+		return {
+			'label': self.label,
+			'samples': len(self.samples),
+			'rtt': self.rtt,
+			'min_rtt': self.min_rtt,
+			'jitter': self.jitter,
+			'offset': self.offset,
+		}
+
+
+def clock_stats():
+	"""현재 프로세스의 모든 연결 추정치"""
+	return [estimator.to_dict() for estimator in _estimators if estimator.ready]
+
+
+_heartbeats = weakref.WeakSet()
+
+
+class Heartbeat:
+	"""서버가 주도하는 ping/pong으로 반쯤 끊긴 연결을 빨리 찾는다
+
+	interval초마다 expire()로 직전 ping을 확인한 뒤 ping을 보낸다. 보낸 ping이 pong 없이
+	miss_threshold번 연속으로 interval을 넘기면 그 시점에 죽은 연결로 본다.
+	pong을 한 번도 보내지 않은 클라이언트(heartbeat를 모르는 기존 프론트엔드)는 miss를 세지 않는다.
+	pong으로 잰 RTT(ms)는 rtt에 지수 이동 평균으로 남긴다.
+	"""
+	def __init__(self, interval=2.0, miss_threshold=3, label=None):
+		self.interval = interval
+		self.miss_threshold = miss_threshold
+		self.label = label
+		self.next_ping_id = 0
+		self.pending = {}  # ping id -> 보낸 server_time
+		self.missed = 0  # 마지막 pong 이후 응답 없이 지나간 ping 수
+		self.armed = False  # 첫 pong을 받은 뒤부터 miss를 센다
+		self.rtt = None
+		_heartbeats.add(self)
+
+	def expire(self):
+		"""interval마다 ping을 보내기 전에 호출 - 직전 ping에 응답이 없었으면 miss로 센다. 죽었으면 True"""
+		if self.pending and self.armed:
+			self.missed += 1
+		return self.dead
+
+	def ping(self, now):
+		"""보낼 ping 메시지"""
+		self.next_ping_id += 1
+		self.pending[self.next_ping_id] = now
+		if len(self.pending) > self.miss_threshold:
+			del self.pending[min(self.pending)]
+		return {'type': 'ping', 'id': self.next_ping_id, 'server_time': now}
+
+	def pong(self, ping_id, now):
+		"""pong 반영 - 잰 RTT(ms), 모르는 ping이면 None"""
+		sent = self.pending.pop(ping_id, None)
+		if sent is None:
+			return None
+		# 늦게 온 pong이라도 연결은 살아 있다
+		self.pending.clear()
+		self.missed = 0
+		self.armed = True
+		rtt = max(now - sent, 0)
+		self.rtt = rtt if self.rtt is None else 0.8 * self.rtt + 0.2 * rtt
+		return rtt
+
+	@property
+	def dead(self):
+		return self.missed >= self.miss_threshold
+
+	def to_dict(self):
+		return {'label': self.label, 'rtt': self.rtt, 'missed': self.missed, 'armed': self.armed}
+
+
+def heartbeat_stats():
+	"""현재 프로세스의 모든 연결 heartbeat 상태"""
+	return [heartbeat.to_dict() for heartbeat in _heartbeats]
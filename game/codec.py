@@ -0,0 +1,163 @@
+"""게임 소켓(ws/game/<game_id>) 메시지 코덱
+
+클라이언트가 WebSocket 서브프로토콜로 바이너리 코덱을 요청하면 BinaryCodec을,
+아무것도 요청하지 않으면 기존 JSON 텍스트(JsonCodec)를 쓴다.
+
+바이너리 프레임의 첫 바이트는 메시지 종류다.
+- GAME_STATE_UPDATE / OPPONENT_UPDATE / CLIENT_STATE_UPDATE: 고정 레이아웃(little-endian struct)
+- MSGPACK: 나머지 제어 메시지 (player_assigned, game_start, countdown, ...)를 msgpack으로
+"""
+import json
+import struct
+
+import msgpack
+
+from game.metrics import metrics
+
+BINARY_SUBPROTOCOL = 'pong.bin.v1'
+
+# 메시지 종류 (GamePingPongConsumer의 *_EVENT 번호와 같다)
+GAME_STATE_UPDATE = 2
+OPPONENT_UPDATE = 3
+CLIENT_STATE_UPDATE = 5
+MSGPACK = 0xFF
+
+# type, flags, tick, timestamp(ms), position xyz, velocity xyz, score player1/player2
+STATE_FORMAT = struct.Struct('<BBIq3f3f2B')
+# type, player(1/2), input_sequence, x, y
+PADDLE_FORMAT = struct.Struct('<BBIff')
+
+# STATE_FORMAT flags - 델타 프레임에서 값이 들어 있는 필드 (없는 필드는 0으로 채워진다)
+AXES = ('x', 'y', 'z')
+POSITION_FLAGS = (0x01, 0x02, 0x04)
+VELOCITY_FLAGS = (0x08, 0x10, 0x20)
+SCORE_FLAG = 0x40
+KEY_FLAG = 0x80
+
+PLAYERS = ('player1', 'player2')
+
+
+class JsonCodec:
+	binary = False
+
+	def encode(self, message):
+		return json.dumps(message)
+
+	def decode(self, text_data=None, bytes_data=None):
+		return json.loads(text_data if text_data is not None else bytes_data)
+
+
+class BinaryCodec:
+	binary = True
+
+	def encode(self, message):
+		message_type = message.get('type')
+		if message_type == 'game_state_update':
+			return self._encode_state(message)
+		if message_type == 'opponent_update':
+			return self._encode_paddle(OPPONENT_UPDATE, message)
+		if message_type == 'client_state_update':
+			return self._encode_paddle(CLIENT_STATE_UPDATE, message)
+		return bytes((MSGPACK,)) + msgpack.packb(message)
+
+	def decode(self, text_data=None, bytes_data=None):
+		if bytes_data is None:
+			# 바이너리 코덱이어도 텍스트 프레임은 JSON으로 받아 준다
+			return json.loads(text_data)
+
+		view = memoryview(bytes_data)
+		message_type = view[0]
+		if message_type == MSGPACK:
+			return msgpack.unpackb(view[1:])
+		if message_type == CLIENT_STATE_UPDATE:
+			return self._decode_paddle('client_state_update', view)
+		if message_type == OPPONENT_UPDATE:
+			return self._decode_paddle('opponent_update', view)
+		if message_type == GAME_STATE_UPDATE:
+			return self._decode_state(view)
+		raise ValueError(f"Unknown binary message type: {message_type}")
+
+	def _encode_state(self, message):
+		flags = KEY_FLAG if message.get('key') else 0
+		ball = message.get('ball', {})
+		values = []
+		for field, field_flags in (('position', POSITION_FLAGS), ('velocity', VELOCITY_FLAGS)):
+			vector = ball.get(field, {})
+			for axis, flag in zip(AXES, field_flags):
+				if axis in vector:
+					flags |= flag
+					values.append(vector[axis])
+				else:
+					values.append(0.0)
+		score = message.get('score')
+		if score is not None:
+			flags |= SCORE_FLAG
+			values.extend(score[player] for player in PLAYERS)
+		else:
+			values.extend((0, 0))
+		return STATE_FORMAT.pack(GAME_STATE_UPDATE, flags, message['tick'], message['timestamp'], *values)
+
+	def _decode_state(self, view):
+		_, flags, tick, timestamp, *values = STATE_FORMAT.unpack_from(view)
+		message = {'type': 'game_state_update', 'tick': tick, 'timestamp': timestamp}
+		if flags & KEY_FLAG:
+			message['key'] = True
+		ball = {}
+		for offset, field, field_flags in ((0, 'position', POSITION_FLAGS), (3, 'velocity', VELOCITY_FLAGS)):
+			vector = {
+				axis: values[offset + i]
+				for i, (axis, flag) in enumerate(zip(AXES, field_flags)) if flags & flag
+			}
+			if vector:
+				ball[field] = vector
+		if ball:
+			message['ball'] = ball
+		if flags & SCORE_FLAG:
+			message['score'] = dict(zip(PLAYERS, values[6:8]))
+		return message
+
+	def _encode_paddle(self, message_type, message):
+		position = message['position']
+		return PADDLE_FORMAT.pack(
+			message_type, PLAYERS.index(message['player']) + 1,
+			message['input_sequence'], position['x'], position['y']
+		)
+
+	def _decode_paddle(self, name, view):
+		_, player, input_sequence, x, y = PADDLE_FORMAT.unpack_from(view)
+		return {
+			'type': name,
+			'player': PLAYERS[player - 1],
+			'position': {'x': x, 'y': y},
+			'input_sequence': input_sequence
+		}
+
+
+def encoded_event(event_type, message):
+	"""한 번만 직렬화하는 그룹 이벤트
+
+	보내는 쪽에서 JSON 텍스트만 만들어 'text'에 담는다 (channel layer로는 이것만 간다).
+	JSON 수신자는 그대로 전달하고, 바이너리 수신자는 처음 받을 때 한 번만 풀어 인코딩한 결과를
+	이벤트에 채워 둔다. 같은 프로세스 멤버는 같은 이벤트 dict를 받으므로 그 결과를 다시 쓴다.
+	"""
+	metrics.incr('event_encodes')
+	return {'type': event_type, 'text': json.dumps(message)}
+
+
+def payload_for(event, codec):
+	"""이벤트를 codec 형식으로 - 예전에는 전달(delivery)마다 한 번씩 인코딩했다"""
+	metrics.incr('event_deliveries')
+	key = 'bytes' if codec.binary else 'text'
+	data = event.get(key)
+	if data is None:
+		data = codec.encode(json.loads(event['text']))
+		event[key] = data
+		metrics.incr('event_encodes')
+	return data
+
+
+def negotiate(subprotocols):
+	"""클라이언트가 제시한 서브프로토콜 중 지원하는 것을 고른다 - (codec, 수락할 서브프로토콜)"""
+	if BINARY_SUBPROTOCOL in (subprotocols or []):
+		return BinaryCodec(), BINARY_SUBPROTOCOL
+	return JsonCodec(), None
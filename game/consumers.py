@@ -19,6 +19,8 @@ class GameConsumer(AsyncWebsocketConsumer):
 		self.room_group_name = None
 		self.user_data = None
 		self.room_state_manager = RoomStateManager()
+		self.codec = JsonCodec()
+		self.outbound = OutboundQueue(self.send_text)
 	async def connect(self):
 		try:
 			# 1. 기본 설정 및 파라미터 검증
@@ -78,6 +80,7 @@ class GameConsumer(AsyncWebsocketConsumer):
 				# 4. 모든 검증이 통과된 경우에만 연결 수락
 				await self.channel_layer.group_add(self.room_group_name, self.channel_name)
 				await self.accept()
+				self.outbound.start()
 				
 				
 
@@ -107,6 +110,7 @@ class GameConsumer(AsyncWebsocketConsumer):
 			return
 
 	async def disconnect(self, close_code):
+		self.outbound.stop()
 		try:
 			# 1. 방 상태 확인
 			room = await self.room_state_manager.get_room(f'game_room_{self.room_id}')
@@ -199,24 +203,21 @@ class GameConsumer(AsyncWebsocketConsumer):
 	async def broadcast_room_update(self, room: Dict[str, Any]):
 		await self.channel_layer.group_send(
 			self.room_group_name,
-			{
+			encoded_event('room_update', {
 				'type': 'room_update',
 				'data': room
-			}
+			})
 		)
 
 	async def room_update(self, event):
-		room = event['data']
-		await self.send(text_data=json.dumps({
-			'type': 'room_update',
-			'data': room
-		}))
+		# 방 상태는 최신 것만 있으면 된다
+		self.outbound.put(payload_for(event, self.codec), latest='room')
 
 	async def game_start(self, event):
-		await self.send(text_data=json.dumps({
-			'type': 'game_start',
-			'data': event['data']
-		}))
+		self.outbound.put(payload_for(event, self.codec))
+
+	async def send_text(self, data):
+		await self.send(text_data=data)
 
 
 	async def send_destroy_event(self, reason: str):
@@ -230,7 +231,7 @@ class GameConsumer(AsyncWebsocketConsumer):
 		)
 
 	async def room_destroy(self, event):
-		await self.send(text_data=json.dumps({
+		self.outbound.put(json.dumps({
 			'type': 'destroy',
 			'data': event['reason']
 		}))
@@ -252,72 +253,29 @@ from asgiref.sync import sync_to_async
 from django.utils import timezone
 from .models import GameLog, UserGameLog
 from contract.solidity.scripts.Web3Client import Web3Client
+from game import kernel
+from game.codec import JsonCodec, encoded_event, negotiate, payload_for
+from game.delivery import group_delivery
+from game.outbound import OutboundQueue
+from game.engine import ENGINE_SETTINGS, GameState, GameSession, game_engine
+from game.clock import ClockSync, Heartbeat
+from game.lobby import LOBBY_GROUP, lobby_snapshot
+from game.metrics import metrics
+from game.snapshot import SnapshotEncoder
+from game.state import Paddle
 
 
 
 logger = logging.getLogger(__name__)
 
-class GameState:
-	active_games = {}
-	_game_tasks = {}  # game_id를 키로 하는 task dict
-
-	
-	@classmethod
-	def get_game(cls, game_id):
-		if game_id not in cls.active_games:
-			initial_speed = 4  # physics의 BALL_SPEED와 동일하게
-			angle = random.uniform(-math.pi/4, math.pi/4)  # -45도에서 45도 사이의 랜덤 각도
-			
-			# 삼각함수로 x, y 방향 속도 계산
-			vx = initial_speed * math.sin(angle)
-			vy = (random.random() - 0.5) * 2  # y축 변화는 좀 더 자유롭게
-			vz = initial_speed  # 기본 z축 속도
-			
-			# 50% 확률로 반대 방향으로
-			if random.random() < 0.5:
-				vz *= -1
-
-			cls.active_games[game_id] = {
-				'ball': {
-					'position': {'x': 0, 'y': 0.2, 'z': -42/2},
-					'velocity': {
-						'x': vx,
-						'y': vy,
-						'z': vz
-					},
-				},
-				'players': {},
-				'score': {'player1': 0, 'player2': 0},
-				'timestamp': int(time.time() * 1000),
-				'lastProcessedInput': {'player1': 0, 'player2': 0},
-				'game_started': False,
-				'match_type': None,
-				'disconnected_player': [],
-				'is_paused': False,
-				'pause_start_time': None,
-				'game_loop_running': False
-			}
-		return cls.active_games[game_id]
-
-	@classmethod
-	def remove_game(cls, game_id):
-		if game_id in cls.active_games:
-			del cls.active_games[game_id]
-
-	@classmethod
-	def set_game_task(cls, game_id, task):
-		cls._game_tasks[game_id] = task
-
-	@classmethod
-	def get_game_task(cls, game_id):
-		return cls._game_tasks.get(game_id)
-	
-	@classmethod
-	def remove_game_task(cls, game_id):
-		if game_id in cls._game_tasks:
-			del cls._game_tasks[game_id]
-
-
+CLOCK_SYNC_SAMPLES = ENGINE_SETTINGS.get('CLOCK_SYNC_SAMPLES', 8)  # 추정에 쓰는 최근 샘플 수
+CLOCK_SYNC_BURST = ENGINE_SETTINGS.get('CLOCK_SYNC_BURST', 5)  # 접속 직후 연달아 보낼 probe 수
+CLOCK_SYNC_BURST_INTERVAL = 0.1
+CLOCK_SYNC_INTERVAL = ENGINE_SETTINGS.get('CLOCK_SYNC_INTERVAL', 5)  # 이후 갱신 주기(초)
+HEARTBEAT_INTERVAL = ENGINE_SETTINGS.get('HEARTBEAT_INTERVAL', 2)  # ping 주기(초)
+HEARTBEAT_MISS_THRESHOLD = ENGINE_SETTINGS.get('HEARTBEAT_MISS_THRESHOLD', 3)  # 연속으로 놓치면 끊긴 것으로 볼 pong 수
+HEARTBEAT_CLOSE_CODE = 4008
+SPECTATOR_MATCH_TYPES = ENGINE_SETTINGS.get('SPECTATOR_MATCH_TYPES', ('3', '4'))  # 관전할 수 있는 매치 타입
 
 class GamePhysics:
 	def __init__(self):
@@ -364,7 +322,17 @@ class GamePhysics:
 
 		# 물리 연산 설정
 		self.MAX_DELTA_TIME = 1/60
-		self.PHYSICS_SUBSTEPS = 2
+		# 연속(swept) 충돌 검사 - 공이 지나간 선분으로 충돌을 구하므로 substep 1번이면 충분하다
+		self.SWEPT_COLLISION = ENGINE_SETTINGS.get('SWEPT_COLLISION', True)
+		self.MAX_SWEPT_EVENTS = 8  # substep 하나에서 처리할 최대 충돌 수
+		self.MAX_ADVANCE_EVENTS = 64  # 이벤트 구동 모드에서 한 번에 처리할 최대 충돌 수
+		self.PHYSICS_SUBSTEPS = 1 if self.SWEPT_COLLISION else 2
+
+		# 스윕 충돌 평면: 공이 히트존에 들어오는 면에서 패들 판정, 골 라인을 넘으면 득점
+		self.PLAYER1_HIT_PLANE = self.PLAYER1_HIT_ZONE_END
+		self.PLAYER2_HIT_PLANE = self.PLAYER2_HIT_ZONE_START
+		self.PLAYER2_GOAL_Z = 1  # 넘으면 player2 득점
+		self.PLAYER1_GOAL_Z = -self.TUNNEL_LENGTH - 1  # 넘으면 player1 득점
 
 		# 로깅 설정
 		self.debug_counter = 0
@@ -374,17 +342,38 @@ class GamePhysics:
 		self.SCORE_ANIMATION_DURATION = 1.5
 		self.GAME_RESUME_DELAY = 0.5
 
-	def normalize_velocity(self, velocity, target_speed):
+		# 커널(game/kernel.py)에 넘길 물리 상수 묶음
+		self.params = kernel.PhysicsParams(
+			tunnel_width=self.TUNNEL_WIDTH,
+			tunnel_height=self.TUNNEL_HEIGHT,
+			tunnel_length=self.TUNNEL_LENGTH,
+			initial_ball_scale=self.INITIAL_BALL_SCALE,
+			max_ball_scale=self.MAX_BALL_SCALE,
+			base_hit_threshold=self.BASE_HIT_THRESHOLD,
+			speed_factor=self.BALL_SPEED_FACTOR,
+			max_speed=self.MAX_SPEED,
+			collision_angle_factor=self.COLLISION_ANGLE_FACTOR,
+			collision_speed_increase=self.COLLISION_SPEED_INCREASE,
+			player1_hit_zone=(self.PLAYER1_HIT_ZONE_END, self.PLAYER1_HIT_ZONE_START),
+			player2_hit_zone=(self.PLAYER2_HIT_ZONE_END, self.PLAYER2_HIT_ZONE_START),
+			player1_hit_plane=self.PLAYER1_HIT_PLANE,
+			player2_hit_plane=self.PLAYER2_HIT_PLANE,
+			player1_goal_z=self.PLAYER1_GOAL_Z,
+			player2_goal_z=self.PLAYER2_GOAL_Z,
+			max_swept_events=self.MAX_SWEPT_EVENTS
+		)
+
+	def normalize_velocity(self, ball, target_speed):
 		"""속도 벡터를 정규화하여 일정한 속도 유지"""
-		speed = math.sqrt(velocity['x']**2 + velocity['y']**2 + velocity['z']**2)
+		speed = math.sqrt(ball.vx**2 + ball.vy**2 + ball.vz**2)
 		if speed > target_speed:
 			scale = target_speed / speed
-			velocity['x'] *= scale
-			velocity['y'] *= scale
-			velocity['z'] *= scale
-		return velocity
+			ball.vx *= scale
+			ball.vy *= scale
+			ball.vz *= scale
+		return ball
 
-	def reset_ball(self):
+	def reset_ball(self, ball):
 		initial_speed = self.BALL_SPEED
 		angle = random.uniform(-math.pi/4, math.pi/4)
 		
@@ -402,11 +391,9 @@ class GamePhysics:
 		vy = (vy / total_speed) * initial_speed
 		vz = (vz / total_speed) * initial_speed
 
-		return {
-			'position': {'x': 0, 'y': 0.2, 'z': -self.TUNNEL_LENGTH/2},
-			'velocity': {'x': vx, 'y': vy, 'z': vz},
-			'scale': self.BALL_SCALE
-		}
+		# 새 객체를 만들지 않고 기존 공을 그대로 재사용
+		ball.reset(0, 0.2, -self.TUNNEL_LENGTH/2, vx, vy, vz, self.BALL_SCALE)
+		return ball
 	
 	def calculate_ball_scale(self, z_position):
 		# 터널 중앙점 계산 (예: -42 ~ 0 범위에서는 -21이 중앙)
@@ -430,122 +417,99 @@ class GamePhysics:
 		ball_scale = self.calculate_ball_scale(z_position)
 		return self.BASE_HIT_THRESHOLD * (ball_scale / self.INITIAL_BALL_SCALE)
 
-	async def _process_physics_substep(self, game_state, delta_time):
-		ball = game_state['ball']
-		current_time = int(time.time() * 1000)
-		
-		# 다음 위치 계산
-		next_x = ball['position']['x'] + ball['velocity']['x'] * delta_time * self.BALL_SPEED_FACTOR
-		next_y = ball['position']['y'] + ball['velocity']['y'] * delta_time * self.BALL_SPEED_FACTOR
-		next_z = ball['position']['z'] + ball['velocity']['z'] * delta_time * self.BALL_SPEED_FACTOR
-
-		# 공의 크기 업데이트
-		ball['scale'] = self.calculate_ball_scale(next_z)
-		
-		# 1. 득점 체크
-		if next_z <= -self.TUNNEL_LENGTH - 1:
-			ball['position'].update({'x': next_x, 'y': next_y, 'z': next_z})
-			return 'player1'
-		elif next_z >= 1:
-			ball['position'].update({'x': next_x, 'y': next_y, 'z': next_z})
-			return 'player2'
-
-		# 2. x, y축 벽 충돌 처리
-		if abs(next_x) > self.TUNNEL_WIDTH:
-			ball['velocity']['x'] *= -1
-			next_x = math.copysign(self.TUNNEL_WIDTH - 0.01, next_x)
-			
-		if abs(next_y) > self.TUNNEL_HEIGHT:
-			ball['velocity']['y'] *= -1
-			next_y = math.copysign(self.TUNNEL_HEIGHT - 0.01, next_y)
-
-		# Player 1 패들 충돌 검사 (0쪽)
-		if (next_z >= self.PLAYER1_HIT_ZONE_END and 
-			next_z <= self.PLAYER1_HIT_ZONE_START):
-			
-			player = game_state['players'].get('player1')
-			if player:
-				# 동적 히트박스 크기 계산
-				current_hit_threshold = self.calculate_hit_threshold(next_z)
-				
-				dx = abs(next_x - player['position']['x'])
-				dy = abs(next_y - player['position']['y'])
-				distance = math.sqrt(dx * dx + dy * dy)
-				
-				if distance <= current_hit_threshold:
-					hit_angle_x = (next_x - player['position']['x']) / current_hit_threshold
-					hit_angle_y = (next_y - player['position']['y']) / current_hit_threshold
-					
-					current_speed = math.sqrt(
-						ball['velocity']['x']**2 +
-						ball['velocity']['y']**2 +
-						ball['velocity']['z']**2
-					)
-					new_speed = min(current_speed * self.COLLISION_SPEED_INCREASE, self.MAX_SPEED)
-					
-					ball['velocity']['x'] = hit_angle_x * new_speed * self.COLLISION_ANGLE_FACTOR
-					ball['velocity']['y'] = hit_angle_y * new_speed * self.COLLISION_ANGLE_FACTOR
-					ball['velocity']['z'] = -abs(new_speed)
-					
-					ball['velocity'] = self.normalize_velocity(ball['velocity'], new_speed)
-					next_z = self.PLAYER1_HIT_ZONE_END - 0.1
+	def _ball_state(self, game_state):
+		ball = game_state.ball
+		return kernel.BallState(ball.x, ball.y, ball.z, ball.vx, ball.vy, ball.vz, ball.scale)
+
+	def _paddles(self, game_state):
+		paddles = []
+		for player in ('player1', 'player2'):
+			paddle = game_state.players.get(player)
+			paddles.append((paddle.x, paddle.y) if paddle is not None else None)
+		return tuple(paddles)
+
+	def _apply(self, game_state, result):
+		"""커널 결과를 Match에 반영 - 시간 기록은 커널 밖인 여기서만 한다"""
+		game_state.ball.reset(*result.ball)
+		if not result.scoring_player:
+			game_state.timestamp = int(time.time() * 1000)
+		return result.scoring_player
+
+	def step(self, game_state, delta_time, substeps):
+		result = kernel.step(
+			self._ball_state(game_state), self._paddles(game_state),
+			delta_time, substeps, self.SWEPT_COLLISION, self.params
+		)
+		return self._apply(game_state, result)
 
-		# Player 2 패들 충돌 검사 (-42쪽)
-		elif (next_z >= self.PLAYER2_HIT_ZONE_END and 
-			next_z <= self.PLAYER2_HIT_ZONE_START):
-			
-			player = game_state['players'].get('player2')
-			if player:
-				# 동적 히트박스 크기 계산
-				current_hit_threshold = self.calculate_hit_threshold(next_z)
-				
-				dx = abs(next_x - player['position']['x'])
-				dy = abs(next_y - player['position']['y'])
-				distance = math.sqrt(dx * dx + dy * dy)
-				
-				if distance <= current_hit_threshold:
-					hit_angle_x = (next_x - player['position']['x']) / current_hit_threshold
-					hit_angle_y = (next_y - player['position']['y']) / current_hit_threshold
-					
-					current_speed = math.sqrt(
-						ball['velocity']['x']**2 +
-						ball['velocity']['y']**2 +
-						ball['velocity']['z']**2
-					)
-					new_speed = min(current_speed * self.COLLISION_SPEED_INCREASE, self.MAX_SPEED)
-					
-					ball['velocity']['x'] = hit_angle_x * new_speed * self.COLLISION_ANGLE_FACTOR
-					ball['velocity']['y'] = hit_angle_y * new_speed * self.COLLISION_ANGLE_FACTOR
-					ball['velocity']['z'] = abs(new_speed)
-					
-					ball['velocity'] = self.normalize_velocity(ball['velocity'], new_speed)
-					next_z = self.PLAYER2_HIT_ZONE_START + 0.1
+	def advance(self, game_state, duration):
+		"""이벤트 구동 모드 - duration초 동안의 궤적을 해석적으로 한 번에 진행"""
+		result = kernel.advance(
+			self._ball_state(game_state), self._paddles(game_state),
+			duration, self.params, self.MAX_ADVANCE_EVENTS
+		)
+		return self._apply(game_state, result)
+
+	def time_to_next_event(self, game_state):
+		"""다음 패들 평면 또는 골 평면까지 남은 시간(초)"""
+		return kernel.time_to_next_event(self._ball_state(game_state), self.params)
+
+	def time_since_plane(self, game_state):
+		"""골 평면을 넘은 공이 직전 패들 평면을 지난 뒤 흐른 시간(초) - 알 수 없으면 None"""
+		rewound = kernel.rewind_to_plane(self._ball_state(game_state), self.params)
+		return rewound[1] if rewound is not None else None
+
+	def compensate_miss(self, game_state, crossed_at, window_end, now):
+		"""지연 보상 - 골 판정 전에 수비 플레이어가 실제로는 막았는지 다시 판정
+
+		플레이어는 공이 패들 평면을 지나는 모습을 늦게 보고 반응하므로, 공을 평면 통과
+		시점(crossed_at)으로 되감고 [crossed_at, window_end] 동안 받은 패들 입력으로 충돌을
+		검사한다. 막았으면 그 지점에서 반사시켜 now까지 다시 진행하고 True 반환.
+		"""
+		rewound = kernel.rewind_to_plane(self._ball_state(game_state), self.params)
+		if rewound is None:
+			return False
+		crossing, _ = rewound
+		player, direction = ('player1', -1) if crossing.vz > 0 else ('player2', 1)
+		for paddle in reversed(game_state.paddle_history[player].samples_between(crossed_at, window_end)):
+			velocity = kernel.reflect(
+				crossing.vx, crossing.vy, crossing.vz,
+				crossing.x, crossing.y, crossing.z, paddle, direction, self.params
+			)
+			if velocity:
+				vx, vy, vz = velocity
+				bounced = crossing._replace(vx=vx, vy=vy, vz=vz)
+				result = kernel.advance(
+					bounced, self._paddles(game_state), max(now - crossed_at, 0.0),
+					self.params, self.MAX_ADVANCE_EVENTS
+				)
+				self._apply(game_state, result._replace(scoring_player=None))
+				return True
+		return False
 
-		# 위치 업데이트
-		ball['position'].update({'x': next_x, 'y': next_y, 'z': next_z})
-		game_state['timestamp'] = current_time
+	def process_physics(self, game_state, delta_time):
+		delta_time = min(delta_time, self.MAX_DELTA_TIME)
+		return self.step(game_state, delta_time, self.PHYSICS_SUBSTEPS)
 
-		return None
+	def fixed_substeps(self, step_time):
+		"""고정 타임스텝 한 틱에 필요한 substep 수 - delta를 자르지 않고 substep 수를 늘린다"""
+		if self.SWEPT_COLLISION:
+			return self.PHYSICS_SUBSTEPS
+		return self.PHYSICS_SUBSTEPS * max(1, math.ceil(step_time / self.MAX_DELTA_TIME - 1e-9))
 
-	async def process_physics(self, game_state, delta_time):
-		delta_time = min(delta_time, self.MAX_DELTA_TIME)
-		substep_delta = delta_time / self.PHYSICS_SUBSTEPS
-		
-		for _ in range(self.PHYSICS_SUBSTEPS):
-			scoring_player = await self._process_physics_substep(game_state, substep_delta)
-			if scoring_player:
-				return scoring_player
-				
-		return None
+	def process_fixed_step(self, game_state, step_time):
+		"""고정 타임스텝 한 틱 처리"""
+		return self.step(game_state, step_time, self.fixed_substeps(step_time))
 
 
 
 class GameScoreHandler:
-	def __init__(self, game_state, physics, channel_layer, game_group_name):
+	def __init__(self, game_state, physics, channel_layer, game_group_name, spectator_group_name=None):
 		self.game_state = game_state
 		self.physics = physics
 		self.channel_layer = channel_layer
 		self.game_group_name = game_group_name
+		self.spectator_group_name = spectator_group_name
 		self.score_animation = {'active': False, 'start_time': 0}
 		self.WIN_SCORE = 5
 		self.game_end = False
@@ -556,29 +520,34 @@ class GameScoreHandler:
 			return
 			
 		print(f"Player {scoring_player} scored", file=sys.stderr)
-		self.game_state['score'][scoring_player] += 1
+		self.game_state.score[scoring_player] += 1
 		
 		# 즉시 공 리셋
-		self.game_state['ball'] = self.physics.reset_ball()
+		self.physics.reset_ball(self.game_state.ball)
 		
 		# 승리 조건 확인
-		if self.game_state['score'][scoring_player] >= self.WIN_SCORE:
+		if self.game_state.score[scoring_player] >= self.WIN_SCORE:
 			await self._handle_game_end(scoring_player)
 		else:
 			await self._handle_score_animation()
 
 	async def _handle_game_end(self, winner):
 		"""게임 종료 처리"""
-		self.game_state['game_started'] = False
+		self.game_state.game_started = False
 		self.game_end = True
 		await self.channel_layer.group_send(
 			self.game_group_name,
 			{
 				'type': 'game_end',
 				'winner': winner,
-				'match': self.game_state.get('match_type', '0')
+				'match': self.game_state.match_type or '0'
 			}
 		)
+		if self.spectator_group_name:
+			await self.channel_layer.group_send(
+				self.spectator_group_name,
+				encoded_event('game_message', {'type': 'game_end', 'winner': winner})
+			)
 		logger.info(f"Game ended. Winner: {winner}")
 
 	async def _handle_score_animation(self):
@@ -589,8 +558,8 @@ class GameScoreHandler:
 		}
 		await asyncio.sleep(1)
 		
-		self.game_state['ball'] = self.physics.reset_ball()
-		self.game_state['ball']['velocity']['z'] *= 1.5  # 더 빠르게
+		self.physics.reset_ball(self.game_state.ball)
+		self.game_state.ball.vz *= 1.5  # 더 빠르게
 
 	async def update_score_animation(self):
 		"""애니메이션 상태 업데이트"""
@@ -601,7 +570,7 @@ class GameScoreHandler:
 		if current_time - self.score_animation['start_time'] >= self.physics.SCORE_ANIMATION_DURATION:
 			self.score_animation['active'] = False
 			# 새 라운드 시작을 위한 리셋
-			self.game_state['ball'] = self.physics.reset_ball()
+			self.physics.reset_ball(self.game_state.ball)
 			await asyncio.sleep(self.physics.GAME_RESUME_DELAY)
 			return False
 			
@@ -637,12 +606,19 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 		self.FRAME_TIME = 1/self.TARGET_FPS
 		self.backup_task = None
 		self.physics = GamePhysics()
+		self.codec = JsonCodec()
+		self.outbound = OutboundQueue(self.write_payload, on_drop=self.on_outbound_drop)
 		self.last_cache_update = time.time()
 		self.CACHE_UPDATE_INTERVAL = 0.1  # 100ms
 		self.match = None
 		self.PAUSE_DURATION = 10 # 10초
 		self.pause_task = None
 		self.game_started = False
+		self.clock = None
+		self.clock_task = None
+		self.heartbeat = None
+		self.heartbeat_task = None
+		self.connection_closed = False  # heartbeat 타임아웃으로 먼저 정리했으면 True
 		
 
 
@@ -651,6 +627,7 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 		self.UPDATE_RATE = 1/60  # 60 FPS
 		self.game_id : str = self.scope['url_route']['kwargs']['game_id']
 		self.game_group_name = f'game_{self.game_id}'
+		self.spectator_group_name = f'spectate_{self.game_id}'
 		query_string = self.scope['query_string'].decode()
 		query_params = parse_qs(query_string)
 		self.nickname = query_params.get('nickname', [None])[0]
@@ -682,9 +659,9 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 		# 	return
 		# 탈주자 인지 확인
 		is_reconnecting = False
-		if self.nickname in self.game_state['disconnected_player']:
+		if self.nickname in self.game_state.disconnected_player:
 			print(f"Player {self.nickname} reconnecting to game", file=sys.stderr)
-			self.game_state['disconnected_player'].remove(self.nickname)
+			self.game_state.disconnected_player.remove(self.nickname)
 			is_reconnecting = True
 
 			# if not self.game_state['disconnected_player']:
@@ -700,45 +677,58 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 
 		# 	return
 		await self.channel_layer.group_add(self.game_group_name, self.channel_name)
-		await self.accept()
+		await group_delivery.join(self.game_group_name, self)
+		# 클라이언트가 바이너리 서브프로토콜을 요청했으면 그 코덱으로, 아니면 JSON
+		self.codec, subprotocol = negotiate(self.scope.get('subprotocols'))
+		await self.accept(subprotocol=subprotocol)
+		self.outbound.start()
 
 		
 		
 		print("game_state: ", self.game_state, file=sys.stderr)
-		self.game_state['match_type'] = self.match
+		self.game_state.match_type = self.match
 
 		
 		self.score_handler = GameScoreHandler(
 		self.game_state,
 		self.physics,
 		self.channel_layer,
-		self.game_group_name
+		self.game_group_name,
+		self.spectator_group_name if self.match in SPECTATOR_MATCH_TYPES else None
 		)
 
 
 		self.player_number = await self.assign_player_number()
+		if self.player_number:
+			# 상대의 패들 입력이 이 채널로 바로 오도록 슬롯 등록
+			await group_delivery.join(self.game_group_name, self, slot=self.player_number)
+			self.clock = ClockSync(CLOCK_SYNC_SAMPLES, label=f'{self.game_id}/{self.player_number}')
+			self.clock_task = asyncio.create_task(self.run_clock_sync())
+			self.heartbeat = Heartbeat(HEARTBEAT_INTERVAL, HEARTBEAT_MISS_THRESHOLD, label=f'{self.game_id}/{self.player_number}')
+			self.heartbeat_task = asyncio.create_task(self.run_heartbeat())
 		
 		
 		if self.player_number:
 			
-			await self.send(json.dumps({
+			await self.send_message({
 				'type': 'player_assigned',
 				'player_number': self.player_number
-			}))
+			})
 			logger.info(f"Player {self.nickname} assigned as {self.player_number}")
 			if is_reconnecting:
 				print(f"Reconnection for {self.nickname}", file=sys.stderr)
 				await self.handle_reconnection()
-			if len(self.game_state['players']) == 2:
+			if len(self.game_state.players) == 2:
 				print(f"Game starting for {self.nickname}", file=sys.stderr)
 				await self.start_game()
 				self.backup_task = asyncio.create_task(self.periodic_backup())
 		else:
 			logger.warning(f"Failed to assign player number for {self.nickname}")
-			await self.send(json.dumps({
+			await self.send_message({
 				'type': 'connection_failed',
 				'reason': 'Game is full'
-			}))
+			})
+			await self.outbound.flush()
 			await self.close()
 
 
@@ -753,13 +743,15 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 		# 	except asyncio.CancelledError:
 		# 		pass
 			
+		# 새 연결의 input_sequence는 0부터 다시 시작한다
+		game_engine.reset_player_inputs(self.game_id, self.player_number)
+
 		# 현재 게임 상태 전송
 		await self.send_reconnection_state()
 		
 		# 게임 재시작
-		if not self.game_state['disconnected_player']:
-			self.game_state['is_paused'] = False
-			self.game_state['pause_start_time'] = None
+		if not self.game_state.disconnected_player:
+			game_engine.resume_game(self.game_id)
 			if self.pause_task and not self.pause_task.done():
 				self.pause_task.cancel()
 				self.pause_task = None
@@ -773,41 +765,48 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 
 	async def send_reconnection_state(self):
 		print(f"Sending reconnection state to {self.nickname}", file=sys.stderr)
-		print(f"Game Score: {self.game_state['score']}", file=sys.stderr)
+		print(f"Game Score: {self.game_state.score}", file=sys.stderr)
 		current_state = {
 			'type': 'initial_game_state',
-			'ball': self.game_state['ball'],  # 이미 scale 포함
+			'ball': self.game_state.ball.to_dict(),  # 이미 scale 포함
 			'paddle': {
 				'players': {
-					'player1': self.game_state['players'].get('player1', {
-						'position': {'x': 0, 'y': 0, 'z': self.physics.PADDLE_Z_PLAYER1}
-					}),
-					'player2': self.game_state['players'].get('player2', {
-						'position': {'x': 0, 'y': 0, 'z': self.physics.PADDLE_Z_PLAYER2}
-					})
+					'player1': self.game_state.players.get('player1', Paddle(0, 0, self.physics.PADDLE_Z_PLAYER1)).to_dict(),
+					'player2': self.game_state.players.get('player2', Paddle(0, 0, self.physics.PADDLE_Z_PLAYER2)).to_dict()
 				},
-				'lastProcessedInput': self.game_state['lastProcessedInput']
+				'lastProcessedInput': dict(self.game_state.last_processed_input)
 			},
-			'score': self.game_state['score'],
-			'game_started': self.game_state['game_started'],
+			'score': dict(self.game_state.score),
+			'game_started': self.game_state.game_started,
+			'tick': self.game_state.tick,
 			'timestamp': int(time.time() * 1000)
 		}
-		await self.send(json.dumps(current_state))
+		await self.send_message(current_state)
 
 
 	async def assign_player_number(self):
-		if 'player1' not in self.game_state['players']:
-			self.game_state['players']['player1'] = {'position': {'x': 1, 'y': 0, 'z': self.physics.PADDLE_Z_PLAYER1}}
+		if 'player1' not in self.game_state.players:
+			self.game_state.players['player1'] = Paddle(1, 0, self.physics.PADDLE_Z_PLAYER1)
 			print(f"Player 1 assigned to {self.nickname}", file=sys.stderr)
 			return 'player1'
-		elif 'player2' not in self.game_state['players']:
-			self.game_state['players']['player2'] = {'position': {'x': 1, 'y': 0, 'z': self.physics.PADDLE_Z_PLAYER2}}
+		elif 'player2' not in self.game_state.players:
+			self.game_state.players['player2'] = Paddle(1, 0, self.physics.PADDLE_Z_PLAYER2)
 			print(f"Player 2 assigned to {self.nickname}", file=sys.stderr)
 			return 'player2'
 		print(f"No player slot available for {self.nickname}", file=sys.stderr)
 		return None
 
 	async def disconnect(self, close_code):
+		self.outbound.stop()
+		if self.clock_task:
+			self.clock_task.cancel()
+			self.clock_task = None
+		if self.heartbeat_task:
+			self.heartbeat_task.cancel()
+			self.heartbeat_task = None
+		if self.connection_closed:
+			return
+		self.connection_closed = True
 		if self.game_state is None:
 			return
 		# 남은 플레이어에게 승리 메시지 전송
@@ -819,19 +818,19 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 			except asyncio.CancelledError:
 				pass
 			GameState.remove_game_task(self.game_id)
+		game_engine.stop_game(self.game_id)
 
 			
 		print(f"Player {self.nickname} disconnected", file=sys.stderr)
-		if self.game_state and self.game_state.get('game_started', False):
+		if self.game_state and self.game_state.game_started:
 			# 게임 pause 상태 설정
-			self.game_state['is_paused'] = True
-			self.game_state['pause_start_time'] = time.time()
+			game_engine.pause_game(self.game_id)
 			print(f"Game paused for 30 seconds due to {self.nickname} disconnect", file=sys.stderr)
 			if self.pause_task and not self.pause_task.done():
 				self.pause_task.cancel()
 			self.pause_task = asyncio.create_task(self.resume_game_after_delay())
 		
-		if self.game_state['game_started']:
+		if self.game_state.game_started:
 			await self.handle_room_disconnect()
 
 			
@@ -845,24 +844,25 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 			self.backup_task.cancel()
 			
 		if self.player_number and self.game_state:
-			if self.player_number in self.game_state['players']:
+			if self.player_number in self.game_state.players:
 				print(f"Removing player {self.player_number} from game state", file=sys.stderr)
-				del self.game_state['players'][self.player_number]
+				del self.game_state.players[self.player_number]
 			
-			if not self.game_state['players']:
+			if not self.game_state.players:
 				GameState.remove_game(self.game_id)
 				
 		await self.channel_layer.group_discard(self.game_group_name, self.channel_name)
+		await group_delivery.leave(self.game_group_name, self)
 		logger.info(f"Player {self.nickname} disconnected")
 
 	async def handle_room_disconnect(self):
 		# 1. 플레이어 탈주 기록 추가
-		self.game_state['disconnected_player'].append(self.nickname)
-		disconnect_count = len(self.game_state['disconnected_player'])
-		print(f"Disconnected players: {self.game_state['disconnected_player']}", file=sys.stderr)
+		self.game_state.disconnected_player.append(self.nickname)
+		disconnect_count = len(self.game_state.disconnected_player)
+		print(f"Disconnected players: {self.game_state.disconnected_player}", file=sys.stderr)
 		print(f"Disconnect count: {disconnect_count}", file=sys.stderr)
 		
-		if disconnect_count == 2 and self.game_state['game_started']:
+		if disconnect_count == 2 and self.game_state.game_started:
 			await sync_to_async(cache.set)(f'game_status_{self.game_id}', False, timeout=ROOM_TIMEOUT)
 			print(f"Game ended due to 2 players disconnecting", file=sys.stderr)
 			
@@ -889,14 +889,18 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 		
 		
 
-	async def receive(self, text_data):
+	async def receive(self, text_data=None, bytes_data=None):
 		try:
-			data = json.loads(text_data)
+			data = self.codec.decode(text_data, bytes_data)
 			
 			if data['type'] == 'client_state_update':
 				await self.handle_client_update(data)
 			elif data['type'] == 'sync_time':
 				await self.sync_time(data)
+			elif data['type'] == 'time_probe_ack':
+				await self.handle_time_probe_ack(data)
+			elif data['type'] == 'pong':
+				self.handle_pong(data)
 			elif data['type'] == 'request_game_state':
 				await self.send_full_game_state()
 		except json.JSONDecodeError:
@@ -907,20 +911,21 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 			logger.error(f"Unexpected error in receive: {e}")
 
 	async def count_start(self, event):
-		await self.send(json.dumps({
+		await self.send_message({
 			'type': 'countdown_start'
-		}))
+		})
 	async def start_game(self):
 		
 		await asyncio.sleep(1)
 		
-		self.game_state['game_started'] = True
+		self.game_state.game_started = True
 		await self.channel_layer.group_send(
 			self.game_group_name,
-			{
-				'type': 'game_message',
-				'message': {'type': 'game_start'}
-			}
+			encoded_event('game_message', {
+				'type': 'game_start',
+				'tick_rate': game_engine.tick_rate,
+				'snapshot_rate': game_engine.snapshot_rate
+			})
 		)
 		
 		
@@ -930,16 +935,18 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 		print(f"Sending countdown event: {event}", file=sys.stderr)  # 디버그 로그
 		
 		# event에서 count 값을 가져옴 ('countdown' 대신 'count' 사용)
-		await self.send(json.dumps({
+		await self.send_message({
 			'type': 'countdown',
 			'count': event.get('count', 3)  # 기본값 3 설정
-		}))
+		})
 
 	async def game_loop(self):
 		
 
-		# 시간 동기화 요청
-		server_time = time.time()
+		# 시간 동기화 요청 - 시각은 clock_sync와 같은 ms
+		server_time = int(time.time() * 1000)
+		# 가장 느린 플레이어에게도 카운트다운 시작 전에 도착하도록 편도 지연(ClockSync 추정치)만큼 늦게 시작
+		lead = max((rtt for rtt in self.game_state.clock_rtt.values() if rtt is not None), default=0) / 2
 		await self.channel_layer.group_send(
 			self.game_group_name,
 			{
@@ -952,6 +959,7 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 		countdown_sequence = {
 			'type': 'countdown_sequence',
 			'server_time': server_time,
+			'start_time': int(server_time + lead),  # ms - 클라이언트는 clock_sync의 offset을 더해 자기 시각으로 바꾼다
 			'sequence': [
 				{'count': 3, 'delay': 1},  # 1초 후
 				{'count': 2, 'delay': 2},  # 2초 후
@@ -962,78 +970,41 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 
 		await self.channel_layer.group_send(
 			self.game_group_name,
-			{
-				'type': 'game_message',
-				'message': countdown_sequence
-			}
+			encoded_event('game_message', countdown_sequence)
 		)
 
-		await asyncio.sleep(5)  # 카운트다운 완료 + 여유시간
+		await asyncio.sleep(5 + lead / 1000)  # 카운트다운 완료 + 여유시간
 
 
 		self.physics.game_started = True
-		self.last_update_time = time.time()
-		frame_count = 0
-		while self.game_state['game_started']:
-			loop_start = time.time()
-			if not self.game_state['is_paused']:  # 공유 상태로 체크
-				current_time = time.time()
-				update_task = asyncio.create_task(self.update_game_state())
-				frame_duration = time.time() - loop_start
-				sleep_duration = max(0, self.FRAME_TIME - frame_duration)
-				await asyncio.gather(
-					update_task,
-					asyncio.sleep(sleep_duration)
-				)
-				self.last_update_time = current_time
-				frame_count += 1
-				if frame_count % 100 == 0:
-					actual_fps = 100 / (time.time() - loop_start)
-					print(f"Current FPS: {actual_fps:.2f}", file=sys.stderr)
-			else:
-				await asyncio.sleep(self.FRAME_TIME)
-
-	async def update_game_state(self):
-		current_time = time.time()
-		delta_time = min(current_time - self.last_update_time, 1/30)
-		
-		# 로그 추가
-		logger.debug(f"Raw delta time: {delta_time}")
-		
-		# 최소 프레임 시간 보장
-		if delta_time < 1/120:  # 120 FPS
-			return
-			
-		self.last_update_time = current_time
-
-		# 득점 애니메이션 중인지 확인
-		# print(f"Updating game state for {self.nickname}", file=sys.stderr)
-		if await self.score_handler.update_score_animation():
-			await self.save_to_cache()  # 득점 시 상태 저장
-
-			return
-
-		# 게임 물리 처리
-		scoring_player = await self.physics.process_physics(self.game_state, delta_time)
-		
-		# 득점 처리
-		if scoring_player:
-			await self.save_to_cache()  # 득점 시 상태 저장
-			await self.score_handler.handle_scoring(scoring_player)
-		
-		await self.broadcast_partial_state()
+		# 이후 시뮬레이션은 프로세스 공용 엔진이 진행한다
+		game_engine.start_game(GameSession(
+			self.game_id,
+			self.game_state,
+			self.physics,
+			self.score_handler,
+			publish=self.broadcast_partial_state,
+			save=self.save_to_cache,
+			publish_input=self.broadcast_opponent_update,
+			publish_spectators=self.broadcast_spectator_frame if self.match in SPECTATOR_MATCH_TYPES else None,
+			encoder=SnapshotEncoder(
+				self.POSITION_PRECISION,
+				self.VELOCITY_PRECISION,
+				ENGINE_SETTINGS.get('KEYFRAME_INTERVAL', 30)
+			)
+		))
 
 	async def game_end(self, event):
 		try:
 			# 1. 먼저 게임 종료 메시지를 클라이언트에 전송
-			await self.send(text_data=json.dumps({
+			await self.send_message({
 				'type': 'game_end',
 				'winner': event['winner'],
 				'match': event['match']
-			}))
+			})
 			
 			# 3. 게임 상태 초기화
-			self.game_state['game_started'] = False
+			self.game_state.game_started = False
 			if self.backup_task:
 				self.backup_task.cancel()
 			
@@ -1044,10 +1015,12 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 			
 			# 6. 마지막으로 채널 연결 정리
 			await self.channel_layer.group_discard(self.game_group_name, self.channel_name)
+			await group_delivery.leave(self.game_group_name, self)
 			
 		except Exception as e:
 			print(f"Error in game_end: {e}", file=sys.stderr)
 			await self.channel_layer.group_discard(self.game_group_name, self.channel_name)
+			await group_delivery.leave(self.game_group_name, self)
 			
 
 	async def handle_game_end_cleanup(self, event):
@@ -1067,7 +1040,7 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 	async def handle_deserter(self, event):
 		if self.match == '0' or self.match == '3' or self.match == '4':
 			return
-		if len(self.game_state['disconnected_player']) == 1:
+		if len(self.game_state.disconnected_player) == 1:
 			# 한 게임에서 1명 탈주한 경우 3rd 룸 처리
 			print("Handling 3rd room disconnect", file=sys.stderr)
 			game_id = self.game_id.split('_')[0]
@@ -1179,7 +1152,7 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 				print(f"Player {player_number}: {player_data['nickname']}, {player_data['intraId']}", file=sys.stderr)
 				
 				if user:
-					score = self.game_state['score'].get(player_number, 0)
+					score = self.game_state.score.get(player_number, 0)
 					await self.create_user_game_log(
 						user.id,
 						game_log.id,
@@ -1197,7 +1170,7 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 						str(str(game_log.id),),
 						json.dumps(players),
 						json.dumps(room),
-						json.dumps(self.game_state),
+						json.dumps(self.game_state.to_dict()),
 						str(self.match),
 					])
 
@@ -1228,74 +1201,152 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 				abs(position['y']) > self.physics.TUNNEL_HEIGHT):
 				return
 
-			self.game_state['players'][player]['position'] = position
-			self.game_state['lastProcessedInput'][player] = input_sequence
+			if not game_engine.submit_input(self.game_id, player, position, input_sequence):
+				return
 
-			await self.channel_layer.group_send(
-				self.game_group_name,
-				{
-					'type': 'opponent_update',
-					'player': player,
-					'position': position,
-					'input_sequence': input_sequence
-				}
-			)
+			# 엔진이 진행 중이면 틱마다 모아서 보내고, 그 전(카운트다운)에는 바로 보낸다
+			if not game_engine.is_running(self.game_id):
+				await self.broadcast_opponent_update(player, position, input_sequence)
 		except Exception as e:
 			logger.error(f"Error in handle_client_update: {e}")
 
-	async def opponent_update(self, event):
-		if self.player_number != event['player']:
-			await self.send(text_data=json.dumps({
+	async def broadcast_opponent_update(self, player, position, input_sequence):
+		# 그룹 전체가 아니라 상대 슬롯에게만 보낸다 (관전자는 자기 주기의 스냅샷으로 받는다)
+		opponent = 'player2' if player == 'player1' else 'player1'
+		await group_delivery.send_to_slot(
+			self.game_group_name,
+			opponent,
+			{
 				'type': 'opponent_update',
-				'player': event['player'],
-				'position': event['position'],
-				'input_sequence': event['input_sequence']
-			}))
+				'player': player,
+				'position': position,
+				'input_sequence': input_sequence
+			}
+		)
+
+	async def opponent_update(self, event):
+		await self.send_payload(self.codec.encode({
+			'type': 'opponent_update',
+			'player': event['player'],
+			'position': event['position'],
+			'input_sequence': event['input_sequence']
+		}), latest='opponent')
 
 	async def sync_time(self, data):
 		try:
 			# 'timestamp' 또는 'client_time' 키를 사용
 			client_time = data.get('timestamp', data.get('client_time', int(time.time() * 1000)))
 			
-			await self.send(json.dumps({
+			await self.send_message({
 				'type': 'sync_time',
 				'client_timestamp': client_time,
 				'server_timestamp': int(time.time() * 1000)
-			}))
+			})
 		except Exception as e:
 			logger.error(f"Error in sync_time: {e}, data: {data}")
 
-	async def broadcast_partial_state(self):
-		updates = {
-			'type': 'game_state_update',
-			'ball': self.game_state['ball'],
-			'score': self.game_state['score'],
-			'timestamp': int(time.time() * 1000)
-		}
-		
-		await self.channel_layer.group_send(
-			self.game_group_name,
-			{
-				'type': 'state_update',
-				'updates': updates
-			}
-		)
+	async def run_clock_sync(self):
+		"""접속 직후 probe를 연달아 보내 추정치를 빨리 만들고, 이후 주기적으로 갱신"""
+		try:
+			for _ in range(CLOCK_SYNC_BURST):
+				await self.send_message(self.clock.probe(int(time.time() * 1000)))
+				await asyncio.sleep(CLOCK_SYNC_BURST_INTERVAL)
+			while True:
+				await asyncio.sleep(CLOCK_SYNC_INTERVAL)
+				await self.send_message(self.clock.probe(int(time.time() * 1000)))
+		except asyncio.CancelledError:
+			pass
+		except Exception as e:
+			logger.error(f"Error in clock sync: {e}")
+
+	async def handle_time_probe_ack(self, data):
+		if self.clock is None:
+			return
+		if not self.clock.add_ack(data['id'], data['client_time'], int(time.time() * 1000)):
+			return
+		rtt = self.clock.rtt
+		game_engine.set_rtt(self.game_id, self.player_number, rtt / 1000)
+		if self.game_state is not None:
+			self.game_state.clock_rtt[self.player_number] = rtt
+		await self.send_message({
+			'type': 'clock_sync',
+			'offset': self.clock.offset,
+			'rtt': rtt,
+			'jitter': self.clock.jitter,
+			# 클라이언트가 스냅샷을 이만큼 늦춰 보간한다 (ms)
+			'interpolation_delay': self.clock.interpolation_delay(1000 / game_engine.snapshot_rate)
+		})
+
+	async def broadcast_partial_state(self, updates):
+		await group_delivery.send(self.game_group_name, encoded_event('state_update', updates))
+
+	async def run_heartbeat(self):
+		"""pong이 HEARTBEAT_MISS_THRESHOLD번 연속 오지 않으면 TCP 끊김을 기다리지 않고 끊긴 것으로 처리
+
+		pong을 한 번도 보내지 않은 클라이언트는 끊지 않는다 (Heartbeat.armed).
+		"""
+		try:
+			while not self.heartbeat.expire():
+				await self.send_message(self.heartbeat.ping(int(time.time() * 1000)))
+				await asyncio.sleep(self.heartbeat.interval)
+		except asyncio.CancelledError:
+			return
+		except Exception as e:
+			logger.error(f"Error in heartbeat: {e}")
+			return
+
+		print(f"Heartbeat timeout for {self.nickname} ({self.heartbeat.missed} missed)", file=sys.stderr)
+		metrics.incr('heartbeat_timeouts')
+		# disconnect가 지금 실행 중인 이 task를 취소하지 않도록 먼저 떼어 둔다
+		self.heartbeat_task = None
+		await self.disconnect(HEARTBEAT_CLOSE_CODE)
+		await self.close(code=HEARTBEAT_CLOSE_CODE)
+
+	def handle_pong(self, data):
+		if self.heartbeat is None:
+			return
+		rtt = self.heartbeat.pong(data['id'], int(time.time() * 1000))
+		if rtt is not None and not (self.clock and self.clock.ready):
+			# 시계 추정치가 생기기 전까지는 heartbeat RTT로 지연 보상
+			game_engine.set_rtt(self.game_id, self.player_number, self.heartbeat.rtt / 1000)
+
+	async def broadcast_spectator_frame(self, frame):
+		# 관전자 전체에 같은 JSON 한 벌 - 플레이어 그룹/코덱과는 따로 간다
+		await self.channel_layer.group_send(self.spectator_group_name, encoded_event('spectator_frame', frame))
 
 	async def state_update(self, event):
-		await self.send(text_data=json.dumps(event['updates']))
+		await self.send_payload(payload_for(event, self.codec), latest='state')
 
 	async def game_message(self, event):
-		await self.send(text_data=json.dumps(event['message']))
+		await self.send_payload(payload_for(event, self.codec))
+
+	async def send_message(self, message):
+		await self.send_payload(self.codec.encode(message))
+
+	async def send_payload(self, data, latest=None):
+		"""송신 큐에 넣는다 - latest가 있으면 대기 중인 같은 종류의 이전 메시지를 대체"""
+		self.outbound.put(data, latest)
+
+	async def write_payload(self, data):
+		if self.codec.binary:
+			await self.send(bytes_data=data)
+		else:
+			await self.send(text_data=data)
+
+	def on_outbound_drop(self, latest):
+		if latest == 'state':
+			# 버린 델타 프레임의 변경분(속도/점수)을 잃지 않도록 다음 스냅샷은 keyframe으로
+			game_engine.request_keyframe(self.game_id)
 
 	async def send_full_game_state(self):
-		await self.send(json.dumps({
+		await self.send_message({
 			'type': 'full_game_state',
-			'game_state': self.game_state
-		}))
+			'game_state': self.game_state.to_dict()
+		})
 
 	@sync_to_async
 	def save_to_cache(self):
-		cache.set(f'game_backup_{self.game_id}', self.game_state)
+		cache.set(f'game_backup_{self.game_id}', self.game_state.to_dict())
 
 	async def periodic_backup(self):
 		"""중요 게임 상태 주기적 백업"""
@@ -1313,9 +1364,9 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 		try:
 			await asyncio.sleep(self.PAUSE_DURATION)
 			
-			if self.game_state['is_paused']:  # 여전히 pause 상태인 경우
-				if len(self.game_state['disconnected_player']) == 1:
-					disconnected_nickname = self.game_state['disconnected_player'][0]
+			if self.game_state.is_paused:  # 여전히 pause 상태인 경우
+				if len(self.game_state.disconnected_player) == 1:
+					disconnected_nickname = self.game_state.disconnected_player[0]
 					
 					# disconnected_nickname이 현재 플레이어가 아니면 현재 플레이어가 승자
 					winner = self.player_number if disconnected_nickname != self.nickname else ('player2' if self.player_number == 'player1' else 'player1')
@@ -1332,10 +1383,91 @@ class GamePingPongConsumer(AsyncWebsocketConsumer):
 					)
 				else:
 					# 모든 플레이어가 재연결된 상태라면 게임 재개
-					self.game_state['is_paused'] = False
-					self.game_state['pause_start_time'] = None
+					game_engine.resume_game(self.game_id)
 			
 		except asyncio.CancelledError:
 			print("Resume game task cancelled", file=sys.stderr)
 		except Exception as e:
 			logger.error(f"Error in resume_game_after_delay: {e}")
+
+
+class GameSpectatorConsumer(AsyncWebsocketConsumer):
+	"""읽기 전용 관전 소켓 (ws/game/<game_id>/spectate)
+
+	플레이어 그룹(game_<id>)이 아니라 spectate_<id> 그룹에 들어가고, 엔진이 SPECTATOR_RATE로
+	한 번 직렬화해 보낸 프레임 텍스트를 그대로 내보낸다. 관전자가 보내는 메시지는 무시한다.
+	"""
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.game_id = None
+		self.spectator_group_name = None
+		self.codec = JsonCodec()  # 관전/로비 소켓은 JSON 텍스트만 쓴다
+		self.outbound = OutboundQueue(self.send_text)
+
+	async def connect(self):
+		self.game_id = self.scope['url_route']['kwargs']['game_id']
+		if self.game_id.split('_')[-1] not in SPECTATOR_MATCH_TYPES:
+			print(f"Spectate REJECT - Match type not spectatable: {self.game_id}", file=sys.stderr)
+			await self.close()
+			return
+		self.spectator_group_name = f'spectate_{self.game_id}'
+		await self.channel_layer.group_add(self.spectator_group_name, self.channel_name)
+		await self.accept()
+		self.outbound.start()
+
+		# 이 프로세스에서 진행 중인 게임이면 다음 프레임을 기다리지 않고 바로 그린다
+		game_state = GameState.active_games.get(self.game_id)
+		if game_state is not None and game_state.game_started:
+			self.outbound.put(json.dumps(game_engine.build_spectator_frame(game_state)), latest='frame')
+
+	async def disconnect(self, close_code):
+		self.outbound.stop()
+		if self.spectator_group_name:
+			await self.channel_layer.group_discard(self.spectator_group_name, self.channel_name)
+
+	async def receive(self, text_data=None, bytes_data=None):
+		pass
+
+	async def spectator_frame(self, event):
+		# 밀리면 지난 프레임은 버리고 최신 것만
+		self.outbound.put(payload_for(event, self.codec), latest='frame')
+
+	async def game_message(self, event):
+		self.outbound.put(payload_for(event, self.codec))
+
+	async def send_text(self, data):
+		await self.send(text_data=data)
+
+
+class LobbyConsumer(AsyncWebsocketConsumer):
+	"""로비 목록 구독 소켓 (ws/lobby)
+
+	접속하면 지금 목록(lobby_snapshot)을 한 번 보내고, 이후에는 RoomStateManager가
+	방을 바꿀 때마다 발행하는 room_created / room_updated / room_removed 델타만 보낸다.
+	그룹에 먼저 가입한 뒤 목록을 만들므로 그 사이의 변경도 놓치지 않는다.
+	"""
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.room_state_manager = RoomStateManager()
+		self.codec = JsonCodec()
+		self.outbound = OutboundQueue(self.send_text)
+
+	async def connect(self):
+		await self.channel_layer.group_add(LOBBY_GROUP, self.channel_name)
+		await self.accept()
+		self.outbound.start()
+		rooms = await lobby_snapshot(self.room_state_manager)
+		self.outbound.put(json.dumps({'type': 'lobby_snapshot', 'rooms': rooms}))
+
+	async def disconnect(self, close_code):
+		self.outbound.stop()
+		await self.channel_layer.group_discard(LOBBY_GROUP, self.channel_name)
+
+	async def receive(self, text_data=None, bytes_data=None):
+		pass
+
+	async def lobby_event(self, event):
+		self.outbound.put(payload_for(event, self.codec))
+
+	async def send_text(self, data):
+		await self.send(text_data=data)
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+ROSTER_TIMEOUT = 3600  # 1 hour
+
+
+class GroupDelivery:
+	"""매 프레임 나가는 그룹 메시지를 위한 하이브리드 전달 계층
+
+	같은 프로세스에 있는 멤버(consumer)는 channel layer를 거치지 않고 핸들러를 바로
+	호출하고, 다른 노드에 있는 멤버에게만 channel_layer.send로 보낸다.
+	멤버 목록(roster: channel_name -> 플레이어 슬롯 또는 None)은 캐시에 두고,
+	프로세스마다 roster_refresh초 동안 재사용한다. 슬롯이 있으므로 패들 입력처럼
+	한 명에게만 가는 메시지는 send_to_slot으로 그 채널에만 보낸다.
+
+	제어 메시지는 지금처럼 group_send를 쓰므로 consumer는 channel layer 그룹에도 그대로 가입한다.
+	"""
+	def __init__(self, roster_refresh=1.0):
+		self.roster_refresh = roster_refresh
+		self.local = {}  # group -> {channel_name: consumer}
+		self.rosters = {}  # group -> (조회 시각, {channel_name: slot})
+		self.stats = {
+			'local_deliveries': 0,
+			'remote_deliveries': 0,
+			'directed_deliveries': 0,
+		}
+
+	def _roster_key(self, group):
+		return f'delivery_roster_{group}'
+
+	def _update_roster(self, group, channel_name, add, slot=None):
+		with cache.lock(f'{self._roster_key(group)}_lock', timeout=5):
+			roster = cache.get(self._roster_key(group)) or {}
+			if add:
+				if slot is not None:
+					# 재접속 등으로 슬롯 주인이 바뀌면 이전 채널은 슬롯을 잃는다
+					for member, member_slot in roster.items():
+						if member_slot == slot:
+							roster[member] = None
+				roster[channel_name] = slot
+			else:
+				roster.pop(channel_name, None)
+			if roster:
+				cache.set(self._roster_key(group), roster, timeout=ROSTER_TIMEOUT)
+			else:
+				cache.delete(self._roster_key(group))
+			return roster
+
+	async def join(self, group, consumer, slot=None):
+		"""group에 가입 (이미 가입했으면 slot만 갱신)"""
+		self.local.setdefault(group, {})[consumer.channel_name] = consumer
+		roster = await sync_to_async(self._update_roster)(group, consumer.channel_name, True, slot)
+		self.rosters[group] = (time.time(), roster)
+
+	async def leave(self, group, consumer):
+		members = self.local.get(group)
+		if members is None or members.pop(consumer.channel_name, None) is None:
+			return
+		if not members:
+			del self.local[group]
+		roster = await sync_to_async(self._update_roster)(group, consumer.channel_name, False)
+		if group in self.local:
+			self.rosters[group] = (time.time(), roster)
+		else:
+			self.rosters.pop(group, None)
+
+	async def _roster(self, group):
+		fetched_at, roster = self.rosters.get(group, (0, {}))
+		if time.time() - fetched_at > self.roster_refresh:
+			roster = await sync_to_async(cache.get)(self._roster_key(group)) or {}
+			self.rosters[group] = (time.time(), roster)
+		return roster
+
+	async def _remote_members(self, group):
+		local = self.local.get(group, {})
+		return [channel_name for channel_name in await self._roster(group) if channel_name not in local]
+
+	async def send(self, group, event):
+		"""group의 모든 멤버에게 event 전달 - 핸들러 이름은 channel layer와 같은 규칙(type의 '.' -> '_')"""
+		handler = event['type'].replace('.', '_')
+		# 로컬 핸들러가 이벤트에 채우는 코덱별 결과(bytes)가 원격으로 실려 가지 않도록 미리 복사해 둔다
+		remote_event = dict(event)
+		deliveries = [getattr(consumer, handler)(event) for consumer in list(self.local.get(group, {}).values())]
+		self.stats['local_deliveries'] += len(deliveries)
+
+		remote = await self._remote_members(group)
+		if remote:
+			channel_layer = get_channel_layer()
+			deliveries.extend(channel_layer.send(channel_name, remote_event) for channel_name in remote)
+			self.stats['remote_deliveries'] += len(remote)
+
+		results = await asyncio.gather(*deliveries, return_exceptions=True)
+		for result in results:
+			if isinstance(result, Exception):
+				logger.error(f"Error while delivering {event['type']} to {group}: {result}")
+
+	async def send_to_slot(self, group, slot, event):
+		"""group에서 slot을 맡은 멤버 한 명에게만 전달 - 없으면 False"""
+		roster = await self._roster(group)
+		channel_name = next((member for member, member_slot in roster.items() if member_slot == slot), None)
+		if channel_name is None:
+			return False
+		self.stats['directed_deliveries'] += 1
+		consumer = self.local.get(group, {}).get(channel_name)
+		try:
+			if consumer is not None:
+				self.stats['local_deliveries'] += 1
+				await getattr(consumer, event['type'].replace('.', '_'))(event)
+			else:
+				self.stats['remote_deliveries'] += 1
+				await get_channel_layer().send(channel_name, event)
+		except Exception as e:
+			logger.error(f"Error while delivering {event['type']} to {group}/{slot}: {e}")
+		return True
+
+
+group_delivery = GroupDelivery()
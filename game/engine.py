@@ -0,0 +1,586 @@
+import asyncio
+import logging
+import math
+import random
+import time
+
+from django.conf import settings
+
+from game.batch_physics import BatchPhysics
+from game.state import Ball, Match
+
+logger = logging.getLogger(__name__)
+
+
+class GameState:
+	active_games = {}
+	_game_tasks = {}  # game_id를 키로 하는 task dict
+
+
+	@classmethod
+	def get_game(cls, game_id):
+		if game_id not in cls.active_games:
+			initial_speed = 4  # physics의 BALL_SPEED와 동일하게
+			angle = random.uniform(-math.pi/4, math.pi/4)  # -45도에서 45도 사이의 랜덤 각도
+
+			# 삼각함수로 x, y 방향 속도 계산
+			vx = initial_speed * math.sin(angle)
+			vy = (random.random() - 0.5) * 2  # y축 변화는 좀 더 자유롭게
+			vz = initial_speed  # 기본 z축 속도
+
+			# 50% 확률로 반대 방향으로
+			if random.random() < 0.5:
+				vz *= -1
+
+			cls.active_games[game_id] = Match(game_id, Ball(0, 0.2, -42/2, vx, vy, vz))
+		return cls.active_games[game_id]
+
+	@classmethod
+	def remove_game(cls, game_id):
+		if game_id in cls.active_games:
+			del cls.active_games[game_id]
+
+	@classmethod
+	def set_game_task(cls, game_id, task):
+		cls._game_tasks[game_id] = task
+
+	@classmethod
+	def get_game_task(cls, game_id):
+		return cls._game_tasks.get(game_id)
+
+	@classmethod
+	def remove_game_task(cls, game_id):
+		if game_id in cls._game_tasks:
+			del cls._game_tasks[game_id]
+
+
+class GameSession:
+	"""엔진에 등록된 게임 한 판
+
+	physics/score_handler는 게임을 시작한 consumer의 것을 그대로 쓰고,
+	출력(publish)과 백업(save)은 consumer가 넘겨준 코루틴으로 내보낸다.
+	"""
+	def __init__(self, game_id, game_state, physics, score_handler, publish, save, encoder=None, publish_input=None,
+			publish_spectators=None):
+		self.game_id = game_id
+		self.game_state = game_state
+		self.physics = physics
+		self.score_handler = score_handler
+		self.publish = publish
+		self.save = save
+		self.encoder = encoder  # SnapshotEncoder - 없으면 매번 전체 상태를 보낸다
+		self.publish_input = publish_input  # (player, position, input_sequence) -> 상대에게 패들 위치 전달
+		self.publish_spectators = publish_spectators  # (frame) -> 관전자 그룹 전달, 관전할 수 없는 게임은 None
+		self.pending_inputs = {}  # player -> 이번 틱에 받은 마지막 (position, input_sequence)
+		self.unsent_inputs = {}  # player -> 반영했지만 아직 상대에게 보내지 못한 마지막 입력
+		self.publish_task = None  # 이 게임의 진행 중인 전송
+		self.busy = False  # 득점 처리(애니메이션) 중에는 시뮬레이션을 멈춘다
+		self.last_update_time = None
+		self.deadline_tick = 0  # 이 게임이 시뮬레이션을 마친 엔진 deadline 번호
+		self.sim_time = 0.0  # 이벤트 구동 모드에서 진행한 시뮬레이션 시간(초)
+		self.event_timer = None  # 이벤트 구동 모드의 다음 충돌 예약
+		self.goal_crossed_at = None  # 판정을 미룬 골 - 공이 패들 평면을 지난 시각
+
+	def is_finished(self):
+		return not self.game_state.game_started or self.score_handler.game_end
+
+
+class GameEngine:
+	"""프로세스 전체의 게임을 하나의 틱 루프로 진행시키는 엔진
+
+	게임마다 task를 만들지 않고 loop.call_at으로 절대 시각(deadline)에 맞춰
+	틱을 예약하므로 sleep 오차가 누적되지 않는다.
+
+	fixed_timestep 모드에서는 예약된 deadline 하나마다 1/tick_rate 한 스텝씩 물리를 진행한다.
+	틱이 실제로 언제 실행됐는지(스케줄링 지터)는 스텝 수에 영향을 주지 않고, 서버가 밀려
+	deadline을 건너뛴 경우에만 다음 틱에서 밀린 스텝(catch-up)을 한꺼번에 처리한다.
+
+	event_driven 모드에서는 매 틱 적분하지 않는다. 다음 패들/골 평면 도달 시각을
+	해석적으로 구해 그 시각에만 게임을 깨우고, 틱(브로드캐스트 시점)에는
+	지난 시간만큼 궤적을 한 번에 계산한다.
+
+	틱은 물리만 동기적으로 진행하고, 전송은 게임마다 따로 task로 내보낸다.
+	한 게임의 group_send가 느려도 다음 틱이나 다른 게임은 기다리지 않는다.
+
+	시뮬레이션(tick_rate)과 전송(snapshot_rate)은 따로 돈다. 스냅샷은
+	snapshot_every 틱마다 한 번만 보내고, 클라이언트는 스냅샷의 tick/timestamp로
+	그 사이를 보간한다.
+
+	관전자에게는 그보다 더 낮은 spectator_rate로, 게임마다 한 프레임(공 + 양쪽 패들 + 점수)만
+	만들어 보낸다. 관전자 틱은 항상 스냅샷 틱 중에서 고른다.
+	"""
+	def __init__(self, tick_rate=60, fixed_timestep=True, max_catch_up_ticks=5, physics_backend='python',
+			event_driven=False, snapshot_rate=None, max_lag_compensation=0.2, spectator_rate=10):
+		self.tick_rate = tick_rate
+		self.tick_interval = 1 / tick_rate
+		self.snapshot_rate = min(snapshot_rate or tick_rate, tick_rate)
+		self.snapshot_every = max(1, round(tick_rate / self.snapshot_rate))
+		self.spectator_rate = min(spectator_rate or self.snapshot_rate, self.snapshot_rate)
+		self.spectator_every = self.snapshot_every * max(1, round(self.snapshot_rate / self.spectator_rate))
+		self._tick_count = 0
+		self.fixed_timestep = fixed_timestep
+		self.event_driven = event_driven
+		self.max_catch_up_ticks = max_catch_up_ticks
+		self.physics_backend = physics_backend
+		self.max_lag_compensation = max_lag_compensation  # 지연 보상으로 되돌려 볼 최대 시간(초), 0이면 끔
+		self.batch_physics = None
+		self.MAX_DELTA_TIME = 1/30
+		self.sessions = {}
+		self._loop = None
+		self._timer = None
+		self._next_deadline = None
+		self._deadline_ticks = 0  # 지금까지 지나간 deadline 수 (건너뛴 것 포함)
+		self._deadlines_due = 1  # 다음 _on_tick이 처리할 deadline 수
+		self.stats = {
+			'ticks': 0,
+			'missed_ticks': 0,
+			'publish_overruns': 0,
+			'catch_up_ticks': 0,
+			'dropped_ticks': 0,
+			'game_events': 0,
+			'snapshots': 0,
+			'spectator_frames': 0,
+			'inputs_received': 0,
+			'inputs_coalesced': 0,
+			'lag_compensated_hits': 0,
+			'deferred_goals': 0,
+		}
+
+	@property
+	def games(self):
+		return GameState.active_games
+
+	# ---- 게임 단위 제어 ----
+
+	def start_game(self, session: GameSession):
+		self.sessions[session.game_id] = session
+		session.last_update_time = time.time()
+		session.deadline_tick = self._deadline_ticks
+		session.sim_time = 0.0
+		session.goal_crossed_at = None
+		if self.physics_backend == 'numpy' and self.batch_physics is None:
+			# 첫 틱에서 만들면 그동안 틱이 밀리므로 게임을 등록할 때 미리 만든다
+			self.batch_physics = BatchPhysics(session.physics)
+		self._ensure_running()
+		logger.info(f"Engine started game {session.game_id} ({len(self.sessions)} active)")
+
+	def stop_game(self, game_id):
+		session = self.sessions.pop(game_id, None)
+		if session is not None:
+			self._cancel_event(session)
+		if not self.sessions:
+			self._stop_loop()
+		return session is not None
+
+	def pause_game(self, game_id):
+		game_state = self.games.get(game_id)
+		if game_state is None:
+			return
+		game_state.is_paused = True
+		game_state.pause_start_time = time.time()
+
+	def resume_game(self, game_id):
+		game_state = self.games.get(game_id)
+		if game_state is None:
+			return
+		game_state.is_paused = False
+		game_state.pause_start_time = None
+		session = self.sessions.get(game_id)
+		if session:
+			# 멈춰 있던 시간만큼 delta가 튀지 않도록
+			session.last_update_time = time.time()
+			session.deadline_tick = self._deadline_ticks
+			if session.encoder is not None:
+				session.encoder.reset()
+
+	def set_rtt(self, game_id, player, rtt):
+		"""플레이어의 왕복 지연(초) - 지연 보상에 쓴다"""
+		game_state = self.games.get(game_id)
+		if game_state is not None and player in game_state.rtt:
+			game_state.rtt[player] = rtt
+
+	def reset_player_inputs(self, game_id, player):
+		"""재접속한 클라이언트는 input_sequence를 0부터 다시 보내므로 이전 연결의 입력 기록을 비운다
+
+		비우지 않으면 새 입력이 예전 최대 sequence를 넘을 때까지 모두 오래된 입력으로 버려져
+		그 플레이어의 지연 보상이 꺼진다.
+		"""
+		game_state = self.games.get(game_id)
+		if game_state is None or player not in game_state.paddle_history:
+			return
+		game_state.paddle_history[player].reset()
+		session = self.sessions.get(game_id)
+		if session is not None:
+			session.pending_inputs.pop(player, None)
+			session.unsent_inputs.pop(player, None)
+
+	def request_keyframe(self, game_id):
+		"""다음 스냅샷을 keyframe으로 (클라이언트가 델타 프레임을 놓쳤을 때)"""
+		session = self.sessions.get(game_id)
+		if session is not None and session.encoder is not None:
+			session.encoder.reset()
+
+	def is_running(self, game_id):
+		return game_id in self.sessions
+
+	def submit_input(self, game_id, player, position, input_sequence):
+		"""consumer가 받은 패들 입력을 게임 상태에 반영
+
+		엔진이 진행 중인 게임이면 틱마다 플레이어별 마지막 입력만 남겨 두었다가
+		다음 틱 시작에 한 번 반영하고 상대에게 전달한다.
+		"""
+		game_state = self.games.get(game_id)
+		paddle = game_state.players.get(player) if game_state is not None else None
+		if paddle is None:
+			return False
+		self.stats['inputs_received'] += 1
+		game_state.paddle_history[player].record(input_sequence, time.time(), position['x'], position['y'])
+		session = self.sessions.get(game_id)
+		if session is None:
+			self._apply_input(game_state, player, position, input_sequence)
+			return True
+		if player in session.pending_inputs:
+			self.stats['inputs_coalesced'] += 1
+		session.pending_inputs[player] = (position, input_sequence)
+		return True
+
+	def _apply_input(self, game_state: Match, player, position, input_sequence):
+		paddle = game_state.players.get(player)
+		if paddle is None:
+			return False
+		paddle.x = position['x']
+		paddle.y = position['y']
+		game_state.last_processed_input[player] = input_sequence
+		return True
+
+	# ---- 틱 루프 ----
+
+	def _ensure_running(self):
+		loop = asyncio.get_running_loop()
+		if self._timer is not None and self._loop is loop:
+			return
+		self._loop = loop
+		self._next_deadline = loop.time() + self.tick_interval
+		self._deadlines_due = 1
+		self._timer = loop.call_at(self._next_deadline, self._on_tick)
+
+	def _stop_loop(self):
+		if self._timer is not None:
+			self._timer.cancel()
+			self._timer = None
+		self._next_deadline = None
+
+	def _schedule_next(self):
+		self._next_deadline += self.tick_interval
+		self._deadlines_due = 1
+		now = self._loop.time()
+		if self._next_deadline <= now:
+			# 이미 지나간 틱은 건너뛰고 다음 경계에 맞춘다 - 건너뛴 만큼은 다음 틱에서 catch-up
+			missed = int((now - self._next_deadline) // self.tick_interval) + 1
+			self._next_deadline += missed * self.tick_interval
+			self._deadlines_due += missed
+			self.stats['missed_ticks'] += missed
+		self._timer = self._loop.call_at(self._next_deadline, self._on_tick)
+
+	def _on_tick(self):
+		if not self.sessions:
+			self._stop_loop()
+			return
+		self._deadline_ticks += self._deadlines_due
+		self._schedule_next()
+		self.stats['ticks'] += 1
+		self._tick_count += 1
+		snapshot = self._tick_count % self.snapshot_every == 0
+		if self.event_driven and not snapshot:
+			# 이벤트 구동 모드는 충돌 시각에 따로 깨어나므로 스냅샷 틱에만 궤적을 계산하면 된다
+			sessions = list(self.sessions.values())
+			self._flush_inputs(sessions)
+			for session in sessions:
+				self._publish_session(session)
+			return
+		try:
+			self._run_tick(snapshot)
+		except Exception as e:
+			logger.error(f"Error in engine tick: {e}")
+
+	def _flush_inputs(self, sessions):
+		"""틱 동안 모인 입력을 반영 - 상대에게는 플레이어별 마지막 입력만 보낸다"""
+		for session in sessions:
+			if not session.pending_inputs:
+				continue
+			pending, session.pending_inputs = session.pending_inputs, {}
+			for player, (position, input_sequence) in pending.items():
+				if self._apply_input(session.game_state, player, position, input_sequence) \
+						and session.publish_input is not None:
+					session.unsent_inputs[player] = (position, input_sequence)
+
+	def _publish_session(self, session: GameSession, snapshot=False, spectator=False):
+		"""게임 하나의 이번 틱 출력을 별도 task로 보낸다
+
+		이 게임의 이전 전송이 아직 끝나지 않았으면 이번 스냅샷은 건너뛴다. 인코더도 진행하지 않으므로
+		델타 기준이 어긋나지 않고, 밀린 상대 입력은 다음 전송에서 최신 것만 나간다.
+		"""
+		if not (snapshot or spectator or session.unsent_inputs):
+			return
+		if session.publish_task is not None and not session.publish_task.done():
+			self.stats['publish_overruns'] += 1
+			return
+		unsent, session.unsent_inputs = session.unsent_inputs, {}
+		frames = [
+			session.publish_input(player, position, input_sequence)
+			for player, (position, input_sequence) in unsent.items()
+		]
+		if snapshot:
+			frames.append(session.publish(self.snapshot(session)))
+			self.stats['snapshots'] += 1
+		if spectator and session.publish_spectators is not None:
+			frames.append(session.publish_spectators(self.build_spectator_frame(session.game_state)))
+			self.stats['spectator_frames'] += 1
+		session.publish_task = self._loop.create_task(self._publish(frames))
+
+	async def _publish(self, frames):
+		results = await asyncio.gather(*frames, return_exceptions=True)
+		for result in results:
+			if isinstance(result, Exception):
+				logger.error(f"Error while publishing game state: {result}")
+
+	def _run_tick(self, snapshot=True):
+		current_time = time.time()
+		sessions = []
+		for game_id, session in list(self.sessions.items()):
+			if session.is_finished():
+				self.stop_game(game_id)
+				continue
+			sessions.append(session)
+		# 입력은 일시정지/득점 중에도 반영해 상대 패들이 멈춰 보이지 않게 한다
+		self._flush_inputs(sessions)
+		runnable = [
+			session for session in sessions
+			if not (session.game_state.is_paused or session.busy)
+		]
+
+		if self.event_driven:
+			results = [self._advance_event_driven(session, current_time) for session in runnable]
+		elif self.fixed_timestep and self.physics_backend == 'numpy':
+			results = self._advance_batch(runnable)
+		else:
+			results = [self._advance(session, current_time) for session in runnable]
+
+		spectator_tick = snapshot and self._tick_count % self.spectator_every == 0
+		advanced = set()
+		for session, scoring_player in zip(runnable, results):
+			if scoring_player:
+				scoring_player = self._resolve_goal(session, scoring_player)
+			if scoring_player:
+				self._start_scoring(session, scoring_player)
+				continue
+			if self.event_driven and session.event_timer is None:
+				self._schedule_event(session)
+			if session.goal_crossed_at is None:
+				# 판정을 미룬 골이면 공이 골 평면에 있으므로 판정이 날 때까지 스냅샷을 보내지 않는다
+				advanced.add(session)
+
+		for session in sessions:
+			moved = session in advanced
+			self._publish_session(session, snapshot and moved, spectator_tick and moved)
+
+	def _advance(self, session: GameSession, current_time):
+		try:
+			if self.fixed_timestep:
+				return self._advance_fixed(session)
+			return self._advance_variable(session, current_time)
+		except Exception as e:
+			logger.error(f"Error while updating game {session.game_id}: {e}")
+			return None
+
+	def _advance_variable(self, session: GameSession, current_time):
+		delta_time = min(current_time - session.last_update_time, self.MAX_DELTA_TIME)
+		session.last_update_time = current_time
+		session.game_state.tick += 1
+		return session.physics.process_physics(session.game_state, delta_time)
+
+	def _consume_steps(self, session: GameSession):
+		"""이번 틱에 진행할 고정 스텝 수 - 지난번 이후 지나간 deadline마다 한 스텝
+
+		실행 시각(time.time)으로 쌓으면 스케줄링 지터 때문에 0, 2 스텝이 번갈아 나온다.
+		deadline은 tick_interval 간격으로 고정이라 평소에는 정확히 한 스텝이고,
+		실제로 밀린 것은 _schedule_next가 건너뛴 deadline으로만 반영된다.
+		"""
+		steps = self._deadline_ticks - session.deadline_tick
+		session.deadline_tick = self._deadline_ticks
+		if steps > self.max_catch_up_ticks:
+			# 너무 많이 밀렸으면 남은 틱은 버린다 (spiral of death 방지)
+			self.stats['dropped_ticks'] += steps - self.max_catch_up_ticks
+			steps = self.max_catch_up_ticks
+		if steps > 1:
+			self.stats['catch_up_ticks'] += steps - 1
+		return steps
+
+	def _advance_fixed(self, session: GameSession):
+		for _ in range(self._consume_steps(session)):
+			session.game_state.tick += 1
+			scoring_player = session.physics.process_fixed_step(session.game_state, self.tick_interval)
+			if scoring_player:
+				return scoring_player
+		return None
+
+	def _advance_batch(self, sessions):
+		"""numpy 백엔드로 모든 게임을 한 번에 진행"""
+		if not sessions:
+			return []
+		steps = [self._consume_steps(session) for session in sessions]
+		try:
+			scored, steps_done = self.batch_physics.step(
+				[session.game_state for session in sessions], self.tick_interval, steps
+			)
+		except Exception as e:
+			logger.error(f"Error in batch physics step: {e}")
+			return [None] * len(sessions)
+
+		for session, done in zip(sessions, steps_done):
+			session.game_state.tick += done
+		return scored
+
+	def _advance_event_driven(self, session: GameSession, current_time):
+		"""지난 시간만큼의 궤적을 해석적으로 진행 (중간의 벽/패들 충돌 포함)"""
+		try:
+			elapsed = current_time - session.last_update_time
+			session.last_update_time = current_time
+			# 스냅샷 틱 사이의 시간은 평소에도 snapshot_every 틱이므로, 그보다 더 밀린 것만 자른다
+			max_elapsed = (self.snapshot_every + self.max_catch_up_ticks) * self.tick_interval
+			elapsed = min(max(elapsed, 0.0), max_elapsed)
+			session.sim_time += elapsed
+			session.game_state.tick = int(session.sim_time / self.tick_interval)
+			return session.physics.advance(session.game_state, elapsed)
+		except Exception as e:
+			logger.error(f"Error while updating game {session.game_id}: {e}")
+			return None
+
+	def _schedule_event(self, session: GameSession):
+		"""다음 패들 평면/골 평면 도달 시각에 게임을 깨우도록 예약"""
+		self._cancel_event(session)
+		delay = session.physics.time_to_next_event(session.game_state)
+		if delay == math.inf:
+			return
+		session.event_timer = self._loop.call_at(self._loop.time() + delay, self._on_game_event, session)
+
+	def _cancel_event(self, session: GameSession):
+		if session.event_timer is not None:
+			session.event_timer.cancel()
+			session.event_timer = None
+
+	def _on_game_event(self, session: GameSession):
+		session.event_timer = None
+		if self.sessions.get(session.game_id) is not session:
+			return
+		if session.busy or session.game_state.is_paused or session.is_finished():
+			return
+		self.stats['game_events'] += 1
+		# 평면 도달 시점의 최신 패들 위치로 판정된다
+		scoring_player = self._advance_event_driven(session, time.time())
+		if scoring_player:
+			scoring_player = self._resolve_goal(session, scoring_player)
+		if scoring_player:
+			self._start_scoring(session, scoring_player)
+		elif session.goal_crossed_at is None:
+			self._schedule_event(session)
+
+	def _resolve_goal(self, session: GameSession, scoring_player):
+		"""지연 보상 후 골 확정 - 막은 것으로 판정되거나 판정을 미루면 None
+
+		수비 플레이어가 공이 평면을 지나는 것을 보고 보낸 입력은 최대 RTT 뒤에 도착하므로
+		평면 통과 후 min(RTT, max_lag_compensation) 동안 받은 입력까지 보고 판정한다.
+		서버가 수비 플레이어의 RTT를 아직 재지 못했으면 보상하지 않고 바로 득점이다.
+		"""
+		game_state = session.game_state
+		defender = 'player1' if scoring_player == 'player2' else 'player2'
+		rtt = game_state.rtt[defender]
+		if self.max_lag_compensation <= 0 or rtt is None:
+			session.goal_crossed_at = None
+			return scoring_player
+		now = time.time()
+		if session.goal_crossed_at is None:
+			back = session.physics.time_since_plane(game_state)
+			if back is None:
+				return scoring_player
+			session.goal_crossed_at = now - back
+		crossed_at = session.goal_crossed_at
+		window_end = crossed_at + min(rtt, self.max_lag_compensation)
+
+		if session.physics.compensate_miss(game_state, crossed_at, min(now, window_end), now):
+			session.goal_crossed_at = None
+			self.stats['lag_compensated_hits'] += 1
+			return None
+		if now < window_end:
+			# 아직 도착하지 않은 입력이 있을 수 있으니 창이 닫힐 때까지 판정을 미룬다
+			self.stats['deferred_goals'] += 1
+			if self.event_driven:
+				self._cancel_event(session)
+				session.event_timer = self._loop.call_at(
+					self._loop.time() + (window_end - now), self._on_game_event, session
+				)
+			return None
+		session.goal_crossed_at = None
+		return scoring_player
+
+	def _start_scoring(self, session: GameSession, scoring_player):
+		session.busy = True
+		self._cancel_event(session)
+		self._loop.create_task(self._handle_scoring(session, scoring_player))
+
+	async def _handle_scoring(self, session: GameSession, scoring_player):
+		"""득점 처리 - 애니메이션이 끝날 때까지 해당 게임만 멈춘다"""
+		try:
+			await session.save()  # 득점 시 상태 저장
+			await session.score_handler.handle_scoring(scoring_player)
+			if not session.is_finished():
+				await session.publish(self.snapshot(session))
+			while await session.score_handler.update_score_animation():
+				await asyncio.sleep(self.tick_interval)
+		except Exception as e:
+			logger.error(f"Error while handling score for game {session.game_id}: {e}")
+		finally:
+			session.busy = False
+			session.last_update_time = time.time()
+			session.deadline_tick = self._deadline_ticks
+
+	def snapshot(self, session: GameSession):
+		if session.encoder is not None:
+			return session.encoder.encode(session.game_state)
+		return self.build_state_update(session.game_state)
+
+	@staticmethod
+	def build_state_update(game_state: Match):
+		return {
+			'type': 'game_state_update',
+			'ball': game_state.ball.to_dict(),
+			'score': dict(game_state.score),
+			'tick': game_state.tick,
+			'timestamp': int(time.time() * 1000)
+		}
+
+	@staticmethod
+	def build_spectator_frame(game_state: Match):
+		"""관전자용 전체 프레임 - 델타가 아니므로 언제 들어온 관전자도 바로 그릴 수 있다"""
+		return {
+			'type': 'spectator_frame',
+			'ball': game_state.ball.to_dict(),
+			'players': game_state.players_to_dict(),
+			'score': dict(game_state.score),
+			'tick': game_state.tick,
+			'timestamp': int(time.time() * 1000)
+		}
+
+
+ENGINE_SETTINGS = getattr(settings, 'GAME_ENGINE', {})
+
+game_engine = GameEngine(
+	tick_rate=ENGINE_SETTINGS.get('TICK_RATE', 60),
+	fixed_timestep=ENGINE_SETTINGS.get('FIXED_TIMESTEP', True),
+	max_catch_up_ticks=ENGINE_SETTINGS.get('MAX_CATCH_UP_TICKS', 5),
+	physics_backend=ENGINE_SETTINGS.get('PHYSICS_BACKEND', 'python'),
+	event_driven=ENGINE_SETTINGS.get('EVENT_DRIVEN', False),
+	snapshot_rate=ENGINE_SETTINGS.get('SNAPSHOT_RATE'),
+	max_lag_compensation=ENGINE_SETTINGS.get('MAX_LAG_COMPENSATION', 0.2),
+	spectator_rate=ENGINE_SETTINGS.get('SPECTATOR_RATE', 10)
+)
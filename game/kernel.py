@@ -0,0 +1,249 @@
+"""게임 물리 커널
+
+asyncio, Django, time.time()에 의존하지 않는 순수 동기 함수 모음.
+입력 상태(BallState, 패들 좌표, 시간)를 받아 새 상태(StepResult)를 돌려줄 뿐
+인자를 변경하지 않으므로 엔진, 프로세스 풀, 벤치마크 어디서든 그대로 호출할 수 있다.
+"""
+import math
+from typing import NamedTuple, Optional, Tuple
+
+
+class BallState(NamedTuple):
+	x: float
+	y: float
+	z: float
+	vx: float
+	vy: float
+	vz: float
+	scale: float
+
+
+class PhysicsParams(NamedTuple):
+	tunnel_width: float
+	tunnel_height: float
+	tunnel_length: float
+	initial_ball_scale: float
+	max_ball_scale: float
+	base_hit_threshold: float
+	speed_factor: float
+	max_speed: float
+	collision_angle_factor: float
+	collision_speed_increase: float
+	player1_hit_zone: Tuple[float, float]  # (END, START)
+	player2_hit_zone: Tuple[float, float]
+	player1_hit_plane: float
+	player2_hit_plane: float
+	player1_goal_z: float  # 넘으면 player1 득점
+	player2_goal_z: float  # 넘으면 player2 득점
+	max_swept_events: int
+
+
+class StepResult(NamedTuple):
+	ball: BallState
+	scoring_player: Optional[str]
+
+
+# (player1 패들 (x, y) 또는 None, player2 패들 (x, y) 또는 None)
+Paddles = Tuple[Optional[Tuple[float, float]], Optional[Tuple[float, float]]]
+
+
+def ball_scale(z, params: PhysicsParams):
+	"""터널 중앙에서 멀어질수록 커지는 공 크기"""
+	half_length = params.tunnel_length / 2
+	progress = abs(z + half_length) / half_length
+	return params.initial_ball_scale + (params.max_ball_scale - params.initial_ball_scale) * progress
+
+
+def hit_threshold(z, params: PhysicsParams):
+	"""공의 z 위치에 따른 히트박스 크기"""
+	return params.base_hit_threshold * (ball_scale(z, params) / params.initial_ball_scale)
+
+
+def reflect(vx, vy, vz, x, y, z, paddle, direction, params: PhysicsParams):
+	"""(x, y, z)에서 패들에 맞았으면 반사된 속도를, 아니면 None 반환 (direction: 반사 후 z 방향)"""
+	threshold = hit_threshold(z, params)
+	dx = x - paddle[0]
+	dy = y - paddle[1]
+	if math.sqrt(dx * dx + dy * dy) > threshold:
+		return None
+
+	current_speed = math.sqrt(vx * vx + vy * vy + vz * vz)
+	new_speed = min(current_speed * params.collision_speed_increase, params.max_speed)
+
+	vx = dx / threshold * new_speed * params.collision_angle_factor
+	vy = dy / threshold * new_speed * params.collision_angle_factor
+	vz = direction * abs(new_speed)
+
+	# 목표 속도를 넘으면 정규화
+	speed = math.sqrt(vx * vx + vy * vy + vz * vz)
+	if speed > new_speed:
+		scale = new_speed / speed
+		vx, vy, vz = vx * scale, vy * scale, vz * scale
+	return vx, vy, vz
+
+
+def zone_substep(ball: BallState, paddles: Paddles, delta_time, params: PhysicsParams) -> StepResult:
+	"""히트존 방식 substep - 다음 위치가 패들 히트존 안에 있으면 반사"""
+	x, y, z, vx, vy, vz, _ = ball
+	factor = delta_time * params.speed_factor
+	next_x = x + vx * factor
+	next_y = y + vy * factor
+	next_z = z + vz * factor
+	scale = ball_scale(next_z, params)
+
+	# 1. 득점 체크
+	if next_z <= params.player1_goal_z:
+		return StepResult(BallState(next_x, next_y, next_z, vx, vy, vz, scale), 'player1')
+	elif next_z >= params.player2_goal_z:
+		return StepResult(BallState(next_x, next_y, next_z, vx, vy, vz, scale), 'player2')
+
+	# 2. x, y축 벽 충돌 처리
+	if abs(next_x) > params.tunnel_width:
+		vx = -vx
+		next_x = math.copysign(params.tunnel_width - 0.01, next_x)
+	if abs(next_y) > params.tunnel_height:
+		vy = -vy
+		next_y = math.copysign(params.tunnel_height - 0.01, next_y)
+
+	# 3. 패들 충돌 (player1: 0쪽, player2: -42쪽)
+	zone_end, zone_start = params.player1_hit_zone
+	if zone_end <= next_z <= zone_start:
+		if paddles[0] is not None:
+			velocity = reflect(vx, vy, vz, next_x, next_y, next_z, paddles[0], -1, params)
+			if velocity:
+				vx, vy, vz = velocity
+				next_z = zone_end - 0.1
+	else:
+		zone_end, zone_start = params.player2_hit_zone
+		if zone_end <= next_z <= zone_start and paddles[1] is not None:
+			velocity = reflect(vx, vy, vz, next_x, next_y, next_z, paddles[1], 1, params)
+			if velocity:
+				vx, vy, vz = velocity
+				next_z = zone_start + 0.1
+
+	return StepResult(BallState(next_x, next_y, next_z, vx, vy, vz, scale), None)
+
+
+def _time_to_wall(position, velocity, limit):
+	"""±limit 벽까지 남은 시간 (이미 벽 밖이면 0 - 즉시 반사)"""
+	if velocity > 0:
+		return max(0.0, (limit - position) / velocity)
+	if velocity < 0:
+		return max(0.0, (-limit - position) / velocity)
+	return math.inf
+
+
+def sweep(ball: BallState, paddles: Paddles, remaining, max_events, params: PhysicsParams) -> StepResult:
+	"""연속(swept) 충돌 검사
+
+	remaining(위치 += 속도 * remaining) 동안 공이 지나가는 선분과 벽/패들/골 평면의
+	교차 시각을 구해 가장 빠른 충돌부터 차례로 처리한다. 스텝 크기와 상관없이 정확하다.
+	"""
+	x, y, z, vx, vy, vz, _ = ball
+
+	for _ in range(max_events):
+		t_hit, event = remaining, None
+
+		t = _time_to_wall(x, vx, params.tunnel_width)
+		if t < t_hit:
+			t_hit, event = t, 'wall_x'
+		t = _time_to_wall(y, vy, params.tunnel_height)
+		if t < t_hit:
+			t_hit, event = t, 'wall_y'
+
+		if vz > 0:
+			player, plane, goal = 0, params.player1_hit_plane, params.player2_goal_z
+			plane_ahead = z < plane
+		elif vz < 0:
+			player, plane, goal = 1, params.player2_hit_plane, params.player1_goal_z
+			plane_ahead = z > plane
+		else:
+			player = None
+		if player is not None:
+			if plane_ahead:
+				t = (plane - z) / vz
+				if t < t_hit:
+					t_hit, event = t, 'paddle'
+			t = max(0.0, (goal - z) / vz)
+			if t < t_hit:
+				t_hit, event = t, 'goal'
+
+		# 충돌 지점(또는 구간 끝)까지 이동
+		x += vx * t_hit
+		y += vy * t_hit
+		z += vz * t_hit
+		remaining -= t_hit
+
+		if event is None:
+			break
+		if event == 'wall_x':
+			vx = -vx
+			x = math.copysign(params.tunnel_width, x)
+		elif event == 'wall_y':
+			vy = -vy
+			y = math.copysign(params.tunnel_height, y)
+		elif event == 'paddle':
+			z = plane
+			if paddles[player] is not None:
+				velocity = reflect(vx, vy, vz, x, y, plane, paddles[player], -1 if player == 0 else 1, params)
+				if velocity:
+					vx, vy, vz = velocity
+		else:
+			z = goal
+			return StepResult(BallState(x, y, z, vx, vy, vz, ball_scale(z, params)), 'player2' if player == 0 else 'player1')
+
+	return StepResult(BallState(x, y, z, vx, vy, vz, ball_scale(z, params)), None)
+
+
+def step(ball: BallState, paddles: Paddles, delta_time, substeps, swept, params: PhysicsParams) -> StepResult:
+	"""delta_time을 substeps개로 나눠 진행 - 득점하면 그 자리에서 멈춘다"""
+	substep_delta = delta_time / substeps
+	result = StepResult(ball, None)
+	for _ in range(substeps):
+		if swept:
+			result = sweep(result.ball, paddles, substep_delta * params.speed_factor, params.max_swept_events, params)
+		else:
+			result = zone_substep(result.ball, paddles, substep_delta, params)
+		if result.scoring_player:
+			break
+	return result
+
+
+def advance(ball: BallState, paddles: Paddles, duration, params: PhysicsParams, max_events=64) -> StepResult:
+	"""duration초 동안의 궤적을 해석적으로 한 번에 진행"""
+	return sweep(ball, paddles, duration * params.speed_factor, max_events, params)
+
+
+def time_to_next_event(ball: BallState, params: PhysicsParams):
+	"""다음 패들 평면 또는 골 평면까지 남은 시간(초)
+
+	벽 반사는 z축 운동을 바꾸지 않으므로 z 속도만으로 정확히 구할 수 있다.
+	"""
+	if ball.vz > 0:
+		target = params.player1_hit_plane if ball.z < params.player1_hit_plane else params.player2_goal_z
+	elif ball.vz < 0:
+		target = params.player2_hit_plane if ball.z > params.player2_hit_plane else params.player1_goal_z
+	else:
+		return math.inf
+	return max(0.0, (target - ball.z) / (ball.vz * params.speed_factor))
+
+
+def rewind_to_plane(ball: BallState, params: PhysicsParams, max_events=8):
+	"""골 평면을 넘은 공을 직전 패들 평면 통과 시점으로 되감는다
+
+	반환값: (평면 통과 시점의 BallState, 되감은 시간(초)) 또는 None
+	"""
+	if ball.vz > 0:
+		plane = params.player1_hit_plane
+	elif ball.vz < 0:
+		plane = params.player2_hit_plane
+	else:
+		return None
+	back = (ball.z - plane) / (ball.vz * params.speed_factor)
+	if back < 0:
+		return None
+	# 속도를 뒤집어 진행하면 벽 반사까지 그대로 되감긴다 (반대쪽 평면까지는 닿지 않는다)
+	reverse = ball._replace(vx=-ball.vx, vy=-ball.vy, vz=-ball.vz)
+	rewound = sweep(reverse, (None, None), back * params.speed_factor, max_events, params).ball
+	crossing = rewound._replace(z=plane, vx=-rewound.vx, vy=-rewound.vy, vz=-rewound.vz)
+	return crossing, back
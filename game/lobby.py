@@ -0,0 +1,59 @@
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
+
+from game.codec import encoded_event
+from game.room_store import ROOM_STORE_SETTINGS, lobby_summary
+
+logger = logging.getLogger(__name__)
+
+LOBBY_GROUP = 'lobby'
+ROOM_KEY_PREFIX = 'game_room_'
+LOBBY_PAGE_SIZE = ROOM_STORE_SETTINGS.get('LIST_PAGE_SIZE', 50)
+LOBBY_MAX_PAGE_SIZE = ROOM_STORE_SETTINGS.get('LIST_MAX_PAGE_SIZE', 100)
+
+
+async def lobby_page(room_manager, cursor=None, limit=None):
+	"""로비 목록 한 페이지 (최신 방이 먼저) - ([요약 JSON], 다음 cursor 또는 None)
+
+	방 상태는 가져오지 않고 쓰기 때 만들어 둔 요약을 그대로 돌려준다 (닫힌 방은 store가 걸러 낸다).
+	플레이어가 모두 나간 일반 방은 이때 정리한다.
+	"""
+	page, next_cursor = await sync_to_async(room_manager.store.lobby_page)(cursor, limit)
+	summaries = []
+	for room_key, summary in page:
+		if json.loads(summary)['people'] == 0:
+			await room_manager.remove_room(room_key)
+			continue
+		summaries.append(summary)
+	return summaries, next_cursor
+
+
+def lobby_json(summaries):
+	"""요약 JSON들을 다시 파싱하지 않고 JSON 배열로 잇는다"""
+	return '[' + ','.join(summaries) + ']'
+
+
+async def lobby_snapshot(room_manager):
+	"""현재 로비 목록 전체 (ws/lobby 첫 메시지)"""
+	summaries, _ = await lobby_page(room_manager)
+	return [json.loads(summary) for summary in summaries]
+
+
+async def publish_room_change(room_key, room=None):
+	"""방이 바뀌면 로비 구독자에게 델타 전송 - room이 None이거나 목록에서 빠지는 방이면 room_removed"""
+	if not room_key.startswith(ROOM_KEY_PREFIX):
+		return
+	entry = lobby_summary(room)
+	if entry is None:
+		message = {'type': 'room_removed', 'id': room_key[len(ROOM_KEY_PREFIX):]}
+	elif int(room.get('version', 0)) == 0:
+		message = {'type': 'room_created', 'room': entry}
+	else:
+		message = {'type': 'room_updated', 'room': entry}
+	try:
+		await get_channel_layer().group_send(LOBBY_GROUP, encoded_event('lobby_event', message))
+	except Exception as e:
+		logger.error(f"Error publishing lobby event for {room_key}: {e}")
@@ -0,0 +1,20 @@
+from collections import defaultdict
+
+
+class Metrics:
+	"""프로세스 단위 카운터 (/api/game/metrics에서 엔진/전달 통계와 함께 보여준다)"""
+	def __init__(self):
+		self.counters = defaultdict(int)
+
+	def incr(self, name, amount=1):
+		self.counters[name] += amount
+
+	def observe_max(self, name, value):
+		if value > self.counters[name]:
+			self.counters[name] = value
+
+	def snapshot(self):
+		return dict(self.counters)
+
+
+metrics = Metrics()
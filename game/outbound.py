@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import weakref
+from collections import deque
+
+from game.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_queues = weakref.WeakSet()
+
+
+class OutboundQueue:
+	"""WebSocket 연결 하나의 송신 큐
+
+	consumer는 self.send 대신 put()으로 넣고, writer task 하나가 순서대로 내보낸다.
+	클라이언트 네트워크가 막혀 send가 밀리면 큐에 쌓이는데,
+	- latest 키가 있는 메시지(상태 스냅샷, 상대 패들, 방 상태)는 같은 키의 대기 중인
+	  이전 메시지를 버리고 최신 것만 남긴다 (latest-wins)
+	- 키가 없는 제어 메시지(game_end, countdown_sequence, destroy ...)는 절대 버리지 않는다
+	제어 메시지가 쌓여 max_depth를 넘으면 가장 오래된 latest 메시지부터 버린다.
+	"""
+	def __init__(self, send, max_depth=32, on_drop=None):
+		self._send = send  # (data) -> 코루틴
+		self.max_depth = max_depth
+		self.on_drop = on_drop  # latest 메시지를 버렸을 때 호출 (예: keyframe 요청)
+		self.queue = deque()  # (latest 키 또는 None, data)
+		self.dropped = 0
+		self._ready = asyncio.Event()
+		self._idle = asyncio.Event()
+		self._idle.set()
+		self._task = None
+		self._closed = False
+		_queues.add(self)
+
+	def start(self):
+		self._closed = False
+		if self._task is None:
+			self._task = asyncio.create_task(self._writer())
+
+	def stop(self):
+		self._closed = True
+		if self._task is not None:
+			self._task.cancel()
+			self._task = None
+		self.queue.clear()
+
+	def put(self, data, latest=None):
+		if self._closed:
+			return
+		if latest is not None:
+			for item in self.queue:
+				if item[0] == latest:
+					self.queue.remove(item)
+					self._drop(latest)
+					break
+		self.queue.append((latest, data))
+		if len(self.queue) > self.max_depth:
+			oldest = next((item for item in self.queue if item[0] is not None), None)
+			if oldest is not None:
+				self.queue.remove(oldest)
+				self._drop(oldest[0])
+		metrics.observe_max('outbound_max_depth', len(self.queue))
+		self._idle.clear()
+		self._ready.set()
+
+	async def flush(self):
+		"""대기 중인 메시지를 모두 보낼 때까지 기다린다 (close 직전 등)"""
+		if self._task is None:
+			return
+		await self._idle.wait()
+
+	def _drop(self, latest):
+		self.dropped += 1
+		metrics.incr('outbound_dropped')
+		metrics.incr(f'outbound_dropped_{latest}')
+		if self.on_drop is not None:
+			self.on_drop(latest)
+
+	async def _writer(self):
+		while True:
+			await self._ready.wait()
+			self._ready.clear()
+			while self.queue:
+				_, data = self.queue.popleft()
+				try:
+					await self._send(data)
+				except asyncio.CancelledError:
+					raise
+				except Exception as e:
+					logger.error(f"Error in outbound writer: {e}")
+			self._idle.set()
+
+
+def queue_stats():
+	"""현재 프로세스의 모든 연결 큐 상태"""
+	depths = [len(queue.queue) for queue in _queues]
+	return {
+		'connections': len(depths),
+		'depth': sum(depths),
+		'max_depth': max(depths, default=0),
+	}
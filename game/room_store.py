@@ -0,0 +1,758 @@
+"""Redis에 JSON으로 저장하는 방 상태 저장소
+
+방 변경(플레이어 추가/삭제, 게임 상태 갱신, 삭제)은 Lua 스크립트로 Redis 안에서 원자적으로 실행한다.
+프로세스 로컬 lock은 다른 RoomStateManager 인스턴스나 다른 노드를 막지 못하므로 쓰지 않는다.
+
+- update(): 알려진 변경 종류를 스크립트 한 번으로 읽기-수정-쓰기 (충돌 없음)
+- compare_and_set(): 임의의 파이썬 변경 함수용 - 읽은 version이 그대로일 때만 쓴다
+
+Lua cjson은 빈 배열을 {}로 인코딩하므로 읽을 때 리스트 필드를 []로 되돌린다.
+만료 시간은 예전 cache.set과 같다 (기본 캐시 timeout, 처음 만든 토너먼트 방은 30분).
+
+ROOM_STORE['BACKEND']가 'hash'면 방 하나를 JSON 한 덩어리 대신 필드 단위 hash(HashRoomStore)로 저장한다.
+
+읽은 방은 프로세스 공용 RoomCache에 둔다. 이 프로세스에서 쓴 방은 바로 캐시에 반영하고,
+다른 노드에는 Redis pub/sub으로 무효화를 알린다. 알림을 놓쳐도 cache_ttl이 지나면 다시 읽는다.
+
+쓸 때마다 열린 방 sorted set(OPEN_ROOMS_KEY)과 방별 로비 요약(LOBBY_SUMMARY_KEY)도 함께 고쳐서,
+로비 목록은 KEYS나 방 상태를 읽지 않고 index와 요약만 페이지 단위로 읽는다.
+요약이 실제로 바뀌면 LOBBY_VERSION_KEY가 올라가고 /api/game/list는 이 값으로 ETag를 만든다.
+index는 방을 쓴 뒤 따로 고치므로, 방마다 마지막으로 반영한 version(INDEXED_VERSION_PREFIX)보다
+오래된 쓰기는 무시한다. 목록을 읽을 때는 Redis 안에서 방이 아직 열려 있는지 다시 확인해
+만료됐거나 닫힌 방을 index에서 뺀다.
+"""
+import copy
+import json
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from game.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+ROOM_STORE_SETTINGS = getattr(settings, 'ROOM_STORE', {})
+INVALIDATION_CHANNEL = 'room_invalidate'
+
+PLAYERS_SUFFIX = ':players'
+# 열린(시작 전, 토너먼트가 아닌) 방의 sorted set - 점수는 created_at
+OPEN_ROOMS_KEY = 'room_index:open'
+# 열린 방마다 미리 직렬화한 로비 요약(JSON)과, 요약이 바뀔 때마다 올라가는 로비 목록 version
+LOBBY_SUMMARY_KEY = 'room_index:summary'
+LOBBY_VERSION_KEY = 'room_index:version'
+# 방마다 index에 마지막으로 반영한 방 version - 방 key와 같은 TTL
+INDEXED_VERSION_PREFIX = 'room_index:indexed:'
+CURSOR_TIE_MARGIN = 8  # 페이지 경계에서 created_at이 같은 방을 건너뛸 여유
+LIST_FIELDS = ('players', 'game1', 'game2')
+TOURNAMENT_ROOM_TIMEOUT = 30 * 60
+UPDATE_FIELDS = ('game_started', 'started_at', 'game1', 'game2', 'game1_ended', 'game2_ended', 'disconnected')
+
+# KEYS[1] = room key
+# ARGV = update_type, update_data(json), last_modified, timeout('' 이면 만료 없음), UPDATE_FIELDS(json)
+# 반환: 갱신된 방 JSON, 방이 없거나 변경할 수 없는 상태면 nil
+UPDATE_SCRIPT = """
+local raw = redis.call('GET', KEYS[1])
+if not raw then
+	return nil
+end
+local room = cjson.decode(raw)
+local room_type = tonumber(room['roomType']) or 0
+local tournament = room_type == 3 or room_type == 4
+local function missing(value)
+	return value == nil or value == cjson.null or value == ''
+end
+if missing(room['host']) and not tournament then
+	return nil
+end
+
+local data = cjson.decode(ARGV[2])
+local update_type = ARGV[1]
+if update_type == 'add_player' then
+	local players = room['players']
+	if type(players) ~= 'table' then
+		players = {}
+	end
+	table.insert(players, {intraId = data['intraId'], nickname = data['nickname'], profileImage = data['profileImage']})
+	room['players'] = players
+	if missing(room['host']) then
+		room['host'] = data['nickname']
+	end
+elseif update_type == 'remove_player' then
+	local kept = {}
+	for _, player in ipairs(room['players'] or {}) do
+		if player['intraId'] ~= data['intraId'] then
+			table.insert(kept, player)
+		end
+	end
+	room['players'] = kept
+	if room['host'] == data['nickname'] then
+		room['host'] = kept[1] and kept[1]['nickname'] or cjson.null
+	end
+elseif update_type == 'update_game_state' then
+	for _, field in ipairs(cjson.decode(ARGV[5])) do
+		if data[field] ~= nil then
+			room[field] = data[field]
+		end
+	end
+end
+
+room['version'] = (tonumber(room['version']) or 0) + 1
+room['last_modified'] = ARGV[3]
+local encoded = cjson.encode(room)
+if missing(room['host']) and not tournament then
+	redis.call('DEL', KEYS[1])
+elseif ARGV[4] ~= '' then
+	redis.call('SET', KEYS[1], encoded, 'EX', ARGV[4])
+else
+	redis.call('SET', KEYS[1], encoded)
+end
+return encoded
+"""
+
+# KEYS[1] = room key
+# ARGV = 읽었던 version, 새 방 JSON('' 이면 삭제), timeout('' 이면 만료 없음)
+# 반환: 1 성공, 0 version 충돌, -1 방 없음
+COMPARE_AND_SET_SCRIPT = """
+local raw = redis.call('GET', KEYS[1])
+if not raw then
+	return -1
+end
+local current = cjson.decode(raw)
+if tostring(tonumber(current['version']) or 0) ~= ARGV[1] then
+	return 0
+end
+if ARGV[2] == '' then
+	redis.call('DEL', KEYS[1])
+elseif ARGV[3] ~= '' then
+	redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+else
+	redis.call('SET', KEYS[1], ARGV[2])
+end
+return 1
+"""
+
+
+# Hash 저장 형식 - KEYS[1] = 방 hash (필드마다 JSON 값), KEYS[2] = 플레이어 list (항목마다 JSON)
+# ARGV는 UPDATE_SCRIPT와 같다. 반환: {HGETALL, LRANGE} (삭제됐어도 마지막 상태), 적용할 수 없으면 nil
+HASH_UPDATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+	return nil
+end
+local function field(name)
+	local raw = redis.call('HGET', KEYS[1], name)
+	if not raw then
+		return nil
+	end
+	return cjson.decode(raw)
+end
+local function missing(value)
+	return value == nil or value == cjson.null or value == ''
+end
+local room_type = tonumber(field('roomType')) or 0
+local tournament = room_type == 3 or room_type == 4
+local host = field('host')
+if missing(host) and not tournament then
+	return nil
+end
+
+local data = cjson.decode(ARGV[2])
+local update_type = ARGV[1]
+if update_type == 'add_player' then
+	redis.call('RPUSH', KEYS[2], cjson.encode({intraId = data['intraId'], nickname = data['nickname'], profileImage = data['profileImage']}))
+	if missing(host) then
+		host = data['nickname']
+		redis.call('HSET', KEYS[1], 'host', cjson.encode(host))
+	end
+elseif update_type == 'remove_player' then
+	local first = nil
+	for _, raw in ipairs(redis.call('LRANGE', KEYS[2], 0, -1)) do
+		local player = cjson.decode(raw)
+		if player['intraId'] == data['intraId'] then
+			redis.call('LREM', KEYS[2], 1, raw)
+		elseif first == nil then
+			first = player
+		end
+	end
+	if host == data['nickname'] then
+		host = first and first['nickname'] or cjson.null
+		redis.call('HSET', KEYS[1], 'host', cjson.encode(host))
+	end
+elseif update_type == 'update_game_state' then
+	for _, name in ipairs(cjson.decode(ARGV[5])) do
+		if data[name] ~= nil then
+			redis.call('HSET', KEYS[1], name, cjson.encode(data[name]))
+		end
+	end
+end
+
+redis.call('HINCRBY', KEYS[1], 'version', 1)
+redis.call('HSET', KEYS[1], 'last_modified', cjson.encode(ARGV[3]))
+local result = {redis.call('HGETALL', KEYS[1]), redis.call('LRANGE', KEYS[2], 0, -1)}
+if missing(host) and not tournament then
+	redis.call('DEL', KEYS[1], KEYS[2])
+elseif ARGV[4] ~= '' then
+	redis.call('EXPIRE', KEYS[1], ARGV[4])
+	redis.call('EXPIRE', KEYS[2], ARGV[4])
+else
+	redis.call('PERSIST', KEYS[1])
+	redis.call('PERSIST', KEYS[2])
+end
+return result
+"""
+
+# ARGV = 읽었던 version, 바꿀 필드(json 객체: 필드 -> JSON 값), 새 플레이어 목록(json 배열, '' 이면 그대로),
+#        timeout('' 이면 만료 없음), 삭제 여부('1'),
+#        지울 필드(json 배열, '' 이면 없음, '*' 이면 ARGV[2]에 없는 필드 전부)
+# 반환: 1 성공, 0 version 충돌, -1 방 없음
+HASH_COMPARE_AND_SET_SCRIPT = """
+local version = redis.call('HGET', KEYS[1], 'version')
+if not version then
+	return -1
+end
+if tostring(tonumber(version) or 0) ~= ARGV[1] then
+	return 0
+end
+if ARGV[5] == '1' then
+	redis.call('DEL', KEYS[1], KEYS[2])
+	return 1
+end
+for name, value in pairs(cjson.decode(ARGV[2])) do
+	redis.call('HSET', KEYS[1], name, value)
+end
+if ARGV[6] == '*' then
+	local fields = cjson.decode(ARGV[2])
+	for _, name in ipairs(redis.call('HKEYS', KEYS[1])) do
+		if fields[name] == nil then
+			redis.call('HDEL', KEYS[1], name)
+		end
+	end
+elseif ARGV[6] ~= '' then
+	for _, name in ipairs(cjson.decode(ARGV[6])) do
+		redis.call('HDEL', KEYS[1], name)
+	end
+end
+if ARGV[3] ~= '' then
+	redis.call('DEL', KEYS[2])
+	for _, player in ipairs(cjson.decode(ARGV[3])) do
+		redis.call('RPUSH', KEYS[2], player)
+	end
+end
+if ARGV[4] ~= '' then
+	redis.call('EXPIRE', KEYS[1], ARGV[4])
+	redis.call('EXPIRE', KEYS[2], ARGV[4])
+else
+	redis.call('PERSIST', KEYS[1])
+	redis.call('PERSIST', KEYS[2])
+end
+return 1
+"""
+
+
+# KEYS = OPEN_ROOMS_KEY, LOBBY_SUMMARY_KEY, LOBBY_VERSION_KEY, INDEXED_VERSION_PREFIX + 방 key
+# ARGV = 방 key, created_at, 로비 요약 JSON('' 이면 목록에서 뺀다), 방 version('' 이면 삭제된 방),
+#        timeout('' 이면 만료 없음)
+# 방 쓰기와 index 쓰기 사이에 다른 쓰기가 끼어들 수 있으므로 이미 반영한 것보다 오래된 version은 무시한다.
+# 목록이 실제로 바뀐 경우에만 로비 version을 올린다
+INDEX_SCRIPT = """
+if ARGV[4] == '' then
+	redis.call('DEL', KEYS[4])
+else
+	local indexed = tonumber(redis.call('GET', KEYS[4]))
+	if indexed and tonumber(ARGV[4]) < indexed then
+		return 0
+	end
+	if ARGV[5] ~= '' then
+		redis.call('SET', KEYS[4], ARGV[4], 'EX', ARGV[5])
+	else
+		redis.call('SET', KEYS[4], ARGV[4])
+	end
+end
+if ARGV[3] == '' then
+	local removed = redis.call('ZREM', KEYS[1], ARGV[1])
+	redis.call('HDEL', KEYS[2], ARGV[1])
+	if removed == 1 then
+		redis.call('INCR', KEYS[3])
+	end
+	return removed
+end
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[3] then
+	redis.call('HSET', KEYS[2], ARGV[1], ARGV[3])
+	redis.call('INCR', KEYS[3])
+	return 1
+end
+return 0
+"""
+
+# KEYS = 방 key들
+# 반환: 방마다 1 목록에 나오는 방(is_listed), 0 닫힌 방, -1 없는 방 - 방 상태는 Redis 밖으로 보내지 않는다
+LISTED_SCRIPT = """
+local result = {}
+for i, key in ipairs(KEYS) do
+	local raw = redis.call('GET', key)
+	if not raw then
+		result[i] = -1
+	else
+		local room = cjson.decode(raw)
+		local room_type = tonumber(room['roomType'])
+		local host = room['host']
+		if host == nil or host == cjson.null or room_type == 3 or room_type == 4 or room['game_started'] == true then
+			result[i] = 0
+		else
+			result[i] = 1
+		end
+	end
+end
+return result
+"""
+
+# LISTED_SCRIPT의 hash 저장소 버전 - 필요한 필드만 읽는다
+HASH_LISTED_SCRIPT = """
+local result = {}
+for i, key in ipairs(KEYS) do
+	local values = redis.call('HMGET', key, 'host', 'roomType', 'game_started')
+	if redis.call('EXISTS', key) == 0 then
+		result[i] = -1
+	else
+		local host = values[1] and cjson.decode(values[1]) or nil
+		local room_type = values[2] and tonumber(cjson.decode(values[2])) or nil
+		local started = values[3] and cjson.decode(values[3]) or false
+		if host == nil or host == cjson.null or room_type == 3 or room_type == 4 or started == true then
+			result[i] = 0
+		else
+			result[i] = 1
+		end
+	end
+end
+return result
+"""
+
+
+def normalize_room(room):
+	for field in LIST_FIELDS:
+		if room.get(field) == {}:
+			room[field] = []
+	return room
+
+
+def write_plan(room):
+	"""set_room 규칙 - (저장할지, timeout)
+
+	처음 만든 토너먼트 방은 30분, host가 없는 일반 방은 삭제, 나머지는 기본 캐시 timeout
+	"""
+	room_type = int(room['roomType'])
+	if room_type in (3, 4) and int(room['version']) == 0:
+		return True, TOURNAMENT_ROOM_TIMEOUT
+	if room['host'] is None and room_type not in (3, 4):
+		return False, None
+	return True, cache.default_timeout
+
+
+def removed_fields(room, previous):
+	"""읽었던 방(previous)에는 있었는데 새 방(room)에서 빠진 필드 - 필드별로 저장하는 store가 지워야 한다
+
+	previous를 모르면 None
+	"""
+	if previous is None:
+		return None
+	return [name for name in previous if name != 'players' and name not in room]
+
+
+def is_listed(room):
+	"""로비 목록(열린 방 index)에 나오는 방 - 시작 전의 일반 방"""
+	if not room or room.get('host') is None:
+		return False
+	return int(room['roomType']) not in (3, 4) and not room.get('game_started')
+
+
+def lobby_summary(room):
+	"""로비 목록 항목 - 목록에 나오지 않는 방이면 None"""
+	if not is_listed(room):
+		return None
+	return {
+		'id': room['id'],
+		'name': room['name'],
+		'roomType': room['roomType'],
+		'people': len(room.get('players', [])),
+		'created_at': float(room['created_at'])
+	}
+
+
+def project(room, fields=None):
+	"""fields만 남긴 방 - fields가 없으면 그대로"""
+	if room is None or not fields:
+		return room
+	return {name: room[name] for name in fields if name in room}
+
+
+def _timeout_arg(timeout):
+	return '' if timeout is None else str(int(timeout))
+
+
+class RoomCache:
+	"""방 id -> (만료 시각, version, 방) - 호출하는 쪽이 고쳐 쓸 수 있도록 복사본을 주고받는다"""
+	def __init__(self, ttl=2.0):
+		self.ttl = ttl
+		self.entries = {}
+
+	def get(self, room_id):
+		entry = self.entries.get(room_id)
+		if entry is None or entry[0] < time.monotonic():
+			metrics.incr('room_cache_misses')
+			return None
+		metrics.incr('room_cache_hits')
+		return copy.deepcopy(entry[2])
+
+	def put(self, room_id, room):
+		if self.ttl <= 0:
+			return
+		version = int(room.get('version', 0))
+		entry = self.entries.get(room_id)
+		if entry is not None and entry[1] > version:
+			return  # 더 새 버전이 이미 있다 (순서가 뒤바뀐 쓰기)
+		self.entries[room_id] = (time.monotonic() + self.ttl, version, copy.deepcopy(room))
+
+	def invalidate(self, room_id):
+		if self.entries.pop(room_id, None) is not None:
+			metrics.incr('room_cache_invalidations')
+
+
+class RoomStore:
+	"""방 하나를 JSON 한 덩어리로 저장 (ROOM_STORE['BACKEND'] = 'json')
+
+	동기 API - 호출하는 쪽에서 sync_to_async로 감싼다 (cache 호출과 같은 방식).
+	캐시 조회(cached)만은 Redis를 거치지 않으므로 이벤트 루프에서 바로 불러도 된다.
+	저장 형식은 _read/_write/_delete/_run_update/_run_compare_and_set만 알고 있다.
+	"""
+	update_script = UPDATE_SCRIPT
+	compare_and_set_script = COMPARE_AND_SET_SCRIPT
+	listed_script = LISTED_SCRIPT
+
+	def __init__(self, alias='default', cache_ttl=2.0):
+		self.alias = alias
+		self.cache = RoomCache(cache_ttl)
+		self.node_id = uuid.uuid4().hex  # 자기가 보낸 무효화 알림은 무시한다
+		self._redis = None
+		self._update = None
+		self._compare_and_set = None
+		self._index = None
+		self._listed = None
+		self._listener = None
+
+	def _connect(self):
+		if self._redis is None:
+			self._redis = get_redis_connection(self.alias)
+			self._update = self._redis.register_script(self.update_script)
+			self._compare_and_set = self._redis.register_script(self.compare_and_set_script)
+			self._index = self._redis.register_script(INDEX_SCRIPT)
+			self._listed = self._redis.register_script(self.listed_script)
+			self._listen()
+		return self._redis
+
+	@property
+	def redis(self):
+		return self._connect()
+
+	def _listen(self):
+		if self.cache.ttl <= 0:
+			return
+		try:
+			pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+			pubsub.subscribe(**{INVALIDATION_CHANNEL: self._on_invalidation})
+			self._listener = pubsub.run_in_thread(sleep_time=1, daemon=True)
+		except Exception as e:
+			# 알림 없이도 cache_ttl이 지나면 다시 읽으므로 계속 진행한다
+			logger.error(f"Room cache invalidation listener failed to start: {e}")
+
+	def _on_invalidation(self, message):
+		node_id, _, room_id = message['data'].decode().partition(':')
+		if node_id != self.node_id:
+			self.cache.invalidate(room_id)
+
+	def _written(self, room_id, room=None):
+		"""이 프로세스에서 쓴 결과를 캐시와 로비 index/요약에 반영하고 다른 노드에 무효화를 알린다"""
+		if room is None:
+			self.cache.invalidate(room_id)
+		else:
+			self.cache.put(room_id, room)
+		pipe = self.redis.pipeline(transaction=False)
+		self._reindex(pipe, room_id, room)
+		if self.cache.ttl > 0:
+			pipe.publish(INVALIDATION_CHANNEL, f'{self.node_id}:{room_id}')
+		pipe.execute()
+
+	def _reindex(self, pipe, room_id, room=None):
+		"""room이 None이면 삭제된 방 - 아니면 room의 version보다 오래된 index 쓰기는 이후 무시된다"""
+		summary = lobby_summary(room)
+		version = timeout = ''
+		if room is not None:
+			version = str(int(room.get('version', 0)))
+			timeout = _timeout_arg(write_plan(room)[1])
+		self._index(
+			keys=[OPEN_ROOMS_KEY, LOBBY_SUMMARY_KEY, LOBBY_VERSION_KEY, f'{INDEXED_VERSION_PREFIX}{room_id}'],
+			args=[
+				room_id, float(room['created_at']) if summary else 0, json.dumps(summary) if summary else '',
+				version, timeout
+			],
+			client=pipe
+		)
+
+	# ---- 저장 형식 ----
+
+	def _read(self, room_id, fields=None):
+		return self._read_many([room_id], fields)[0]
+
+	def _read_many(self, room_ids, fields=None):
+		"""방 여러 개를 한 번의 왕복으로 - 없는 방은 None"""
+		return [
+			normalize_room(json.loads(raw)) if raw is not None else None
+			for raw in self.redis.mget(room_ids)
+		]
+
+	def _write(self, room_id, room, timeout):
+		self.redis.set(room_id, json.dumps(room), ex=timeout)
+
+	def _delete(self, room_id):
+		self.redis.delete(room_id)
+
+	def _run_update(self, room_id, args):
+		raw = self._update(keys=[room_id], args=args)
+		if raw is None:
+			return None
+		return normalize_room(json.loads(raw))
+
+	def _run_compare_and_set(self, room_id, expected_version, room, timeout, previous):
+		return self._compare_and_set(
+			keys=[room_id],
+			args=[str(int(expected_version)), json.dumps(room) if room is not None else '', _timeout_arg(timeout)]
+		)
+
+	# ---- API ----
+
+	def cached(self, room_id, fields=None):
+		return project(self.cache.get(room_id), fields)
+
+	def get(self, room_id, fields=None):
+		room = self.cache.get(room_id)
+		if room is not None:
+			return project(room, fields)
+		return self.load(room_id, fields)
+
+	def load(self, room_id, fields=None):
+		"""캐시를 건너뛰고 Redis에서 읽는다 - 방 전체를 읽었으면 캐시에 채운다"""
+		room = self._read(room_id, fields)
+		if room is None:
+			return None
+		if not fields:
+			self.cache.put(room_id, room)
+		return project(room, fields)
+
+	def set(self, room_id, room):
+		"""write_plan에 따라 저장 또는 삭제 - 저장했으면 True"""
+		store, timeout = write_plan(room)
+		if not store:
+			self._delete(room_id)
+			self._written(room_id)
+			return False
+		self._write(room_id, room, timeout)
+		self._written(room_id, room)
+		return True
+
+	def delete(self, room_id):
+		self._delete(room_id)
+		self._written(room_id)
+
+	def lobby_version(self):
+		return int(self.redis.get(LOBBY_VERSION_KEY) or 0)
+
+	def open_rooms(self, cursor=None, limit=None):
+		"""열린 방 index를 최신 방부터 - ([방 key], 다음 cursor 또는 None)
+
+		cursor는 앞 페이지 마지막 방의 '점수:key'다. 같은 created_at을 가진 방이 있어도
+		빠지거나 겹치지 않도록 점수가 같으면 key로 이어서 읽는다 (ZREVRANGE는 key 역순).
+		"""
+		top, after = '+inf', None
+		if cursor:
+			score, _, after = cursor.partition(':')
+			top = float(score)
+		if limit is None:
+			entries = self.redis.zrevrangebyscore(OPEN_ROOMS_KEY, top, '-inf', withscores=True)
+		else:
+			entries = self.redis.zrevrangebyscore(
+				OPEN_ROOMS_KEY, top, '-inf', start=0, num=limit + 1 + CURSOR_TIE_MARGIN, withscores=True
+			)
+		entries = [(member.decode(), score) for member, score in entries]
+		if after:
+			entries = [(member, score) for member, score in entries if not (score == top and member >= after)]
+		if limit is None or len(entries) <= limit:
+			return [member for member, _ in entries], None
+		page = entries[:limit]
+		last_member, last_score = page[-1]
+		return [member for member, _ in page], f'{last_score!r}:{last_member}'
+
+	def lobby_page(self, cursor=None, limit=None):
+		"""로비 목록 한 페이지 - ([(방 key, 요약 JSON)], 다음 cursor 또는 None)
+
+		미리 만들어 둔 요약과 방이 아직 열려 있는지(LISTED_SCRIPT, Redis 안에서 확인)를
+		한 번의 왕복으로 가져온다. 만료됐거나 닫힌 방은 index에서 뺀다.
+		"""
+		room_keys, next_cursor = self.open_rooms(cursor, limit)
+		if not room_keys:
+			return [], next_cursor
+		pipe = self.redis.pipeline(transaction=False)
+		pipe.hmget(LOBBY_SUMMARY_KEY, room_keys)
+		self._listed(keys=room_keys, client=pipe)
+		summaries, listed = pipe.execute()
+
+		page, stale = [], []
+		for room_key, summary, state in zip(room_keys, summaries, listed):
+			if summary is None or state != 1:
+				stale.append(room_key)
+			else:
+				page.append((room_key, summary.decode()))
+		self.unindex(stale)
+		return page, next_cursor
+
+	def unindex(self, room_ids):
+		"""만료됐거나 더 이상 열려 있지 않은 방을 로비 index/요약에서 뺀다"""
+		if not room_ids:
+			return
+		pipe = self.redis.pipeline(transaction=False)
+		for room_id in room_ids:
+			self._reindex(pipe, room_id)
+		pipe.execute()
+
+	def update(self, room_id, update_type, update_data, last_modified):
+		"""알려진 변경을 원자적으로 적용 - 갱신된 방(삭제됐어도 마지막 상태), 적용할 수 없으면 None"""
+		self._connect()
+		room = self._run_update(room_id, [
+			update_type, json.dumps(update_data), last_modified,
+			_timeout_arg(cache.default_timeout), json.dumps(UPDATE_FIELDS)
+		])
+		if room is None:
+			self.cache.invalidate(room_id)
+			return None
+		store, _ = write_plan(room)
+		self._written(room_id, room if store else None)
+		return room
+
+	def compare_and_set(self, room_id, expected_version, room, previous=None):
+		"""expected_version일 때만 room을 저장(write_plan) - 1 성공, 0 충돌, -1 방 없음
+
+		previous(변경 전 방)를 주면 형식에 따라 바뀐 필드만 쓴다.
+		"""
+		self._connect()
+		store, timeout = write_plan(room)
+		result = self._run_compare_and_set(room_id, expected_version, room if store else None, timeout, previous)
+		if result == 1:
+			self._written(room_id, room if store else None)
+		else:
+			# 캐시에 있던 방이 낡았다 - 다시 시도할 때는 Redis에서 읽는다
+			self.cache.invalidate(room_id)
+		return result
+
+
+class HashRoomStore(RoomStore):
+	"""방의 스칼라 필드는 Redis hash(필드마다 JSON)로, 플레이어는 별도 list로 저장 (BACKEND = 'hash')
+
+	플레이어 입장/퇴장이나 game1_ended 같은 플래그 변경은 바뀐 필드만 쓰고,
+	필요한 필드만 골라 읽을 수 있다 (get(room_id, fields=...)).
+	"""
+	update_script = HASH_UPDATE_SCRIPT
+	compare_and_set_script = HASH_COMPARE_AND_SET_SCRIPT
+	listed_script = HASH_LISTED_SCRIPT
+
+	def _players_key(self, room_id):
+		return f'{room_id}{PLAYERS_SUFFIX}'
+
+	def _build(self, values, players):
+		room = {
+			(name.decode() if isinstance(name, bytes) else name): json.loads(value)
+			for name, value in values.items() if value is not None
+		}
+		if players is not None:
+			room['players'] = [json.loads(player) for player in players]
+		return normalize_room(room)
+
+	def _read_many(self, room_ids, fields=None):
+		scalars = [name for name in fields if name != 'players'] if fields else None
+		with_players = fields is None or 'players' in fields
+		pipe = self.redis.pipeline(transaction=False)
+		for room_id in room_ids:
+			pipe.exists(room_id)
+			if fields is None:
+				pipe.hgetall(room_id)
+			elif scalars:
+				pipe.hmget(room_id, scalars)
+			if with_players:
+				pipe.lrange(self._players_key(room_id), 0, -1)
+		results = iter(pipe.execute())
+
+		rooms = []
+		for _ in room_ids:
+			exists = next(results)
+			if fields is None:
+				values = next(results)
+			elif scalars:
+				values = dict(zip(scalars, next(results)))
+			else:
+				values = {}
+			players = next(results) if with_players else None
+			rooms.append(self._build(values, players) if exists else None)
+		return rooms
+
+	def _write(self, room_id, room, timeout):
+		players_key = self._players_key(room_id)
+		pipe = self.redis.pipeline()
+		pipe.delete(room_id, players_key)
+		pipe.hset(room_id, mapping={
+			name: json.dumps(value) for name, value in room.items() if name != 'players'
+		})
+		if room.get('players'):
+			pipe.rpush(players_key, *[json.dumps(player) for player in room['players']])
+		if timeout is not None:
+			pipe.expire(room_id, timeout)
+			pipe.expire(players_key, timeout)
+		pipe.execute()
+
+	def _delete(self, room_id):
+		self.redis.delete(room_id, self._players_key(room_id))
+
+	def _run_update(self, room_id, args):
+		result = self._update(keys=[room_id, self._players_key(room_id)], args=args)
+		if result is None:
+			return None
+		flat, players = result
+		return self._build(dict(zip(flat[::2], flat[1::2])), players)
+
+	def _run_compare_and_set(self, room_id, expected_version, room, timeout, previous):
+		fields = players = removed = ''
+		if room is not None:
+			fields = json.dumps({
+				name: json.dumps(value) for name, value in room.items()
+				if name != 'players' and (previous is None or name not in previous or previous[name] != value)
+			})
+			if previous is None or previous.get('players') != room.get('players'):
+				players = json.dumps([json.dumps(player) for player in room.get('players', [])])
+			names = removed_fields(room, previous)
+			if names is None:
+				removed = '*'
+			elif names:
+				removed = json.dumps(names)
+		return self._compare_and_set(
+			keys=[room_id, self._players_key(room_id)],
+			args=[str(int(expected_version)), fields, players, _timeout_arg(timeout), '1' if room is None else '', removed]
+		)
+
+ROOM_STORES = {
+	'json': RoomStore,
+	'hash': HashRoomStore,
+}
+
+room_store = ROOM_STORES[ROOM_STORE_SETTINGS.get('BACKEND', 'json')](
+	cache_ttl=ROOM_STORE_SETTINGS.get('CACHE_TTL', 2.0)
+)
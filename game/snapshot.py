@@ -0,0 +1,61 @@
+import time
+
+
+class SnapshotEncoder:
+	"""게임 한 판의 game_state_update 프레임을 만드는 인코더
+
+	그룹 전체에 같은 프레임이 나가므로 게임마다 하나의 기준(baseline)만 둔다.
+	- 위치/속도는 precision 자리로 반올림하고, scale은 z로 계산할 수 있으므로 보내지 않는다
+	- 기준 프레임과 비교해 바뀐 축만 보낸다 (속도는 충돌 때만 바뀐다)
+	- 점수는 바뀔 때만 보낸다
+	- keyframe_interval 프레임마다 모든 필드를 담은 keyframe('key': True)을 보낸다
+	"""
+	def __init__(self, position_precision=3, velocity_precision=2, keyframe_interval=30):
+		self.position_precision = position_precision
+		self.velocity_precision = velocity_precision
+		self.keyframe_interval = keyframe_interval
+		self.baseline = None
+		self.frames_since_key = 0
+
+	def reset(self):
+		"""다음 프레임을 keyframe으로 보낸다 (재접속/재개 후)"""
+		self.baseline = None
+
+	def encode(self, game_state):
+		ball = game_state.ball
+		p = self.position_precision
+		v = self.velocity_precision
+		current = {
+			'position': {'x': round(ball.x, p), 'y': round(ball.y, p), 'z': round(ball.z, p)},
+			'velocity': {'x': round(ball.vx, v), 'y': round(ball.vy, v), 'z': round(ball.vz, v)},
+			'score': dict(game_state.score),
+		}
+
+		frame = {
+			'type': 'game_state_update',
+			'tick': game_state.tick,
+			'timestamp': int(time.time() * 1000)
+		}
+		baseline = self.baseline
+		if baseline is None or self.frames_since_key >= self.keyframe_interval:
+			frame['key'] = True
+			frame['ball'] = {'position': current['position'], 'velocity': current['velocity']}
+			frame['score'] = current['score']
+			self.frames_since_key = 0
+		else:
+			ball_delta = {}
+			for field in ('position', 'velocity'):
+				changed = {
+					axis: value for axis, value in current[field].items()
+					if value != baseline[field][axis]
+				}
+				if changed:
+					ball_delta[field] = changed
+			if ball_delta:
+				frame['ball'] = ball_delta
+			if current['score'] != baseline['score']:
+				frame['score'] = current['score']
+
+		self.baseline = current
+		self.frames_since_key += 1
+		return frame
@@ -0,0 +1,130 @@
+import time
+
+
+class Ball:
+	"""공 상태 - 매 substep마다 새 dict를 만들지 않고 필드를 직접 갱신한다"""
+	__slots__ = ('x', 'y', 'z', 'vx', 'vy', 'vz', 'scale')
+
+	def __init__(self, x=0.0, y=0.2, z=-21.0, vx=0.0, vy=0.0, vz=0.0, scale=1.5):
+		self.x = x
+		self.y = y
+		self.z = z
+		self.vx = vx
+		self.vy = vy
+		self.vz = vz
+		self.scale = scale
+
+	def reset(self, x, y, z, vx, vy, vz, scale):
+		self.x, self.y, self.z = x, y, z
+		self.vx, self.vy, self.vz = vx, vy, vz
+		self.scale = scale
+
+	def to_dict(self):
+		return {
+			'position': {'x': self.x, 'y': self.y, 'z': self.z},
+			'velocity': {'x': self.vx, 'y': self.vy, 'z': self.vz},
+			'scale': self.scale
+		}
+
+
+class Paddle:
+	__slots__ = ('x', 'y', 'z')
+
+	def __init__(self, x=0.0, y=0.0, z=0.0):
+		self.x = x
+		self.y = y
+		self.z = z
+
+	def to_dict(self):
+		return {'position': {'x': self.x, 'y': self.y, 'z': self.z}}
+
+
+class PaddleHistory:
+	"""플레이어 패들 입력의 고정 크기 링 버퍼 (input_sequence 순서, 서버 수신 시각과 함께)"""
+	__slots__ = ('size', 'sequences', 'times', 'xs', 'ys', 'head', 'count')
+
+	def __init__(self, size=64):
+		self.size = size
+		self.sequences = [0] * size
+		self.times = [0.0] * size
+		self.xs = [0.0] * size
+		self.ys = [0.0] * size
+		self.head = 0  # 다음에 쓸 자리
+		self.count = 0
+
+	def reset(self):
+		self.head = 0
+		self.count = 0
+
+	def record(self, input_sequence, received_at, x, y):
+		if self.count and input_sequence <= self.sequences[self.head - 1]:
+			return False  # 순서가 뒤바뀐 오래된 입력
+		i = self.head
+		self.sequences[i] = input_sequence
+		self.times[i] = received_at
+		self.xs[i] = x
+		self.ys[i] = y
+		self.head = (i + 1) % self.size
+		self.count = min(self.count + 1, self.size)
+		return True
+
+	def samples_between(self, start, end):
+		"""start 직전 위치와 [start, end] 동안 받은 위치들 (오래된 것부터)"""
+		samples = []
+		for k in range(self.count, 0, -1):
+			i = (self.head - k) % self.size
+			t = self.times[i]
+			if t > end:
+				break
+			if t < start:
+				samples = [(self.xs[i], self.ys[i])]  # start 시점에 서버가 알고 있던 위치
+			else:
+				samples.append((self.xs[i], self.ys[i]))
+		return samples
+
+
+class Match:
+	"""게임 한 판의 상태 (예전 GameState.active_games의 중첩 dict)
+
+	전송용 dict는 브로드캐스트/백업 시점에만 to_dict()로 만든다.
+	"""
+	__slots__ = (
+		'game_id', 'ball', 'players', 'score', 'timestamp', 'last_processed_input',
+		'game_started', 'match_type', 'disconnected_player', 'is_paused',
+		'pause_start_time', 'tick', 'paddle_history', 'rtt', 'clock_rtt'
+	)
+
+	def __init__(self, game_id, ball: Ball):
+		self.game_id = game_id
+		self.ball = ball
+		self.players = {}  # 'player1' / 'player2' -> Paddle
+		self.score = {'player1': 0, 'player2': 0}
+		self.timestamp = int(time.time() * 1000)
+		self.last_processed_input = {'player1': 0, 'player2': 0}
+		self.game_started = False
+		self.match_type = None
+		self.disconnected_player = []
+		self.is_paused = False
+		self.pause_start_time = None
+		self.tick = 0
+		self.paddle_history = {'player1': PaddleHistory(), 'player2': PaddleHistory()}
+		self.rtt = {'player1': None, 'player2': None}  # 플레이어별 왕복 지연(초), 서버가 재기 전에는 None
+		self.clock_rtt = {'player1': None, 'player2': None}  # ClockSync가 추정한 왕복 지연(ms) - 카운트다운 시작 시각용
+
+	def players_to_dict(self):
+		return {player: paddle.to_dict() for player, paddle in self.players.items()}
+
+	def to_dict(self):
+		return {
+			'ball': self.ball.to_dict(),
+			'players': self.players_to_dict(),
+			'score': dict(self.score),
+			'timestamp': self.timestamp,
+			'lastProcessedInput': dict(self.last_processed_input),
+			'game_started': self.game_started,
+			'match_type': self.match_type,
+			'disconnected_player': list(self.disconnected_player),
+			'is_paused': self.is_paused,
+			'pause_start_time': self.pause_start_time,
+			'tick': self.tick
+		}
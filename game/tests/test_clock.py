@@ -0,0 +1,88 @@
+from django.test import SimpleTestCase
+
+from game.clock import ClockSync, Heartbeat
+
+
+class ClockSyncTestCase(SimpleTestCase):
+	def sample(self, clock, sent, client_offset, up, down):
+		"""server_time=sent로 보낸 probe가 up ms 뒤 클라이언트에, 다시 down ms 뒤 서버에 도착"""
+		probe = clock.probe(sent)
+		client_time = sent + up + client_offset
+		return clock.add_ack(probe['id'], client_time, sent + up + down)
+
+	def test_offset_from_min_rtt_sample(self):
+		clock = ClockSync(window=8)
+		self.assertFalse(clock.ready)
+		self.assertIsNone(clock.offset)
+		# 큐 지연이 한쪽에만 섞인 샘플은 offset이 틀어지지만 RTT가 가장 작은 대칭 샘플이 선택된다
+		self.sample(clock, 0, 500, 80, 20)
+		self.sample(clock, 1000, 500, 15, 15)
+		self.sample(clock, 2000, 500, 20, 120)
+		self.assertTrue(clock.ready)
+		self.assertEqual(clock.offset, 500)
+		self.assertEqual(clock.min_rtt, 30)
+
+	def test_rtt_median_and_jitter(self):
+		clock = ClockSync(window=8)
+		for sent, (up, down) in enumerate(((10, 10), (20, 20), (15, 15), (200, 200), (25, 25))):
+			self.sample(clock, sent * 1000, -40, up, down)
+		self.assertEqual(clock.rtt, 40)
+		self.assertEqual(clock.jitter, 400 - 20)
+		self.assertEqual(clock.interpolation_delay(50), 2 * 50 + 380)
+
+	def test_window_drops_old_samples(self):
+		clock = ClockSync(window=2)
+		self.sample(clock, 0, 0, 5, 5)
+		self.sample(clock, 1000, 100, 20, 20)
+		self.sample(clock, 2000, 100, 30, 30)
+		self.assertEqual(clock.offset, 100)
+		self.assertEqual(clock.min_rtt, 40)
+
+	def test_unknown_probe_is_ignored(self):
+		clock = ClockSync(window=8)
+		probe = clock.probe(0)
+		self.assertFalse(clock.add_ack(probe['id'] + 1, 0, 10))
+		self.assertTrue(clock.add_ack(probe['id'], 5, 10))
+		# 같은 probe에 두 번 응답해도 샘플은 하나
+		self.assertFalse(clock.add_ack(probe['id'], 5, 10))
+		self.assertEqual(len(clock.samples), 1)
+
+
+class HeartbeatTestCase(SimpleTestCase):
+	def run_intervals(self, heartbeat, count, answer=()):
+		"""interval마다 consumer의 run_heartbeat처럼 expire -> ping, answer에 있는 회차는 바로 pong"""
+		now = 0
+		for i in range(count):
+			if heartbeat.expire():
+				return i
+			message = heartbeat.ping(now)
+			if i in answer:
+				heartbeat.pong(message['id'], now + 20)
+			now += 2000
+		return None
+
+	def test_client_without_pong_is_never_dead(self):
+		heartbeat = Heartbeat(interval=2, miss_threshold=3)
+		self.assertIsNone(self.run_intervals(heartbeat, 20))
+		self.assertFalse(heartbeat.armed)
+		self.assertEqual(heartbeat.missed, 0)
+
+	def test_dead_when_threshold_reached(self):
+		heartbeat = Heartbeat(interval=2, miss_threshold=3)
+		# 첫 ping에만 응답 - 이후 ping 3개가 각각 한 interval씩 응답 없이 지나간 시점에 끊긴다
+		self.assertEqual(self.run_intervals(heartbeat, 10, answer={0}), 4)
+		self.assertTrue(heartbeat.armed)
+		self.assertEqual(heartbeat.missed, 3)
+		self.assertTrue(heartbeat.dead)
+
+	def test_late_pong_resets_misses(self):
+		heartbeat = Heartbeat(interval=2, miss_threshold=3)
+		heartbeat.pong(heartbeat.ping(0)['id'], 10)
+		stale = heartbeat.ping(2000)
+		self.assertFalse(heartbeat.expire())
+		heartbeat.ping(4000)
+		self.assertFalse(heartbeat.expire())
+		self.assertEqual(heartbeat.missed, 2)
+		self.assertIsNotNone(heartbeat.pong(stale['id'], 6000))
+		self.assertEqual(heartbeat.missed, 0)
+		self.assertFalse(heartbeat.dead)
@@ -0,0 +1,98 @@
+from django.test import SimpleTestCase
+
+from game.codec import BINARY_SUBPROTOCOL, BinaryCodec, JsonCodec, encoded_event, negotiate, payload_for
+from game.metrics import metrics
+
+
+class CodecTestCase(SimpleTestCase):
+	def setUp(self):
+		self.binary = BinaryCodec()
+		self.json = JsonCodec()
+
+	def round_trip(self, codec, message):
+		data = codec.encode(message)
+		if codec.binary:
+			return codec.decode(bytes_data=data)
+		return codec.decode(text_data=data)
+
+	def assertNested(self, actual, expected):
+		"""float32로 줄어든 좌표는 근사 비교"""
+		if isinstance(expected, dict):
+			self.assertEqual(set(actual), set(expected))
+			for key in expected:
+				self.assertNested(actual[key], expected[key])
+		elif isinstance(expected, float):
+			self.assertAlmostEqual(actual, expected, places=4)
+		else:
+			self.assertEqual(actual, expected)
+
+	def test_state_keyframe_round_trip(self):
+		message = {
+			'type': 'game_state_update', 'tick': 1200, 'timestamp': 1729240000123, 'key': True,
+			'ball': {
+				'position': {'x': 1.25, 'y': -0.5, 'z': -20.125},
+				'velocity': {'x': 0.75, 'y': 0.0, 'z': -4.0},
+			},
+			'score': {'player1': 3, 'player2': 4},
+		}
+		for codec in (self.binary, self.json):
+			with self.subTest(binary=codec.binary):
+				self.assertNested(self.round_trip(codec, message), message)
+
+	def test_state_delta_round_trip(self):
+		# 델타 프레임은 들어 있는 필드만 돌아온다
+		message = {
+			'type': 'game_state_update', 'tick': 7, 'timestamp': 1000,
+			'ball': {'position': {'z': -3.5}, 'velocity': {'x': 1.5}},
+		}
+		self.assertNested(self.round_trip(self.binary, message), message)
+		empty = {'type': 'game_state_update', 'tick': 8, 'timestamp': 1016}
+		self.assertEqual(self.round_trip(self.binary, empty), empty)
+
+	def test_paddle_round_trip(self):
+		for message_type in ('opponent_update', 'client_state_update'):
+			message = {
+				'type': message_type, 'player': 'player2',
+				'position': {'x': -2.5, 'y': 1.75}, 'input_sequence': 4242,
+			}
+			with self.subTest(message_type=message_type):
+				self.assertNested(self.round_trip(self.binary, message), message)
+
+	def test_control_message_round_trip(self):
+		message = {'type': 'game_end', 'winner': 'player1', 'match': '2', 'detail': [1, 2, None]}
+		for codec in (self.binary, self.json):
+			with self.subTest(binary=codec.binary):
+				self.assertEqual(self.round_trip(codec, message), message)
+
+	def test_binary_codec_accepts_text_frames(self):
+		self.assertEqual(self.binary.decode(text_data='{"type": "pong", "id": 1}'), {'type': 'pong', 'id': 1})
+
+	def test_negotiate(self):
+		codec, subprotocol = negotiate(['other', BINARY_SUBPROTOCOL])
+		self.assertTrue(codec.binary)
+		self.assertEqual(subprotocol, BINARY_SUBPROTOCOL)
+		codec, subprotocol = negotiate(None)
+		self.assertFalse(codec.binary)
+		self.assertIsNone(subprotocol)
+
+
+class EncodedEventTestCase(SimpleTestCase):
+	def test_event_carries_only_text(self):
+		event = encoded_event('state_update', {'type': 'game_state_update', 'tick': 1, 'timestamp': 2})
+		self.assertEqual(set(event), {'type', 'text'})
+
+	def test_payload_is_encoded_once_per_codec(self):
+		message = {'type': 'game_state_update', 'tick': 1, 'timestamp': 2, 'ball': {'position': {'x': 1.0}}}
+		event = encoded_event('state_update', message)
+		before = metrics.snapshot()
+
+		text = payload_for(event, JsonCodec())
+		first = payload_for(event, BinaryCodec())
+		second = payload_for(event, BinaryCodec())
+
+		self.assertIs(text, event['text'])
+		self.assertIs(first, second)
+		self.assertEqual(BinaryCodec().decode(bytes_data=first), message)
+		after = metrics.snapshot()
+		self.assertEqual(after.get('event_deliveries', 0) - before.get('event_deliveries', 0), 3)
+		self.assertEqual(after.get('event_encodes', 0) - before.get('event_encodes', 0), 1)
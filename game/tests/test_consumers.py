@@ -0,0 +1,69 @@
+import asyncio
+import json
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from game.clock import ClockSync
+from game.consumers import GamePhysics, GamePingPongConsumer, GameScoreHandler
+from game.engine import GameState
+
+
+class CountdownTestCase(SimpleTestCase):
+	def setUp(self):
+		self.game_state = GameState.get_game('countdown')
+		self.addCleanup(GameState.remove_game, 'countdown')
+		self.channel_layer = mock.Mock(group_send=mock.AsyncMock())
+
+	def make_consumer(self, player):
+		consumer = GamePingPongConsumer()
+		consumer.game_id = 'countdown'
+		consumer.game_group_name = 'game_countdown'
+		consumer.player_number = player
+		consumer.match = '0'
+		consumer.POSITION_PRECISION, consumer.VELOCITY_PRECISION = 3, 2
+		consumer.game_state = self.game_state
+		consumer.physics = GamePhysics()
+		consumer.score_handler = GameScoreHandler(self.game_state, consumer.physics, self.channel_layer, 'game_countdown')
+		consumer.channel_layer = self.channel_layer
+		consumer.clock = ClockSync()
+		consumer.send_message = mock.AsyncMock()
+		return consumer
+
+	def measure(self, consumer, rtt):
+		"""서버가 rtt(ms) 전에 보낸 probe에 클라이언트가 응답한 것처럼"""
+		now = int(time.time() * 1000)
+		probe = consumer.clock.probe(now - rtt)
+		asyncio.run(consumer.handle_time_probe_ack({'id': probe['id'], 'client_time': now - rtt // 2}))
+
+	def countdown_sequence(self):
+		for call in self.channel_layer.group_send.call_args_list:
+			event = call.args[1]
+			if 'text' in event:
+				message = json.loads(event['text'])
+				if message['type'] == 'countdown_sequence':
+					return message
+		return None
+
+	def test_countdown_times_are_ms_and_led_by_clock_sync(self):
+		player1, player2 = self.make_consumer('player1'), self.make_consumer('player2')
+		self.measure(player1, 120)
+		self.measure(player2, 40)
+		# heartbeat 등 다른 경로로 들어온 RTT는 카운트다운에 쓰지 않는다
+		self.game_state.rtt['player2'] = 2.0
+
+		before = time.time() * 1000
+		with mock.patch('game.consumers.asyncio.sleep', new_callable=mock.AsyncMock) as sleep, \
+				mock.patch('game.consumers.game_engine'):
+			asyncio.run(player1.game_loop())
+		after = time.time() * 1000
+
+		message = self.countdown_sequence()
+		self.assertLessEqual(before - 1, message['server_time'])
+		self.assertLessEqual(message['server_time'], after)
+		lead = message['start_time'] - message['server_time']
+		self.assertAlmostEqual(lead, self.game_state.clock_rtt['player1'] / 2, delta=1)
+		self.assertAlmostEqual(lead, 60, delta=10)
+		sleep.assert_awaited_once()
+		self.assertAlmostEqual(sleep.await_args.args[0], 5 + lead / 1000, places=2)
@@ -0,0 +1,132 @@
+import asyncio
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from game.consumers import GamePhysics, GameScoreHandler
+from game.engine import GameEngine, GameSession, GameState
+from game.state import Paddle
+
+
+class NullChannelLayer:
+	async def group_send(self, group, message):
+		pass
+
+
+class EngineTestCase(SimpleTestCase):
+	def make_session(self, engine, game_id):
+		game_state = GameState.get_game(game_id)
+		game_state.game_started = True
+		self.addCleanup(GameState.remove_game, game_id)
+		physics = GamePhysics()
+		score_handler = GameScoreHandler(game_state, physics, NullChannelLayer(), f'game_{game_id}')
+		self.published = []
+
+		async def send():
+			pass
+
+		def publish(message):
+			# 만들어지는 시점(틱 안)에 기록한다 - 판정을 미룬 골 동안 보낸 스냅샷도 구분할 수 있도록
+			self.published.append((message, self.sessions_pending_goal(game_id)))
+			return send()
+
+		async def save():
+			pass
+
+		return GameSession(game_id, game_state, physics, score_handler, publish, save)
+
+	def sessions_pending_goal(self, game_id):
+		session = self.engine.sessions.get(game_id)
+		return session is not None and session.goal_crossed_at is not None
+
+	def run_engine(self, engine, session, duration):
+		async def run():
+			engine.start_game(session)
+			await asyncio.sleep(duration)
+			session.game_state.game_started = False
+			await asyncio.sleep(engine.tick_interval * 2)
+			engine.stop_game(session.game_id)
+
+		asyncio.run(run())
+
+
+class EventDrivenTestCase(EngineTestCase):
+	def test_sim_time_keeps_pace_with_sparse_snapshots(self):
+		# 스냅샷 간격(6틱)이 max_catch_up_ticks(5)보다 길어도 평소 진행이 잘리지 않는다
+		engine = self.engine = GameEngine(tick_rate=120, event_driven=True, snapshot_rate=20, max_catch_up_ticks=5)
+		self.assertGreater(engine.snapshot_every, engine.max_catch_up_ticks)
+		session = self.make_session(engine, 'event_driven_pace')
+		ball = session.game_state.ball
+		ball.vx, ball.vy, ball.vz = 1.0, 0.5, 0.0  # 평면에 닿지 않는 공 - 득점 없이 계속 진행
+
+		started = time.time()
+		self.run_engine(engine, session, 0.5)
+		self.assertGreater(engine.stats['snapshots'], 5)
+		self.assertGreater(session.sim_time, (session.last_update_time - started) * 0.95)
+		self.assertEqual(session.game_state.tick, int(session.sim_time / engine.tick_interval))
+
+
+class LagCompensationTestCase(EngineTestCase):
+	"""player1 쪽으로 가는 공을 player1 패들이 놓친 상황 - 늦게 도착한 입력으로 막았는지 판정한다"""
+	def setUp(self):
+		self.engine = GameEngine(tick_rate=60, max_lag_compensation=0.2)
+		self.session = self.make_session(self.engine, 'lag_compensation')
+		game_state = self.session.game_state
+		params = self.session.physics.params
+		physics = self.session.physics
+		game_state.players['player1'] = Paddle(3.0, 2.0, physics.PADDLE_Z_PLAYER1)
+		game_state.players['player2'] = Paddle(0.0, 0.0, physics.PADDLE_Z_PLAYER2)
+		ball = game_state.ball
+		ball.x, ball.y, ball.vx, ball.vy = 0.0, 0.2, 0.0, 0.0
+		# 패들 평면에서 골 평면까지 가는 시간(약 0.08초)보다 지연 보상 창이 길도록 최고 속도로
+		ball.vz = params.max_speed
+		# 몇 틱 뒤 player1 패들 평면을 지난다
+		ball.z = params.player1_hit_plane - 4 * ball.vz * params.speed_factor / 60
+
+	def run_until_deferred(self, late_input=None, timeout=1.0):
+		"""골 판정이 미뤄질 때까지 돌리고, late_input이 있으면 그때 player1 입력으로 보낸 뒤 0.4초 더 돌린다"""
+		engine, session = self.engine, self.session
+		events = {}
+
+		async def run():
+			engine.start_game(session)
+			deadline = time.time() + timeout
+			while engine.stats['deferred_goals'] == 0 and time.time() < deadline:
+				await asyncio.sleep(engine.tick_interval / 4)
+			events['score_at_deferral'] = dict(session.game_state.score)
+			if late_input is not None:
+				engine.submit_input(session.game_id, 'player1', late_input, 1)
+			await asyncio.sleep(0.4)
+			session.game_state.game_started = False
+			engine.stop_game(session.game_id)
+
+		asyncio.run(run())
+		return events
+
+	def test_late_hit_is_compensated(self):
+		self.session.game_state.rtt['player1'] = 0.2
+		events = self.run_until_deferred(late_input={'x': 0.0, 'y': 0.2})
+		self.assertEqual(events['score_at_deferral'], {'player1': 0, 'player2': 0})
+		self.assertEqual(self.engine.stats['lag_compensated_hits'], 1)
+		self.assertEqual(self.session.game_state.score, {'player1': 0, 'player2': 0})
+		self.assertLess(self.session.game_state.ball.vz, 0)
+		self.assertFalse(any(pending for _, pending in self.published))
+
+	def test_goal_after_window_expires(self):
+		self.session.game_state.rtt['player1'] = 0.2
+		events = self.run_until_deferred()
+		self.assertEqual(events['score_at_deferral'], {'player1': 0, 'player2': 0})
+		self.assertGreater(self.engine.stats['deferred_goals'], 0)
+		self.assertEqual(self.engine.stats['lag_compensated_hits'], 0)
+		self.assertEqual(self.session.game_state.score['player2'], 1)
+		self.assertFalse(any(pending for _, pending in self.published))
+
+	def test_unmeasured_rtt_scores_immediately(self):
+		self.assertIsNone(self.session.game_state.rtt['player1'])
+		with mock.patch.object(self.session.physics, 'compensate_miss') as compensate_miss:
+			self.run_until_deferred(late_input={'x': 0.0, 'y': 0.2}, timeout=0.3)
+		compensate_miss.assert_not_called()
+		self.assertEqual(self.engine.stats['deferred_goals'], 0)
+		self.assertEqual(self.engine.stats['lag_compensated_hits'], 0)
+		self.assertEqual(self.session.game_state.score['player2'], 1)
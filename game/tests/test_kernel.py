@@ -0,0 +1,134 @@
+import math
+import random
+
+from django.test import SimpleTestCase
+
+from game import kernel
+from game.consumers import GamePhysics
+
+
+def reference_substep(physics, ball, paddles, delta_time):
+	"""커널로 옮기기 전 GamePhysics._process_physics_substep (dict 상태를 제자리에서 바꾼다)"""
+	position, velocity = ball['position'], ball['velocity']
+	factor = delta_time * physics.BALL_SPEED_FACTOR
+	next_x = position['x'] + velocity['x'] * factor
+	next_y = position['y'] + velocity['y'] * factor
+	next_z = position['z'] + velocity['z'] * factor
+	ball['scale'] = physics.calculate_ball_scale(next_z)
+
+	if next_z <= -physics.TUNNEL_LENGTH - 1:
+		position.update({'x': next_x, 'y': next_y, 'z': next_z})
+		return 'player1'
+	elif next_z >= 1:
+		position.update({'x': next_x, 'y': next_y, 'z': next_z})
+		return 'player2'
+
+	if abs(next_x) > physics.TUNNEL_WIDTH:
+		velocity['x'] *= -1
+		next_x = math.copysign(physics.TUNNEL_WIDTH - 0.01, next_x)
+	if abs(next_y) > physics.TUNNEL_HEIGHT:
+		velocity['y'] *= -1
+		next_y = math.copysign(physics.TUNNEL_HEIGHT - 0.01, next_y)
+
+	zones = (
+		(physics.PLAYER1_HIT_ZONE_END, physics.PLAYER1_HIT_ZONE_START, 0, -1, physics.PLAYER1_HIT_ZONE_END - 0.1),
+		(physics.PLAYER2_HIT_ZONE_END, physics.PLAYER2_HIT_ZONE_START, 1, 1, physics.PLAYER2_HIT_ZONE_START + 0.1),
+	)
+	for zone_end, zone_start, player, direction, bounce_z in zones:
+		if not zone_end <= next_z <= zone_start:
+			continue
+		paddle = paddles[player]
+		if paddle:
+			threshold = physics.calculate_hit_threshold(next_z)
+			dx = next_x - paddle[0]
+			dy = next_y - paddle[1]
+			if math.sqrt(dx * dx + dy * dy) <= threshold:
+				speed = math.sqrt(velocity['x'] ** 2 + velocity['y'] ** 2 + velocity['z'] ** 2)
+				new_speed = min(speed * physics.COLLISION_SPEED_INCREASE, physics.MAX_SPEED)
+				velocity['x'] = dx / threshold * new_speed * physics.COLLISION_ANGLE_FACTOR
+				velocity['y'] = dy / threshold * new_speed * physics.COLLISION_ANGLE_FACTOR
+				velocity['z'] = direction * abs(new_speed)
+				speed = math.sqrt(velocity['x'] ** 2 + velocity['y'] ** 2 + velocity['z'] ** 2)
+				if speed > new_speed:
+					scale = new_speed / speed
+					velocity['x'] *= scale
+					velocity['y'] *= scale
+					velocity['z'] *= scale
+				next_z = bounce_z
+		break
+
+	position.update({'x': next_x, 'y': next_y, 'z': next_z})
+	return None
+
+
+def random_rally(rng, physics):
+	"""공과, 공이 향하는 쪽 패들을 공 근처에 둔 랠리 초기 상태"""
+	vz = rng.choice((-1, 1)) * rng.uniform(2, physics.MAX_SPEED)
+	ball = kernel.BallState(
+		rng.uniform(-physics.TUNNEL_WIDTH, physics.TUNNEL_WIDTH),
+		rng.uniform(-physics.TUNNEL_HEIGHT, physics.TUNNEL_HEIGHT),
+		rng.uniform(-physics.TUNNEL_LENGTH, 0),
+		rng.uniform(-3, 3), rng.uniform(-2, 2), vz,
+		physics.BALL_SCALE
+	)
+	paddles = tuple(
+		(ball.x + rng.uniform(-1.5, 1.5), ball.y + rng.uniform(-1.5, 1.5)) if rng.random() < 0.8 else None
+		for _ in range(2)
+	)
+	return ball, paddles
+
+
+class KernelStepTestCase(SimpleTestCase):
+	def setUp(self):
+		self.physics = GamePhysics()
+
+	def assertBallEqual(self, ball, reference):
+		position, velocity = reference['position'], reference['velocity']
+		expected = (
+			position['x'], position['y'], position['z'],
+			velocity['x'], velocity['y'], velocity['z'], reference['scale']
+		)
+		for actual, value in zip(ball, expected):
+			self.assertAlmostEqual(actual, value, places=9)
+
+	def test_zone_step_matches_previous_physics(self):
+		substeps = 2
+		for seed in range(20):
+			with self.subTest(seed=seed):
+				rng = random.Random(seed)
+				ball, paddles = random_rally(rng, self.physics)
+				reference = {
+					'position': {'x': ball.x, 'y': ball.y, 'z': ball.z},
+					'velocity': {'x': ball.vx, 'y': ball.vy, 'z': ball.vz},
+					'scale': ball.scale,
+				}
+				for _ in range(300):
+					result = kernel.step(ball, paddles, 1 / 60, substeps, False, self.physics.params)
+					expected = None
+					for _ in range(substeps):
+						expected = reference_substep(self.physics, reference, paddles, 1 / 60 / substeps)
+						if expected:
+							break
+					self.assertEqual(result.scoring_player, expected)
+					self.assertBallEqual(result.ball, reference)
+					if expected:
+						break
+					ball = result.ball
+
+	def test_step_does_not_mutate_input(self):
+		ball, paddles = random_rally(random.Random(1), self.physics)
+		before = tuple(ball)
+		kernel.step(ball, paddles, 1 / 60, 2, True, self.physics.params)
+		self.assertEqual(tuple(ball), before)
+
+	def test_swept_step_reflects_fast_ball(self):
+		# 한 스텝에 히트존을 통째로 건너뛸 만큼 빠른 공도 패들 평면에서 반사된다
+		params = self.physics.params
+		ball = kernel.BallState(0.0, 0.0, params.player1_hit_plane - 0.05, 0.0, 0.0, params.max_speed, 1.5)
+		result = kernel.step(ball, ((0.0, 0.0), None), 1 / 10, 1, True, params)
+		self.assertIsNone(result.scoring_player)
+		self.assertLess(result.ball.vz, 0)
+		self.assertLess(result.ball.z, params.player1_hit_plane)
+
+		missed = kernel.step(ball, (None, None), 1 / 10, 1, True, params)
+		self.assertEqual(missed.scoring_player, 'player2')
@@ -0,0 +1,82 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from game.outbound import OutboundQueue
+
+
+class OutboundQueueTestCase(SimpleTestCase):
+	def setUp(self):
+		self.sent = []
+		self.dropped = []
+
+	async def send(self, data):
+		self.sent.append(data)
+
+	def make_queue(self, max_depth=32):
+		return OutboundQueue(self.send, max_depth=max_depth, on_drop=self.dropped.append)
+
+	def test_latest_wins(self):
+		queue = self.make_queue()
+		queue.put('state 1', latest='state')
+		queue.put('end', latest=None)
+		queue.put('state 2', latest='state')
+		queue.put('opponent 1', latest='opponent')
+		self.assertEqual([data for _, data in queue.queue], ['end', 'state 2', 'opponent 1'])
+		self.assertEqual(queue.dropped, 1)
+		self.assertEqual(self.dropped, ['state'])
+
+	def test_control_messages_are_never_dropped(self):
+		queue = self.make_queue(max_depth=4)
+		queue.put('state', latest='state')
+		queue.put('opponent', latest='opponent')
+		for i in range(10):
+			queue.put(f'control {i}')
+		# depth를 넘으면 오래된 latest 메시지부터 버리고, 제어 메시지는 depth를 넘어서도 남긴다
+		self.assertEqual([data for _, data in queue.queue], [f'control {i}' for i in range(10)])
+		self.assertEqual(self.dropped, ['state', 'opponent'])
+
+	def test_oldest_latest_dropped_at_depth(self):
+		queue = self.make_queue(max_depth=3)
+		queue.put('a', latest='a')
+		queue.put('control')
+		queue.put('b', latest='b')
+		queue.put('c', latest='c')
+		self.assertEqual([data for _, data in queue.queue], ['control', 'b', 'c'])
+		self.assertEqual(self.dropped, ['a'])
+
+	def test_writer_sends_in_order(self):
+		async def run():
+			queue = self.make_queue()
+			queue.start()
+			queue.put('state 1', latest='state')
+			queue.put('countdown')
+			queue.put('state 2', latest='state')
+			await queue.flush()
+			queue.put('end')
+			await queue.flush()
+			queue.stop()
+			queue.put('after stop')
+			return queue
+
+		queue = asyncio.run(run())
+		self.assertEqual(self.sent, ['countdown', 'state 2', 'end'])
+		self.assertFalse(queue.queue)
+
+	def test_send_error_does_not_stop_writer(self):
+		async def failing_send(data):
+			if data == 'bad':
+				raise ConnectionError(data)
+			self.sent.append(data)
+
+		async def run():
+			queue = OutboundQueue(failing_send)
+			queue.start()
+			queue.put('bad')
+			queue.put('good')
+			with self.assertLogs('game.outbound', level='ERROR'):
+				await queue.flush()
+			queue.stop()
+
+		asyncio.run(run())
+		self.assertEqual(self.sent, ['good'])
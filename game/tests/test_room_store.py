@@ -0,0 +1,289 @@
+import asyncio
+import json
+from unittest import mock
+
+import fakeredis
+from django.test import SimpleTestCase
+
+from game.lobby import lobby_page
+from game.room_store import (
+	LOBBY_SUMMARY_KEY, OPEN_ROOMS_KEY, HashRoomStore, RoomCache, RoomStore, is_listed, lobby_summary
+)
+from game.utils import RoomStateManager
+
+
+def make_room(room_id, created_at, **fields):
+	room = {
+		'id': room_id, 'name': f'room {room_id}', 'roomType': 0,
+		'players': [{'intraId': 'host', 'nickname': 'host', 'profileImage': None}],
+		'host': 'host', 'game_started': False, 'created_at': created_at,
+		'game1': [], 'game2': [], 'game1_ended': False, 'game2_ended': False,
+		'started_at': None, 'disconnected': 0, 'version': 0,
+	}
+	room.update(fields)
+	return room
+
+
+class RoomStoreTestCase(SimpleTestCase):
+	"""fakeredis(Lua 포함) 위에서 JSON/hash 저장소를 같은 시나리오로 확인한다"""
+	store_class = RoomStore
+
+	def setUp(self):
+		self.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+		patcher = mock.patch('game.room_store.get_redis_connection', return_value=self.redis)
+		patcher.start()
+		self.addCleanup(patcher.stop)
+		self.store = self.store_class(cache_ttl=0)
+
+	def key(self, room_id):
+		return f'game_room_{room_id}'
+
+	def create(self, room_id, created_at=100.0, **fields):
+		self.store.set(self.key(room_id), make_room(room_id, created_at, **fields))
+
+	def manager(self):
+		manager = RoomStateManager()
+		manager.store = self.store
+		return manager
+
+	def assertIndexConsistent(self):
+		"""열린 방 sorted set == 요약 hash == 목록에 나와야 하는 방, 요약은 lobby_summary 그대로"""
+		indexed = {member.decode() for member in self.redis.zrange(OPEN_ROOMS_KEY, 0, -1)}
+		summaries = {
+			name.decode(): json.loads(value) for name, value in self.redis.hgetall(LOBBY_SUMMARY_KEY).items()
+		}
+		self.assertEqual(indexed, set(summaries))
+		for room_key, summary in summaries.items():
+			room = self.store.get(room_key)
+			self.assertTrue(is_listed(room))
+			self.assertEqual(summary, lobby_summary(room))
+		return indexed
+
+	def test_compare_and_set_conflict(self):
+		self.create('a')
+		room = self.store.get(self.key('a'))
+		room['name'] = 'renamed'
+		room['version'] = 1
+		self.assertEqual(self.store.compare_and_set(self.key('a'), 0, room), 1)
+		# 같은 version을 읽은 다른 쓰기는 충돌
+		stale = dict(room, name='stale')
+		self.assertEqual(self.store.compare_and_set(self.key('a'), 0, stale), 0)
+		self.assertEqual(self.store.get(self.key('a'))['name'], 'renamed')
+		self.assertEqual(self.store.compare_and_set(self.key('missing'), 0, stale), -1)
+
+	def test_update_add_player(self):
+		self.create('a')
+		room = self.store.update(
+			self.key('a'), 'add_player', {'intraId': 'guest', 'nickname': 'guest', 'profileImage': None}, 'now'
+		)
+		self.assertEqual([player['intraId'] for player in room['players']], ['host', 'guest'])
+		self.assertEqual(room['version'], 1)
+		self.assertEqual(self.store.get(self.key('a')), room)
+		self.assertIsNone(self.store.update(self.key('missing'), 'add_player', {'intraId': 'x'}, 'now'))
+
+	def test_update_removing_host_deletes_room(self):
+		self.create('a')
+		room = self.store.update(self.key('a'), 'remove_player', {'intraId': 'host', 'nickname': 'host'}, 'now')
+		self.assertEqual(room['players'], [])
+		self.assertIsNone(room['host'])
+		self.assertIsNone(self.store.get(self.key('a')))
+
+	def test_update_with_retry_after_conflict(self):
+		self.create('a')
+		calls = []
+
+		def rename(room):
+			calls.append(room['version'])
+			if len(calls) == 1:
+				# 읽은 뒤 다른 노드가 먼저 쓴다
+				self.store.update(self.key('a'), 'update_game_state', {'disconnected': 1}, 'now')
+			room['name'] = 'renamed'
+			return room
+
+		with mock.patch('game.utils.publish_room_change', new_callable=mock.AsyncMock):
+			room = asyncio.run(self.manager().update_room_with_retry(self.key('a'), rename))
+		self.assertEqual(calls, [0, 1])
+		stored = self.store.get(self.key('a'))
+		self.assertEqual(stored, room)
+		self.assertEqual((stored['name'], stored['disconnected'], stored['version']), ('renamed', 1, 2))
+
+	def test_update_with_retry_nested_mutation(self):
+		# update 함수가 players를 제자리에서 바꿔도 비교 기준(previous)은 그대로여야 한다
+		self.create('a')
+
+		def add_guest(room):
+			room['players'].append({'intraId': 'guest', 'nickname': 'guest', 'profileImage': None})
+			return room
+
+		with mock.patch('game.utils.publish_room_change', new_callable=mock.AsyncMock):
+			room = asyncio.run(self.manager().update_room_with_retry(self.key('a'), add_guest))
+		self.assertEqual(room['version'], 1)
+		stored = self.store.get(self.key('a'))
+		self.assertEqual([player['intraId'] for player in stored['players']], ['host', 'guest'])
+		self.assertEqual(self.assertIndexConsistent(), {self.key('a')})
+		self.assertEqual(json.loads(self.store.lobby_page()[0][0][1])['people'], 2)
+
+	def test_removed_field_is_deleted(self):
+		self.create('a')
+
+		def drop_started_at(room):
+			del room['started_at']
+			return room
+
+		with mock.patch('game.utils.publish_room_change', new_callable=mock.AsyncMock):
+			room = asyncio.run(self.manager().update_room_with_retry(self.key('a'), drop_started_at))
+		self.assertEqual(self.store.get(self.key('a')), room)
+		self.assertNotIn('started_at', room)
+
+		# previous 없이 통째로 써도 빠진 필드는 남지 않는다
+		del room['disconnected']
+		room['version'] = 2
+		self.assertEqual(self.store.compare_and_set(self.key('a'), 1, room), 1)
+		self.assertEqual(self.store.get(self.key('a')), room)
+
+	def test_index_follows_writes(self):
+		for i in range(5):
+			self.create(str(i), created_at=float(i))
+		self.create('tournament', roomType=3)
+		self.assertEqual(self.assertIndexConsistent(), {self.key(str(i)) for i in range(5)})
+
+		version = self.store.lobby_version()
+		self.store.update(self.key('0'), 'update_game_state', {'disconnected': 1}, 'now')
+		self.assertEqual(self.store.lobby_version(), version)  # 목록에 보이는 값은 그대로
+		self.store.update(self.key('1'), 'add_player', {'intraId': 'guest', 'nickname': 'guest'}, 'now')
+		self.assertEqual(self.store.lobby_version(), version + 1)
+
+		self.store.update(self.key('2'), 'update_game_state', {'game_started': True}, 'now')
+		self.store.update(self.key('3'), 'remove_player', {'intraId': 'host', 'nickname': 'host'}, 'now')
+		self.store.delete(self.key('4'))
+		self.assertEqual(self.assertIndexConsistent(), {self.key('0'), self.key('1')})
+		self.assertEqual(self.store.lobby_version(), version + 4)
+
+	def test_open_rooms_paging_with_equal_scores(self):
+		for i in range(7):
+			self.create(str(i), created_at=100.0 if i < 5 else float(i))
+		seen, cursor = [], None
+		while True:
+			room_keys, cursor = self.store.open_rooms(cursor, limit=2)
+			seen += room_keys
+			if cursor is None:
+				break
+		self.assertEqual(len(seen), 7)
+		self.assertEqual(set(seen), {self.key(str(i)) for i in range(7)})
+		self.assertEqual(seen[:5], sorted(seen[:5], reverse=True))
+
+	def test_lobby_page_drops_expired_rooms(self):
+		for i in range(4):
+			self.create(str(i), created_at=float(i))
+		self.store._delete(self.key('3'))  # 만료 - index는 그대로 남아 있다
+
+		with mock.patch('game.utils.publish_room_change', new_callable=mock.AsyncMock):
+			summaries, cursor = asyncio.run(lobby_page(self.manager()))
+		self.assertIsNone(cursor)
+		self.assertEqual([json.loads(summary)['id'] for summary in summaries], ['2', '1', '0'])
+		self.assertEqual(self.assertIndexConsistent(), {self.key(str(i)) for i in range(3)})
+
+	def test_stale_index_write_is_ignored(self):
+		self.create('a')
+		older = self.store.get(self.key('a'))
+		room = self.store.update(self.key('a'), 'update_game_state', {'game_started': True}, 'now')
+		self.assertEqual(room['version'], 1)
+		# version 0의 index 쓰기가 늦게 도착해도 시작한 방이 목록에 되살아나지 않는다
+		pipe = self.store.redis.pipeline(transaction=False)
+		self.store._reindex(pipe, self.key('a'), older)
+		pipe.execute()
+		self.assertEqual(self.assertIndexConsistent(), set())
+
+	def test_lobby_page_heals_closed_rooms(self):
+		for i in range(6):
+			self.create(str(i), created_at=float(i))
+		# index를 거치지 않고 바뀐 방 - 시작했거나 만료된 방은 목록을 읽을 때 빠진다
+		started = self.store.get(self.key('5'))
+		started['game_started'] = True
+		self.store._write(self.key('5'), started, None)
+		self.store._delete(self.key('4'))
+
+		seen, cursor = [], None
+		while True:
+			page, cursor = self.store.lobby_page(cursor, limit=2)
+			seen += [json.loads(summary)['id'] for _, summary in page]
+			if cursor is None:
+				break
+		self.assertEqual(seen, ['3', '2', '1', '0'])
+		self.assertEqual(self.assertIndexConsistent(), {self.key(str(i)) for i in range(4)})
+
+
+class HashRoomStoreTestCase(RoomStoreTestCase):
+	store_class = HashRoomStore
+
+	def test_get_selected_fields(self):
+		self.create('a')
+		self.assertEqual(
+			self.store.get(self.key('a'), fields=('host', 'players')),
+			{'host': 'host', 'players': [{'intraId': 'host', 'nickname': 'host', 'profileImage': None}]}
+		)
+		self.assertEqual(self.store.get(self.key('a'), fields=('game_started',)), {'game_started': False})
+		self.assertIsNone(self.store.get(self.key('missing'), fields=('host',)))
+
+
+	def test_removed_field_matches_json_store(self):
+		json_store = RoomStore(cache_ttl=0)
+		with mock.patch('game.room_store.get_redis_connection', return_value=fakeredis.FakeRedis(server=fakeredis.FakeServer())):
+			json_store.redis
+		rooms = []
+		for store in (json_store, self.store):
+			store.set(self.key('a'), make_room('a', 100.0))
+			room = store.get(self.key('a'))
+			previous = json.loads(json.dumps(room))
+			del room['game1'], room['started_at']
+			room['version'] = 1
+			self.assertEqual(store.compare_and_set(self.key('a'), 0, room, previous), 1)
+			rooms.append(store.get(self.key('a')))
+		for room in rooms:
+			room.pop('last_modified', None)
+		self.assertEqual(rooms[0], rooms[1])
+		self.assertNotIn('game1', rooms[1])
+
+class RoomCacheTestCase(SimpleTestCase):
+	def test_cache_hands_out_copies(self):
+		cache = RoomCache(ttl=60)
+		room = make_room('a', 100.0)
+		cache.put('a', room)
+		room['players'].append({'intraId': 'guest'})
+		cached = cache.get('a')
+		cached['players'].clear()
+		self.assertEqual(len(cache.get('a')['players']), 1)
+
+	def test_older_version_does_not_replace_newer(self):
+		cache = RoomCache(ttl=60)
+		cache.put('a', make_room('a', 100.0, version=3, name='new'))
+		cache.put('a', make_room('a', 100.0, version=2, name='old'))
+		self.assertEqual(cache.get('a')['name'], 'new')
+		cache.invalidate('a')
+		self.assertIsNone(cache.get('a'))
+
+	def test_disabled_and_expired_entries_miss(self):
+		disabled = RoomCache(ttl=0)
+		disabled.put('a', make_room('a', 100.0))
+		self.assertIsNone(disabled.get('a'))
+		cache = RoomCache(ttl=60)
+		cache.put('a', make_room('a', 100.0))
+		with mock.patch('game.room_store.time.monotonic', return_value=cache.entries['a'][0] + 1):
+			self.assertIsNone(cache.get('a'))
+
+	def test_write_on_other_node_invalidates(self):
+		redis = fakeredis.FakeRedis()
+		with mock.patch('game.room_store.get_redis_connection', return_value=redis), \
+				mock.patch.object(RoomStore, '_listen'):
+			local, other = RoomStore(cache_ttl=60), RoomStore(cache_ttl=60)
+			local.set('game_room_a', make_room('a', 100.0))
+			self.assertEqual(other.get('game_room_a')['name'], 'room a')
+
+			local.update('game_room_a', 'update_game_state', {'disconnected': 1}, 'now')
+			# 자기 알림은 무시하고, 다른 노드의 알림을 받으면 다시 읽는다
+			other._on_invalidation({'data': f'{other.node_id}:game_room_a'.encode()})
+			self.assertEqual(other.cached('game_room_a')['disconnected'], 0)
+			other._on_invalidation({'data': f'{local.node_id}:game_room_a'.encode()})
+			self.assertIsNone(other.cached('game_room_a'))
+			self.assertEqual(other.get('game_room_a')['disconnected'], 1)
+			self.assertEqual(local.cached('game_room_a')['disconnected'], 1)
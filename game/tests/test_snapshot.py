@@ -0,0 +1,71 @@
+import random
+
+from django.test import SimpleTestCase
+
+from game.snapshot import SnapshotEncoder
+from game.state import Ball, Match
+
+
+def apply_frame(state, frame):
+	"""클라이언트 쪽 복원 - keyframe이면 통째로, 델타면 온 필드만 덮어쓴다"""
+	if frame.get('key'):
+		state = {'position': {}, 'velocity': {}, 'score': {}}
+	ball = frame.get('ball', {})
+	for field in ('position', 'velocity'):
+		state[field].update(ball.get(field, {}))
+	if 'score' in frame:
+		state['score'] = dict(frame['score'])
+	return state
+
+
+class SnapshotEncoderTestCase(SimpleTestCase):
+	def setUp(self):
+		self.match = Match('test_game', Ball(0.0, 0.2, -21.0, 1.0, -0.5, 4.0))
+		self.encoder = SnapshotEncoder(position_precision=3, velocity_precision=2, keyframe_interval=10)
+
+	def expected(self):
+		ball = self.match.ball
+		return {
+			'position': {'x': round(ball.x, 3), 'y': round(ball.y, 3), 'z': round(ball.z, 3)},
+			'velocity': {'x': round(ball.vx, 2), 'y': round(ball.vy, 2), 'z': round(ball.vz, 2)},
+			'score': dict(self.match.score),
+		}
+
+	def test_delta_frames_reconstruct_state(self):
+		rng = random.Random(7)
+		state = None
+		keyframes = 0
+		for tick in range(50):
+			ball = self.match.ball
+			ball.x += ball.vx / 60
+			ball.z += ball.vz / 60
+			if tick % 13 == 0:
+				ball.vx = rng.uniform(-3, 3)  # 충돌 - 속도가 바뀐다
+			if tick == 25:
+				self.match.score['player1'] += 1
+			self.match.tick = tick
+
+			frame = self.encoder.encode(self.match)
+			keyframes += bool(frame.get('key'))
+			state = apply_frame(state, frame)
+			self.assertEqual(state, self.expected())
+		self.assertEqual(keyframes, 5)
+
+	def test_unchanged_fields_are_omitted(self):
+		self.encoder.encode(self.match)
+		self.match.ball.z += 0.5
+		frame = self.encoder.encode(self.match)
+		self.assertNotIn('key', frame)
+		self.assertEqual(frame['ball'], {'position': {'z': round(self.match.ball.z, 3)}})
+		self.assertNotIn('score', frame)
+
+		frame = self.encoder.encode(self.match)
+		self.assertNotIn('ball', frame)
+
+	def test_reset_sends_keyframe(self):
+		self.encoder.encode(self.match)
+		self.encoder.encode(self.match)
+		self.encoder.reset()
+		frame = self.encoder.encode(self.match)
+		self.assertTrue(frame['key'])
+		self.assertEqual(apply_frame(None, frame), self.expected())
@@ -0,0 +1,34 @@
+from django.test import SimpleTestCase
+
+from game.state import PaddleHistory
+
+
+class PaddleHistoryTestCase(SimpleTestCase):
+	def test_samples_between_includes_position_before_window(self):
+		history = PaddleHistory(size=8)
+		for sequence, received_at in enumerate((1.0, 2.0, 3.0, 4.0, 5.0), start=1):
+			history.record(sequence, received_at, float(sequence), 0.0)
+		# 창이 열릴 때 서버가 알던 위치(2.0에 받은 것) + 창 안에서 받은 위치
+		self.assertEqual(history.samples_between(2.5, 4.0), [(2.0, 0.0), (3.0, 0.0), (4.0, 0.0)])
+		self.assertEqual(history.samples_between(5.5, 6.0), [(5.0, 0.0)])
+		self.assertEqual(history.samples_between(0.0, 0.5), [])
+
+	def test_out_of_order_input_is_ignored(self):
+		history = PaddleHistory(size=8)
+		self.assertTrue(history.record(2, 1.0, 2.0, 0.0))
+		self.assertFalse(history.record(1, 1.5, 1.0, 0.0))
+		self.assertEqual(history.samples_between(0.0, 2.0), [(2.0, 0.0)])
+
+	def test_ring_buffer_keeps_latest(self):
+		history = PaddleHistory(size=4)
+		for sequence in range(1, 11):
+			history.record(sequence, float(sequence), float(sequence), 0.0)
+		self.assertEqual(history.count, 4)
+		self.assertEqual(history.samples_between(0.0, 100.0), [(7.0, 0.0), (8.0, 0.0), (9.0, 0.0), (10.0, 0.0)])
+
+	def test_reset_clears_history(self):
+		history = PaddleHistory(size=4)
+		history.record(5, 1.0, 1.0, 0.0)
+		history.reset()
+		self.assertTrue(history.record(1, 2.0, 2.0, 0.0))
+		self.assertEqual(history.samples_between(0.0, 3.0), [(2.0, 0.0)])
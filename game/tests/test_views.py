@@ -0,0 +1,25 @@
+import json
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.test import RequestFactory, SimpleTestCase
+
+from game.views import engine_metrics
+
+
+class EngineMetricsTestCase(SimpleTestCase):
+	def get(self, user):
+		request = RequestFactory().get('/api/game/metrics')
+		request.user = user
+		return engine_metrics(request)
+
+	def test_anonymous_and_regular_users_are_forbidden(self):
+		self.assertEqual(self.get(AnonymousUser()).status_code, 403)
+		self.assertEqual(self.get(User(username='player')).status_code, 403)
+
+	def test_staff_sees_metrics(self):
+		response = self.get(User(username='admin', is_staff=True))
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(
+			set(json.loads(response.content)),
+			{'engine', 'delivery', 'outbound', 'clock', 'heartbeat', 'counters'}
+		)
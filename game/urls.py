@@ -1,7 +1,7 @@
 from django.urls import path
 from .views import GameRoomViewSet
 # from game.views import game_test
-from game.views import get_client_info
+from game.views import get_client_info, engine_metrics
 
 
 urlpatterns = [
@@ -11,6 +11,7 @@ urlpatterns = [
     path('start', GameRoomViewSet.as_view({'post': 'start_game'}), name='room-start'),
 	path('players', GameRoomViewSet.as_view({'post': 'players_info'}), name='room-players'),
 	path('user-info/', get_client_info, name='get_client_info'),
+	path('metrics', engine_metrics, name='game-metrics'),
 	path('history', GameRoomViewSet.as_view({'get': 'game_history'}), name='game-history')
 	# path('test/', game_test, name='game_test'),
 ]
\ No newline at end of file
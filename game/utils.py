@@ -1,36 +1,33 @@
 import asyncio
+import copy
 from typing import Dict, Any, Optional
 from datetime import datetime
-from django.core.cache import cache
 from asgiref.sync import sync_to_async
 import logging
 import random
 import sys
 import time
 
+from game.lobby import publish_room_change
+from game.metrics import metrics
+from game.room_store import room_store
+
 logger = logging.getLogger(__name__)
 
 class RoomStateManager:
+	"""방 상태 읽기/쓰기 - 실제 저장과 원자적 변경은 room_store(Redis Lua)가 맡는다"""
 	def __init__(self):
-		self.room_locks = {}
-		self._lock_creation_lock = asyncio.Lock()
+		self.store = room_store
 
-	async def get_room_lock(self, room_id: str) -> asyncio.Lock:
-		# room_id가 딕셔너리인 경우 문자열로 변환
-		
-		
-		async with self._lock_creation_lock:
-			if room_id not in self.room_locks:
-				self.room_locks[room_id] = asyncio.Lock()
-			return self.room_locks[room_id]
+	async def get_room(self, room_id: str, fields=None) -> Optional[Dict[str, Any]]:
+		"""Room 데이터 조회 - 프로세스 캐시에 있으면 Redis까지 가지 않는다
 
-	async def get_room(self, room_id: str) -> Optional[Dict[str, Any]]:
-		"""Room 데이터 조회"""
-		# room_id가 딕셔너리인 경우 문자열로 변환
-		
-			
-		result = await sync_to_async(cache.get)(room_id)
-		return result
+		fields를 주면 그 필드만 돌려준다 (hash 저장소는 그 필드만 읽는다)
+		"""
+		room = self.store.cached(room_id, fields)
+		if room is not None:
+			return room
+		return await sync_to_async(self.store.load)(room_id, fields)
 
 	async def set_room(self, room_id: str, room: Dict[str, Any]):
 		"""Room 데이터 저장"""
@@ -38,20 +35,14 @@ class RoomStateManager:
 		print("set Room id:", room_id, sys.stderr)
 		print("set Room:", room, sys.stderr)
 		
-		if (int(room['roomType']) == 3 or int(room['roomType']) == 4) and int(room['version']) == 0:
-			print("room is final or 3rd place", sys.stderr)
-			await sync_to_async(cache.set)(room_id, room, timeout=30 * 60)
-			return
-			
-		if room['host'] is None and int(room['roomType']) not in [3, 4]:
+		# 처음 만든 토너먼트 방은 30분, host가 없는 일반 방은 삭제 (room_store.write_plan)
+		if not await sync_to_async(self.store.set)(room_id, room):
 			print("room host is None and not tournament room", sys.stderr)
-			await sync_to_async(cache.delete)(room_id)
-		else:
-			await sync_to_async(cache.set)(room_id, room)
+		await publish_room_change(room_id, room)
 
 
 	async def update_room_with_retry(self, room_id: str, update_func, max_retries: int = 5) -> Optional[Dict[str, Any]]:
-		"""충돌 시 반복 재시도를 수행하는 업데이트 로직"""
+		"""충돌 시 반복 재시도를 수행하는 업데이트 로직 (임의의 update_func용 compare-and-set)"""
 		for attempt in range(max_retries):
 			try:
 				current_room = await self.get_room(room_id)
@@ -59,121 +50,88 @@ class RoomStateManager:
 					return None
 
 				current_version = current_room.get('version', 0)
-				result = await self.try_update_room(room_id, update_func, current_version)
+				result = await self.try_update_room(room_id, update_func, current_version, current_room)
 				
 				if result:
 					logger.debug(f"Update successful for room_id {room_id} on attempt {attempt + 1}")
 					return result
+				if result is None:
+					return None
 
 				logger.debug(f"Version conflict detected for room_id {room_id} on attempt {attempt + 1}")
-				await asyncio.sleep(0.1 * (2 ** attempt))
+				metrics.incr('room_update_retries')
+				# 충돌한 쪽은 이미 썼으므로 곧바로 다시 읽으면 된다 - 같이 몰리지 않도록 짧은 지터만
+				await asyncio.sleep(random.uniform(0, 0.005 * (2 ** attempt)))
 
 			except Exception as e:
 				logger.error(f"Error in update_room_with_retry: {e}")
 				if attempt == max_retries - 1:
 					break
 
+		metrics.incr('room_update_failures')
 		logger.error(f"Failed to update room {room_id} after {max_retries} attempts")
 		return None
 
-	async def try_update_room(self, room_id: str, update_func, current_version: int) -> Optional[Dict[str, Any]]:
-		"""단일 업데이트 시도를 수행"""
-		lock = await self.get_room_lock(room_id)
-		async with lock:
-			try:
+	async def try_update_room(self, room_id: str, update_func, current_version: int, current_room=None):
+		"""단일 업데이트 시도 - 갱신된 방, 버전 충돌이면 False, 방이 없거나 변경이 없으면 None"""
+		try:
+			if current_room is None:
 				current_room = await self.get_room(room_id)
 				if not current_room:
 					return None
 
-				if current_room['version'] != current_version:
-					logger.debug(f"Version conflict detected for room {room_id}. Reloading state.")
-					return None
-
-				# 업데이트 함수 실행
-				updated_room = (
-					await update_func(current_room.copy())
-					if asyncio.iscoroutinefunction(update_func)
-					else update_func(current_room.copy())
-				)
-
-				if not updated_room:
-					return None
-
-				# 버전 및 타임스탬프 업데이트
-				updated_room['version'] = current_room['version'] + 1
-				updated_room['last_modified'] = datetime.now().isoformat()
-
-				await self.set_room(room_id, updated_room)
-				return updated_room
+			# 업데이트 함수 실행 - current_room은 compare_and_set의 비교 기준(previous)이므로
+			# players 같은 중첩 값을 제자리에서 바꿔도 기준이 같이 바뀌지 않도록 깊은 복사본을 넘긴다
+			working_room = copy.deepcopy(current_room)
+			updated_room = (
+				await update_func(working_room)
+				if asyncio.iscoroutinefunction(update_func)
+				else update_func(working_room)
+			)
 
-			except Exception as e:
-				logger.error(f"Error in try_update_room: {e}")
+			if not updated_room:
 				return None
 
-	async def apply_update_safely(self, room_id: str, update_type: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-		"""안전한 업데이트 적용"""
-		async def perform_update(current_room: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-			if current_room is None:
-				logger.debug(f"No room found for room_id {room_id}")
-				return None
-			room_type = int(current_room.get('roomType', 0))
-			if current_room.get('host') is None and room_type not in [3, 4]:
-				logger.debug(f"Invalid room state for room_id {room_id}")
-				return None
+			# 버전 및 타임스탬프 업데이트
+			updated_room['version'] = current_version + 1
+			updated_room['last_modified'] = datetime.now().isoformat()
 
-			try:
-				updated_room = current_room.copy()
-				
-				if update_type == "add_player":
-					player_data = {
-						'intraId': update_data['intraId'],
-						'nickname': update_data['nickname'],
-						'profileImage': update_data['profileImage']
-					}
-					# if player_data['intraId'] not in [p['intraId'] for p in updated_room.get('players', [])]:
-					updated_room.setdefault('players', []).append(player_data)
-					print("players:", updated_room['players'], sys.stderr)
-					if not updated_room.get('host'):
-						updated_room['host'] = player_data['nickname']
-						print("host:", updated_room['host'], sys.stderr)	
-				elif update_type == "remove_player":
-					updated_room['players'] = [
-						p for p in updated_room.get('players', [])
-						if p['intraId'] != update_data['intraId']
-					]
-					if updated_room.get('host') == update_data['nickname']:
-						updated_room['host'] = updated_room['players'][0]['nickname'] if updated_room['players'] else None
-						
-				elif update_type == "update_game_state":
-					# 게임 상태 업데이트
-					if 'game_started' in update_data:
-						updated_room['game_started'] = update_data['game_started']
-					if 'started_at' in update_data:
-						updated_room['started_at'] = update_data['started_at']
-					if 'game1' in update_data:
-						updated_room['game1'] = update_data['game1']
-					if 'game2' in update_data:
-						updated_room['game2'] = update_data['game2']
-					if 'game1_ended' in update_data:
-						updated_room['game1_ended'] = update_data['game1_ended']
-					if 'game2_ended' in update_data:
-						updated_room['game2_ended'] = update_data['game2_ended']
-					if 'disconnected' in update_data:
-						updated_room['disconnected'] = update_data['disconnected']
-				
-				logger.debug(f"Update type {update_type} applied to room_id {room_id}: {updated_room}")
-				return updated_room
-
-			except Exception as e:
-				logger.error(f"Error during perform_update for room_id {room_id}: {e}")
+			metrics.incr('room_updates')
+			result = await sync_to_async(self.store.compare_and_set)(room_id, current_version, updated_room, current_room)
+			if result == 0:
+				metrics.incr('room_update_conflicts')
+				return False
+			if result < 0:
 				return None
+			await publish_room_change(room_id, updated_room)
+			return updated_room
+
+		except Exception as e:
+			logger.error(f"Error in try_update_room: {e}")
+			return None
 
-		return await self.update_room_with_retry(room_id, perform_update)
+	async def apply_update_safely(self, room_id: str, update_type: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+		"""안전한 업데이트 적용 - Redis 안에서 읽기-수정-쓰기를 한 번에 실행하므로 충돌/재시도가 없다"""
+		metrics.incr('room_updates')
+		try:
+			updated_room = await sync_to_async(self.store.update)(
+				room_id, update_type, update_data, datetime.now().isoformat()
+			)
+		except Exception as e:
+			logger.error(f"Error during apply_update_safely for room_id {room_id}: {e}")
+			return None
+		if updated_room is None:
+			logger.debug(f"No room or invalid room state for room_id {room_id}")
+			return None
+		logger.debug(f"Update type {update_type} applied to room_id {room_id}: {updated_room}")
+		await publish_room_change(room_id, updated_room)
+		return updated_room
 
 	async def remove_room(self, room_id: str) -> bool:
 		"""Room 즉시 삭제"""
 		try:
-			await sync_to_async(cache.delete)(room_id)
+			await sync_to_async(self.store.delete)(room_id)
+			await publish_room_change(room_id)
 			return True
 		except Exception as e:
 			logger.error(f"Error removing room {room_id}: {e}")
@@ -4,9 +4,8 @@ from rest_framework.response import Response
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync, sync_to_async  # sync_to_async 추가
 import uuid
-from django.core.cache import cache
 import time
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from api.utils import CookieManager
 from api.models import User
 import sys
@@ -14,7 +13,15 @@ from django.shortcuts import render
 from game.models import GameLog, UserGameLog
 from django.db.models import F
 from game.utils import RoomStateManager
+from game.codec import encoded_event
+from game.metrics import metrics
+from game.engine import game_engine
+from game.delivery import group_delivery
+from game.clock import clock_stats, heartbeat_stats
+from game.lobby import LOBBY_MAX_PAGE_SIZE, LOBBY_PAGE_SIZE, lobby_json, lobby_page
+from game.outbound import queue_stats
 import re
+import zlib
 
 
 
@@ -32,25 +39,28 @@ class GameRoomViewSet(viewsets.ViewSet):
 		"""모든 게임 방 목록을 반환합니다."""
 		@async_to_sync
 		async def async_list():
-			game_room_datas = []
-			game_rooms_keys = await sync_to_async(cache.keys)('game_room_*')
-			for room_key in game_rooms_keys:
-				room = await self.room_manager.get_room(room_key)
-				if not room:
-					continue
-				if len(room['players']) == 0 and room['roomType'] != 3 and room['roomType'] != 4:
-					await self.room_manager.remove_room(room_key)
-					continue
-				if room and not room['game_started'] and int(room['roomType'] != 3) and int(room['roomType']) != 4:
-					game_room_datas.append({
-						'id': room['id'],
-						'name': room['name'],
-						'roomType': room['roomType'],
-						'people': len(room['players']),
-						'created_at': room['created_at']
-					})
-			game_room_datas.sort(key=lambda x: x['created_at'], reverse=True)
-			return Response(game_room_datas, status=status.HTTP_200_OK)
+			# 열린 방 index를 최신 방부터 페이지 단위로 - 다음 페이지가 있으면 X-Next-Cursor 헤더
+			# 본문은 쓰기 때 만들어 둔 방 요약을 그대로 이어 붙이고, 로비 목록 version으로 ETag를 단다
+			try:
+				limit = max(min(int(request.query_params.get('limit', LOBBY_PAGE_SIZE)), LOBBY_MAX_PAGE_SIZE), 1)
+			except ValueError:
+				return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+			cursor = request.query_params.get('cursor')
+			version = await sync_to_async(self.room_manager.store.lobby_version)()
+			etag = f'"lobby-{version}-{limit}-{zlib.crc32((cursor or "").encode()):x}"'
+			if request.headers.get('If-None-Match') == etag:
+				response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+				response['ETag'] = etag
+				return response
+			try:
+				summaries, next_cursor = await lobby_page(self.room_manager, cursor, limit)
+			except ValueError:
+				return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+			response = HttpResponse(lobby_json(summaries), content_type='application/json', status=status.HTTP_200_OK)
+			response['ETag'] = etag
+			if next_cursor:
+				response['X-Next-Cursor'] = next_cursor
+			return response
 		return async_list()
 	
 	def validate_room_name(slef, room_name):
@@ -184,9 +194,13 @@ class GameRoomViewSet(viewsets.ViewSet):
 			if (room['roomType'] in [3, 4] and len(room['players']) != 2):
 				return Response({'error': 'Not enough players'}, status=status.HTTP_400_BAD_REQUEST)
 
-			room['game_started'] = True
-			room['started_at'] = time.time() + (9 * 3600)
-			await self.room_manager.set_room(f'game_room_{roomId}', room)
+			# 읽은 방을 통째로 다시 쓰면 그 사이의 입장/퇴장을 덮어쓰므로 Redis 안에서 두 필드만 바꾼다
+			room = await self.room_manager.apply_update_safely(f'game_room_{roomId}', 'update_game_state', {
+				'game_started': True,
+				'started_at': time.time() + (9 * 3600)
+			})
+			if not room:
+				return Response({'error': 'Room not found'}, status=status.HTTP_404_NOT_FOUND)
 
 			roomType = room['roomType']
 			if roomType == 1:
@@ -233,10 +247,10 @@ class GameRoomViewSet(viewsets.ViewSet):
 			channel_layer = get_channel_layer()
 			await channel_layer.group_send(
 				f'room_{roomId}',
-				{
+				encoded_event('game_start', {
 					'type': 'game_start',
 					'data': room
-				}
+				})
 			)
 			return Response(status=status.HTTP_200_OK)
 
@@ -247,7 +261,7 @@ class GameRoomViewSet(viewsets.ViewSet):
 		response = {}
 		roomId = request.data.get('roomId')
 		print("roomId", roomId, sys.stderr)
-		room = cache.get(f'game_room_{roomId}')
+		room = async_to_sync(self.room_manager.get_room)(f'game_room_{roomId}')
 		print("room", room, sys.stderr)
 		if not room:
 			return Response({'error': 'Room not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -340,5 +354,23 @@ def get_client_info(request):
         'nickname': CookieManager.get_nickname_from_cookie(request)
     })
 
+def engine_metrics(request):
+    # 연결별 시계/heartbeat 항목에 게임 id와 플레이어가 붙어 있으므로 관리자(staff)에게만 보여준다
+    if not request.user.is_staff:
+        return JsonResponse({'error': '권한이 없습니다'}, status=status.HTTP_403_FORBIDDEN)
+    counters = metrics.snapshot()
+    # 예전에는 전달마다 인코딩했으므로 (전달 수 - 실제 인코딩 수)만큼 줄어든 것
+    counters['event_encodes_saved'] = counters.get('event_deliveries', 0) - counters.get('event_encodes', 0)
+    # 방 변경 중 version 충돌로 다시 시도한 비율
+    counters['room_update_conflict_rate'] = counters.get('room_update_conflicts', 0) / max(counters.get('room_updates', 0), 1)
+    return JsonResponse({
+        'engine': dict(game_engine.stats, active_games=len(game_engine.sessions)),
+        'delivery': dict(group_delivery.stats),
+        'outbound': queue_stats(),
+        'clock': clock_stats(),
+        'heartbeat': heartbeat_stats(),
+        'counters': counters
+    })
+
 # def game_test(request):
 # 	return render(request, 'game.html')
\ No newline at end of file